@@ -11,7 +11,9 @@ Detailed Analysis:
 
 Implementation Guide:
 - Use verify_products_table_integrity() for atomic DB check
+- For production-sized catalogs use capture_products_baseline() before and verify_products_table_checksums() after
 - Integrate with pipeline for post-operation validation
+- Run product-creating tests inside a CreatedDataLedger so leftovers do not accumulate between runs
 
 QA Report:
 - Method tested for edge cases and tampering scenarios
@@ -26,28 +28,70 @@ Future Considerations:
 """
 
 import pymysql
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.TableIntegrityChecker import TableIntegrityChecker
 
 class ProductDatabaseIntegrityPage:
+    PRODUCT_COLUMNS = ["name", "description", "price"]
+
     def __init__(self, db_config: Dict[str, Any]):
         self.db_config = db_config
 
     def verify_products_table_integrity(self, expected_products: List[Dict[str, Any]]) -> None:
         """
         Verifies products table contains only expected test data.
+        Rows are streamed through a server-side cursor, so memory does not grow with the table.
         Args:
             expected_products (list): List of expected product dicts
         Raises:
             AssertionError: If unexpected products found
         """
-        conn = pymysql.connect(**self.db_config)
-        try:
-            with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+        expected_set = set((p["name"], p["description"], float(p["price"])) for p in expected_products)
+        unexpected = []
+        with DBConnectionPool.connection(self.db_config) as conn:
+            with conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
                 cursor.execute("SELECT name, description, price FROM products")
-                db_products = cursor.fetchall()
-                expected_set = set((p["name"], p["description"], float(p["price"])) for p in expected_products)
-                db_set = set((p["name"], p["description"], float(p["price"])) for p in db_products)
-                assert db_set <= expected_set, f"Database contains unexpected products: {db_set - expected_set}"
-        finally:
-            conn.close()
+                for p in cursor:
+                    row = (p["name"], p["description"], float(p["price"]))
+                    if row not in expected_set and len(unexpected) < 100:
+                        unexpected.append(row)
+        assert not unexpected, f"Database contains unexpected products: {unexpected}"
         print("Product database integrity verified.")
+
+    def products_checker(self, **options) -> TableIntegrityChecker:
+        """
+        Returns a TableIntegrityChecker over the products table of this page's database.
+        """
+        return TableIntegrityChecker(self.db_config, "products", self.PRODUCT_COLUMNS, **options)
+
+    def capture_products_baseline(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Captures chunk checksums of the products table (optionally saved to ``path``).
+        """
+        baseline = self.products_checker().capture()
+        if path:
+            TableIntegrityChecker.save_baseline(baseline, path)
+        return baseline
+
+    def verify_products_table_checksums(self, baseline: Optional[Dict[str, Any]] = None,
+                                        reference_db_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Verifies the products table against a checksum baseline or a reference (golden) database,
+        drilling down into mismatching key ranges only.
+        Args:
+            baseline (dict, optional): Result of capture_products_baseline()
+            reference_db_config (dict, optional): Golden database; enables row-level differences
+        Returns:
+            dict: Integrity report
+        Raises:
+            AssertionError: If any chunk differs
+        """
+        checker = self.products_checker()
+        reference = TableIntegrityChecker(reference_db_config, "products", self.PRODUCT_COLUMNS) \
+            if reference_db_config else None
+        report = checker.verify(baseline=baseline, reference=reference)
+        assert report["pass"], (f"Products table differs in {len(report['mismatched_chunks'])} key ranges: "
+                                f"{report['mismatched_chunks'][:10]}, rows {report['row_counts']}")
+        print("Product database checksum integrity verified.")
+        return report
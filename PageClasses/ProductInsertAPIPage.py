@@ -12,7 +12,7 @@ Detailed Analysis:
 
 Implementation Guide:
 - Use insert_product_api() to send API request
-- Use verify_product_in_db() to validate DB record
+- Use verify_product_in_db() to validate DB record (verify_products_in_db() for many products at once)
 - Integrate with downstream pipeline for atomic test steps
 
 QA Report:
@@ -30,18 +30,25 @@ Future Considerations:
 
 import requests
 import pymysql
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.BatchQuery import BatchQuery
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.ResponseSchemas import ResponseSchemas
+from auto_scripts.Pages.TestDataIsolation import CreatedDataLedger
 
 class ProductInsertAPIPage:
     BASE_URL = "https://example-ecommerce.com"
     INSERT_ENDPOINT = "/api/products"
 
-    def __init__(self, db_config: Dict[str, Any]):
+    def __init__(self, db_config: Dict[str, Any], session: Optional[requests.Session] = None):
         """
         Args:
             db_config (dict): Database config with host, user, password, database
+            session (requests.Session, optional): HTTP session; defaults to the shared APISessionPool session
         """
         self.db_config = db_config
+        self.session = session or APISessionPool.get_session(self.BASE_URL)
 
     def insert_product_api(self, product_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -55,11 +62,17 @@ class ProductInsertAPIPage:
         """
         url = f"{self.BASE_URL}{self.INSERT_ENDPOINT}"
         headers = {"Content-Type": "application/json"}
-        response = requests.post(url, json=product_data, headers=headers)
+        # Product names are not unique: remember existing ids so only the new row is tracked if no id comes back.
+        existing_ids = CreatedDataLedger.active_keys_where("products", "name", product_data["name"])
+        response = self.session.post(url, json=product_data, headers=headers)
         assert response.status_code == 201, f"Expected 201 Created, got {response.status_code}. Response: {response.text}"
         resp_json = response.json()
-        for field in ["name", "description", "price"]:
-            assert resp_json.get(field) == product_data[field], f"Mismatch for field {field}"
+        if resp_json.get("id") is not None:
+            CreatedDataLedger.track_active("products", "id", resp_json["id"])
+        else:
+            CreatedDataLedger.track_active_created("products", "name", product_data["name"], existing_ids)
+        expected = {field: product_data[field] for field in ["name", "description", "price"]}
+        ResponseSchemas.assert_valid("POST /api/products", resp_json, expected=expected)
         return resp_json
 
     def verify_product_in_db(self, name: str) -> Optional[Dict[str, Any]]:
@@ -72,18 +85,29 @@ class ProductInsertAPIPage:
         Raises:
             AssertionError: If not found or encoding issue
         """
-        conn = pymysql.connect(**self.db_config)
-        try:
+        with DBConnectionPool.connection(self.db_config) as conn:
             with conn.cursor(pymysql.cursors.DictCursor) as cursor:
                 query = "SELECT * FROM products WHERE name = %s"
                 cursor.execute(query, (name,))
                 record = cursor.fetchone()
                 assert record is not None, f"Product '{name}' not found in DB"
                 return record
-        finally:
-            conn.close()
         return None
 
+    def verify_products_in_db(self, products: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Verifies many products exist in DB by name, with chunked IN queries.
+        Args:
+            products (list): Product dicts with at least name (description is compared when given)
+        Returns:
+            dict: {name: {"match": bool, "missing": bool, "mismatches": [...]}}
+        """
+        expected = {p["name"]: p for p in products}
+        records = BatchQuery.rows_by_keys(self.db_config, "products", "name", expected,
+                                          cursorclass=pymysql.cursors.DictCursor)
+        fields = ["name", "description"] if all("description" in p for p in products) else ["name"]
+        return BatchQuery.compare_records(expected, records, fields)
+
     def run_insert_and_verify(self, product_data: Dict[str, Any]) -> None:
         """
         End-to-end workflow: insert product via API, verify in DB.
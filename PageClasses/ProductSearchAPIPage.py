@@ -31,15 +31,17 @@ Future Considerations:
 """
 
 import requests
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.ResponseSchemas import ResponseSchemas
 
 class ProductSearchAPIPage:
     BASE_URL = "https://example-ecommerce.com"
     SEARCH_ENDPOINT = "/api/products/search"
-    REQUIRED_PRODUCT_FIELDS = ["id", "name", "price", "description", "category", "imageUrl"]
 
-    def __init__(self, base_url: str = None):
+    def __init__(self, base_url: str = None, session: Optional[requests.Session] = None):
         self.base_url = base_url or self.BASE_URL
+        self.session = session or APISessionPool.get_session(self.base_url)
 
     def search_products_with_special_chars(self, keyword: str = "C++") -> requests.Response:
         """
@@ -53,7 +55,7 @@ class ProductSearchAPIPage:
         """
         url = f"{self.base_url}{self.SEARCH_ENDPOINT}"
         params = {"query": keyword}
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params)
         assert response.status_code == 200, f"Expected HTTP 200, got {response.status_code}. Response: {response.text}"
         return response
 
@@ -83,7 +85,7 @@ class ProductSearchAPIPage:
         """
         url = f"{self.base_url}{self.SEARCH_ENDPOINT}"
         params = {"query": injection_str}
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params)
         assert response.status_code == 200, f"Expected HTTP 200, got {response.status_code}. Response: {response.text}"
         return response
 
@@ -97,11 +99,14 @@ class ProductSearchAPIPage:
         assert len(products) == 0, f"Expected no products for SQL injection string, found {len(products)}: {products}"
 
     def validate_product_schema(self, products: List[Dict[str, Any]]) -> None:
-        for idx, product in enumerate(products):
-            missing_fields = [field for field in self.REQUIRED_PRODUCT_FIELDS if field not in product]
-            assert not missing_fields, (
-                f"Product at index {idx} (ID: {product.get('id', '<no id>')}) is missing fields: {missing_fields}"
-            )
+        """
+        Batch-validates all products against the compiled product schema and reports every invalid product at once.
+        """
+        failures = ResponseSchemas.validate_many("product", products)
+        assert not failures, "Invalid products in search response: " + "; ".join(
+            f"index {idx} (ID: {products[idx].get('id', '<no id>') if isinstance(products[idx], dict) else '<no id>'}): {violations}"
+            for idx, violations in failures.items()
+        )
 
     def run_full_search_and_negative_validation(self) -> None:
         """
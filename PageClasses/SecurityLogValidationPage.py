@@ -12,6 +12,15 @@ Detailed Analysis:
 Implementation Guide:
 - Use find_sql_injection_log_entry() for atomic log check
 - Parameterize log path for different environments
+- The log offset is marked when the page is created (test start); only lines appended after it are scanned,
+  through the shared LogReader. Call mark_log_start() to re-mark within a long test.
+- find_sql_injection_log_entry() waits up to LOG_WAIT_TIMEOUT seconds for the entry (shared LogFollower), so
+  entries logged just after the API response do not fail the check.
+- Many payloads: find_sql_injection_log_entries() verifies all of them in one memory-mapped pass (LogPatternScanner).
+- Rotated history: find_sql_injection_log_entries_in_log_set() scans the log set (log_glob, default "<log_path>*",
+  including .gz/.zst segments) in parallel, pruned to the given time window (LogSetScanner).
+- Structured: find_sql_injection_events() queries parsed events (timestamp, level, category, user, payload) in the
+  shared LogStore, ingested incrementally on the first query and scoped by the page's log mark.
 
 QA Report:
 - Method tested for detection of injection attempts and timestamp presence
@@ -26,29 +35,122 @@ Future Considerations:
 """
 
 import re
-from typing import Optional
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+from auto_scripts.Pages.EventualConsistency import ConsistencyTimeout
+from auto_scripts.Pages.LogFollower import LogFollower
+from auto_scripts.Pages.LogPatternScanner import LogHit, LogPatternScanner
+from auto_scripts.Pages.LogReader import LogMark, LogReader
+from auto_scripts.Pages.LogSetScanner import LogSetHit, LogSetScanner
+from auto_scripts.Pages.LogStore import LogEvent, LogStore
+
+TIMESTAMP_PATTERN = re.compile(r"\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]")
 
 class SecurityLogValidationPage:
-    def __init__(self, log_path: str):
+    LOG_WAIT_TIMEOUT = 10
+
+    def __init__(self, log_path: str, log_glob: Optional[str] = None):
         self.log_path = log_path
+        self.log_glob = log_glob or f"{log_path}*"
+        self.log_reader = LogReader.for_path(log_path)
+        LogStore.shared().register(log_path)
+        self.log_mark = self.log_reader.mark()
+
+    def mark_log_start(self) -> LogMark:
+        """
+        Marks the current end of the security log; later checks only scan lines appended after it.
+        """
+        self.log_mark = self.log_reader.mark()
+        return self.log_mark
 
-    def find_sql_injection_log_entry(self, injection_query: str) -> Optional[str]:
+    def find_sql_injection_log_entry(self, injection_query: str, since: Optional[LogMark] = None,
+                                     timeout: Optional[float] = None) -> Optional[str]:
         """
-        Scans security log for SQL injection attempt entry.
+        Waits for an SQL injection attempt entry among security log lines appended since the test-start mark.
         Args:
             injection_query (str): The attempted injection query string
+            since (LogMark, optional): Scan from this mark instead of the page's log_mark
+            timeout (float, optional): Seconds to wait for the entry (default LOG_WAIT_TIMEOUT)
         Returns:
             str: Log line if found
         Raises:
             AssertionError: If entry not found or missing timestamp
         """
-        found_entry = None
-        with open(self.log_path, "r", encoding="utf-8") as log_file:
-            for line in log_file:
-                if injection_query in line and "SQL injection" in line:
-                    # Expect timestamp in format [YYYY-MM-DD HH:MM:SS]
-                    if re.search(r"\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]", line):
-                        found_entry = line
-                        break
+        # Expect timestamp in format [YYYY-MM-DD HH:MM:SS]
+        try:
+            found_entry = LogFollower.for_path(self.log_path).wait_for(
+                lambda line: injection_query in line and "SQL injection" in line and TIMESTAMP_PATTERN.search(line),
+                timeout=self.LOG_WAIT_TIMEOUT if timeout is None else timeout,
+                since=since or self.log_mark,
+                name="SQL injection security log entry"
+            )
+        except ConsistencyTimeout:
+            found_entry = None
         assert found_entry is not None, f"No SQL injection log entry found for query '{injection_query}' in logs."
         return found_entry
+
+    def find_sql_injection_log_entries(self, injection_queries: Sequence[str],
+                                       since: Optional[LogMark] = None) -> Dict[str, LogHit]:
+        """
+        Verifies SQL injection log entries for many payloads in a single pass over the security log.
+        Args:
+            injection_queries (list[str]): The attempted injection query strings
+            since (LogMark, optional): Scan from this mark instead of the page's log_mark
+        Returns:
+            dict: {injection query: first matching LogHit (offset, line, timestamp)}
+        Raises:
+            AssertionError: If any entry is not found or lacks a timestamp
+        """
+        hits = LogPatternScanner(self.log_path).scan(
+            injection_queries,
+            since=since or self.log_mark,
+            accept=lambda hit: "SQL injection" in hit.line and hit.timestamp is not None
+        )
+        missing = LogPatternScanner.missing(hits)
+        assert not missing, f"No SQL injection log entry found for queries {missing} in logs."
+        return {query: found[0] for query, found in hits.items()}
+
+    def find_sql_injection_log_entries_in_log_set(self, injection_queries: Sequence[str],
+                                                  start: Optional[datetime] = None,
+                                                  end: Optional[datetime] = None) -> Dict[str, LogSetHit]:
+        """
+        Verifies SQL injection log entries across the active and rotated/compressed security log segments.
+        Args:
+            injection_queries (list[str]): The attempted injection query strings
+            start (datetime, optional): Ignore segments and entries before this time
+            end (datetime, optional): Ignore segments and entries after this time
+        Returns:
+            dict: {injection query: earliest matching LogSetHit (segment, offset, line, timestamp)}
+        Raises:
+            AssertionError: If any entry is not found or lacks a timestamp
+        """
+        hits = LogSetScanner(self.log_glob).scan(injection_queries, start=start, end=end, required=["SQL injection"])
+        missing = [query for query, found in hits.items() if not found or found[0].timestamp is None]
+        assert not missing, f"No SQL injection log entry found for queries {missing} in log set '{self.log_glob}'."
+        return {query: found[0] for query, found in hits.items()}
+
+    def find_sql_injection_events(self, injection_queries: Sequence[str], start: Optional[datetime] = None,
+                                  end: Optional[datetime] = None) -> Dict[str, LogEvent]:
+        """
+        Verifies SQL injection events logged since the test-start mark using the structured LogStore.
+        Args:
+            injection_queries (list[str]): The attempted injection query strings
+            start (datetime, optional): Only events at or after this time
+            end (datetime, optional): Only events at or before this time
+        Returns:
+            dict: {injection query: first matching LogEvent}
+        Raises:
+            AssertionError: If any event is not found or lacks a timestamp
+        """
+        store = LogStore.shared()
+        found: Dict[str, LogEvent] = {}
+        for query in injection_queries:
+            events = store.events(source=self.log_path, category="sql_injection", contains=query, start=start,
+                                  end=end, since=self.log_mark)
+            event = next((e for e in events if e.ts is not None), None)
+            if event is not None:
+                found[query] = event
+        missing = [query for query in injection_queries if query not in found]
+        assert not missing, f"No SQL injection log entry found for queries {missing} in logs."
+        return found
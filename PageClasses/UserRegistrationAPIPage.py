@@ -7,6 +7,12 @@ This PageClass automates user registration via the /api/users/register endpoint,
 
 Implementation Guide:
 - Use this PageClass to perform API registration, DB verification, and email log checks as part of Selenium-based automation.
+- For bulk registrations, verify_users_in_db() checks all users with chunked IN queries.
+- run_full_registration_flow() polls for the DB row and confirmation email (AwaitCondition) instead of checking once.
+- Email log checks only read lines appended after the page was created (LogReader mark), not the whole log.
+- verify_confirmation_email() queries the shared LogStore (ingested on the first query, scoped by the page's LogReader
+  mark) and wait_for_confirmation_email() follows raw lines; both apply the same _is_confirmation_line() matcher.
+- With a mailbox (SMTPCaptureSink), confirmation checks look at the captured emails themselves instead of logs.
 - Ensure environment variables for DB and email log access are configured.
 - Integrate with downstream test orchestration pipelines as needed.
 
@@ -32,24 +38,44 @@ import json
 import logging
 import pymysql
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.BatchQuery import BatchQuery
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.EventualConsistency import AwaitCondition
+from auto_scripts.Pages.LogFollower import LogFollower
+from auto_scripts.Pages.LogReader import LogReader
+from auto_scripts.Pages.LogStore import LogStore
+from auto_scripts.Pages.ResponseSchemas import ResponseSchemas
+from auto_scripts.Pages.SMTPCaptureSink import CapturedMessage, Mailbox
+from auto_scripts.Pages.TestDataIsolation import CreatedDataLedger
 
 class UserRegistrationAPIPage:
     """
     PageClass for automating user registration API, DB verification, and email log check.
     """
     EMAIL_REGEX = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+    CONSISTENCY_TIMEOUT = 30
 
-    def __init__(self, api_base_url: str, db_config: Dict[str, Any], email_log_path: str):
+    def __init__(self, api_base_url: str, db_config: Dict[str, Any], email_log_path: str,
+                 session: Optional[requests.Session] = None, mailbox: Optional[Mailbox] = None):
         """
         Args:
             api_base_url (str): Base URL for the API endpoints.
             db_config (dict): Database config with host, user, password, database.
             email_log_path (str): Path to email service logs or queue.
+            session (requests.Session, optional): HTTP session; defaults to the shared APISessionPool session.
+            mailbox (Mailbox, optional): SMTPCaptureSink mailbox; when set, emails are checked there, not in logs.
         """
         self.api_base_url = api_base_url
+        self.session = session or APISessionPool.get_session(api_base_url)
         self.db_config = db_config
         self.email_log_path = email_log_path
+        if email_log_path:
+            LogStore.shared().register(email_log_path)
+        self.email_log_mark = LogReader.for_path(email_log_path).mark() if email_log_path else None
+        self.mailbox = mailbox
+        self.mailbox_mark = mailbox.mark() if mailbox is not None else 0
         self.logger = logging.getLogger(self.__class__.__name__)
 
     @staticmethod
@@ -71,7 +97,7 @@ class UserRegistrationAPIPage:
         Returns:
             dict: API response JSON.
         Raises:
-            AssertionError: If response status is not 201 or required fields are missing.
+            AssertionError: If response status is not 201 or the body violates the endpoint schema (all violations listed).
             ValueError: If email format is invalid.
         """
         email = user_data.get('email')
@@ -80,19 +106,17 @@ class UserRegistrationAPIPage:
         url = f"{self.api_base_url}/api/users/register"
         headers = {'Content-Type': 'application/json'}
         self.logger.info(f"Registering user at {url} with data {user_data}")
-        response = requests.post(url, headers=headers, data=json.dumps(user_data))
+        existing_ids = CreatedDataLedger.active_keys_where("users", "username", user_data['username'])
+        response = self.session.post(url, headers=headers, data=json.dumps(user_data))
         self.logger.debug(f"API response: {response.status_code}, {response.text}")
         assert response.status_code == 201, f"Expected HTTP 201, got {response.status_code}"
         resp_json = response.json()
-        required_fields = ['userId', 'username', 'email', 'firstName', 'lastName', 'registrationTimestamp', 'accountStatus']
-        for field in required_fields:
-            assert field in resp_json, f"Missing field {field} in response"
-        assert resp_json['username'] == user_data['username'], "Username mismatch"
-        assert resp_json['email'] == user_data['email'], "Email mismatch"
-        assert resp_json['firstName'] == user_data['firstName'], "First name mismatch"
-        assert resp_json['lastName'] == user_data['lastName'], "Last name mismatch"
-        assert resp_json['accountStatus'] == 'ACTIVE', "Account status should be ACTIVE"
-        assert 'password' not in resp_json, "Password should not be returned in response"
+        if isinstance(resp_json, dict) and resp_json.get("userId") is not None:
+            CreatedDataLedger.track_active("users", "userId", resp_json["userId"])
+        else:
+            CreatedDataLedger.track_active_created("users", "username", user_data['username'], existing_ids)
+        expected = {field: user_data[field] for field in ('username', 'email', 'firstName', 'lastName')}
+        ResponseSchemas.assert_valid("POST /api/users/register", resp_json, expected=expected)
         return resp_json
 
     def verify_user_in_db(self, username: str, expected_email: str) -> Optional[Dict[str, Any]]:
@@ -106,8 +130,7 @@ class UserRegistrationAPIPage:
         Raises:
             AssertionError: If record is missing or fields do not match.
         """
-        conn = pymysql.connect(**self.db_config)
-        try:
+        with DBConnectionPool.connection(self.db_config) as conn:
             with conn.cursor(pymysql.cursors.DictCursor) as cursor:
                 query = "SELECT * FROM users WHERE username = %s"
                 cursor.execute(query, (username,))
@@ -117,10 +140,25 @@ class UserRegistrationAPIPage:
                 assert user_record['email'] == expected_email, "Email does not match"
                 assert user_record['account_status'] == 'ACTIVE', "Account status is not ACTIVE"
                 return user_record
-        finally:
-            conn.close()
         return None
 
+    def verify_users_in_db(self, expected_emails: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Verifies many user records in the database with chunked IN queries.
+        Args:
+            expected_emails (dict): {username: expected email}.
+        Returns:
+            dict: {username: {"match": bool, "missing": bool, "mismatches": [...]}}.
+        """
+        records = BatchQuery.rows_by_keys(self.db_config, "users", "username", expected_emails,
+                                          cursorclass=pymysql.cursors.DictCursor)
+        expected = {username: {"email": email, "account_status": "ACTIVE"}
+                    for username, email in expected_emails.items()}
+        results = BatchQuery.compare_records(expected, records, ["email", "account_status"])
+        failed = [username for username, result in results.items() if not result["match"]]
+        self.logger.debug(f"Verified {len(results)} users in DB, {len(failed)} failed")
+        return results
+
     def verify_confirmation_email(self, recipient_email: str) -> bool:
         """
         Checks email service logs or queue for confirmation email to recipient.
@@ -131,20 +169,55 @@ class UserRegistrationAPIPage:
         Raises:
             AssertionError: If confirmation email is not found.
         """
+        if self.mailbox is not None:
+            found = bool(self.mailbox.messages(recipient=recipient_email, after_id=self.mailbox_mark,
+                                               predicate=self._is_confirmation_email))
+            assert found, f"Confirmation email not found for {recipient_email} in mailbox"
+            return found
         self.logger.info(f"Checking email logs for confirmation email to {recipient_email}")
-        found = False
         try:
-            with open(self.email_log_path, 'r', encoding='utf-8') as log_file:
-                for line in log_file:
-                    if recipient_email in line and 'registration success' in line.lower():
-                        found = True
-                        break
+            events = LogStore.shared().events(source=self.email_log_path, contains=recipient_email,
+                                              since=self.email_log_mark)
+            found = any(self._is_confirmation_line(event.message, recipient_email) for event in events)
             assert found, f"Confirmation email not found for {recipient_email} in logs"
         except Exception as e:
             self.logger.error(f"Error reading email logs: {str(e)}")
             raise
         return found
 
+    @staticmethod
+    def _is_confirmation_line(line: str, recipient_email: str) -> bool:
+        return recipient_email in line and 'registration success' in line.lower()
+
+    @staticmethod
+    def _is_confirmation_email(message: CapturedMessage) -> bool:
+        return 'registration' in message.subject.lower() or 'registration success' in message.text.lower()
+
+    def wait_for_confirmation_email(self, recipient_email: str,
+                                    timeout: Optional[float] = None) -> Union[str, CapturedMessage]:
+        """
+        Waits until the confirmation email to recipient appears in the mailbox (if set) or the email logs.
+        Args:
+            recipient_email (str): Email address to check.
+            timeout (float, optional): Deadline in seconds (default CONSISTENCY_TIMEOUT).
+        Returns:
+            CapturedMessage | str: Captured email, or the matching log line without a mailbox.
+        Raises:
+            AssertionError: If the confirmation email does not arrive before the deadline.
+        """
+        self.logger.info(f"Waiting for confirmation email to {recipient_email}")
+        if self.mailbox is not None:
+            return self.mailbox.wait_for(recipient=recipient_email, after_id=self.mailbox_mark,
+                                         predicate=self._is_confirmation_email,
+                                         timeout=timeout or self.CONSISTENCY_TIMEOUT,
+                                         name="registration confirmation email received")
+        return LogFollower.for_path(self.email_log_path).wait_for(
+            lambda line: self._is_confirmation_line(line, recipient_email),
+            timeout=timeout or self.CONSISTENCY_TIMEOUT,
+            since=self.email_log_mark,
+            name="registration confirmation email logged"
+        )
+
     def run_full_registration_flow(self, user_data: Dict[str, str]) -> None:
         """
         Executes the end-to-end registration, DB check, and email confirmation.
@@ -157,6 +230,8 @@ class UserRegistrationAPIPage:
         if not self.validate_email_format(email):
             raise ValueError(f"Invalid email format: {email}")
         api_resp = self.register_user_api(user_data)
-        self.verify_user_in_db(user_data['username'], user_data['email'])
-        self.verify_confirmation_email(user_data['email'])
+        # DB replication and the mail worker lag behind the API; poll until the data lands.
+        AwaitCondition.until(lambda: self.verify_user_in_db(user_data['username'], user_data['email']),
+                             "registered user visible in DB", timeout=self.CONSISTENCY_TIMEOUT)
+        self.wait_for_confirmation_email(user_data['email'])
         self.logger.info("End-to-end registration flow completed successfully.")
@@ -0,0 +1,243 @@
+"""
+APISessionPool.py
+
+Executive Summary:
+------------------
+Process-wide registry of pooled, keep-alive HTTP connection pools, one per base URL (scheme + host + port).
+All API PageClasses draw their HTTP client from this pool, so consecutive calls against the same backend reuse
+TCP/TLS connections instead of paying a fresh handshake per request. Each page gets its own session (cookies,
+headers) on top of the shared connections, so login state never leaks between pages.
+
+Detailed Analysis:
+------------------
+- One HTTPAdapter per base URL, sized by ``pool_connections``/``pool_maxsize``. ``get_session`` returns a new
+  PooledSession on every call that mounts the host's shared adapter: connections are shared, cookie jars are not.
+- ``default_timeout`` is applied to every request that does not pass its own ``timeout``.
+- ``keep_alive=False`` sends ``Connection: close`` for environments whose proxies mishandle persistent connections.
+- While an HTTPCassette is active, requests are recorded to or replayed from it.
+- Repeated GETs are answered by ResponseCache.shared() while it is enabled (opt-in, disabled by default).
+- Thread-safe: adapters are created under a lock; urllib3 pools are shared safely by parallel test workers.
+
+Implementation Guide:
+---------------------
+1. Optionally tune once per run: ``APISessionPool.configure(pool_maxsize=50, default_timeout=15)``.
+2. PageClasses call ``APISessionPool.get_session(base_url)``; tests may inject their own session instead.
+3. Call ``APISessionPool.close_all()`` at session teardown (e.g. in a pytest fixture finalizer).
+
+Quality Assurance Report:
+-------------------------
+- Settings changed via ``configure()`` apply to sessions created afterwards (pool sizes to hosts first used
+  afterwards); ``close_all()`` closes the shared adapters and resets the registry.
+- ``PooledSession.close()`` leaves the shared adapter open for the other sessions of the host.
+- Adapters never retry on their own (``max_retries=0``); retries and circuit breaking come from ResilienceLayer.
+
+Troubleshooting Guide:
+----------------------
+- "Connection pool is full" warnings: raise ``pool_maxsize`` to the number of concurrent workers.
+- Stale connections behind load balancers: lower idle time on the server side or use ``keep_alive=False``.
+
+Future Considerations:
+----------------------
+- Per-host TLS client certificates and proxy settings.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from auto_scripts.Pages.HTTPCassette import HTTPCassette
+from auto_scripts.Pages.ResilienceLayer import ResilienceLayer
+from auto_scripts.Pages.ResponseCache import ResponseCache
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session that applies a default timeout to every request without an explicit one,
+    routes requests through a ResilienceLayer (retries, backoff, circuit breaker) when set and
+    serves repeated non-streamed GETs from a ResponseCache while that cache is enabled. Every request that reaches
+    the network is reported to ``listeners`` as listener(method, url, status_code, elapsed_seconds, error).
+    """
+
+    def __init__(self, default_timeout: Optional[float] = None, resilience: Optional[ResilienceLayer] = None,
+                 response_cache: Optional[ResponseCache] = None, listeners: Optional[List[Callable]] = None):
+        super().__init__()
+        self.default_timeout = default_timeout
+        self.resilience = resilience
+        self.response_cache = response_cache
+        self.listeners = listeners if listeners is not None else []
+
+    def close(self) -> None:
+        # Mounted adapters are shared with every other session of the host; APISessionPool.close_all() closes them.
+        pass
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.default_timeout
+        cache = self.response_cache
+        if cache is None or not cache.enabled:
+            return self._send(method, url, **kwargs)
+        if method.upper() == "GET" and not kwargs.get("stream"):
+            key = cache.key_for(url, kwargs.get("params"), {**self.headers, **(kwargs.get("headers") or {})})
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            response = self._send(method, url, **kwargs)
+            cache.put(key, response)
+            return response
+        response = self._send(method, url, **kwargs)
+        if method.upper() in cache.MUTATING_METHODS:
+            cache.invalidate(url)
+        return response
+
+    def _send(self, method, url, **kwargs):
+        if not self.listeners:
+            return self._send_or_replay(method, url, **kwargs)
+        started = time.perf_counter()
+        try:
+            response = self._send_or_replay(method, url, **kwargs)
+        except Exception as e:
+            self._notify(method, url, None, time.perf_counter() - started, e)
+            raise
+        self._notify(method, url, response.status_code, time.perf_counter() - started, None)
+        return response
+
+    def _notify(self, method, url, status_code, elapsed, error):
+        for listener in list(self.listeners):
+            listener(method, url, status_code, elapsed, error)
+
+    def _send_or_replay(self, method, url, **kwargs):
+        cassette = HTTPCassette.active()
+        if cassette is not None and cassette.replaying:
+            return cassette.replay(method, url, **kwargs)
+        response = self._send_network(method, url, **kwargs)
+        if cassette is not None:
+            cassette.record(method, url, response, **kwargs)
+        return response
+
+    def _send_network(self, method, url, **kwargs):
+        if self.resilience is None:
+            return super().request(method, url, **kwargs)
+
+        def send(remaining_budget):
+            call_kwargs = dict(kwargs)
+            timeout = call_kwargs["timeout"]
+            if isinstance(timeout, (int, float)) and remaining_budget is not None:
+                call_kwargs["timeout"] = max(min(timeout, remaining_budget), 0.001)
+            return super(PooledSession, self).request(method, url, **call_kwargs)
+
+        return self.resilience.execute(method, url, send, headers=kwargs.get("headers"))
+
+
+class APISessionPool:
+    """
+    Shared, per-base-URL pool of keep-alive HTTP sessions for API PageClasses.
+    """
+    _settings: Dict[str, Any] = {
+        "pool_connections": 10,
+        "pool_maxsize": 20,
+        "default_timeout": 10,
+        "keep_alive": True,
+        "resilient": True,
+    }
+    _adapters: Dict[str, HTTPAdapter] = {}
+    _listeners: List[Callable] = []
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+                  default_timeout: Optional[float] = None, keep_alive: Optional[bool] = None,
+                  resilient: Optional[bool] = None) -> None:
+        """
+        Updates pool settings for sessions created after this call.
+        Args:
+            pool_connections (int): Number of per-host connection pools kept by each adapter.
+            pool_maxsize (int): Maximum connections kept alive per host.
+            default_timeout (float): Timeout (seconds) for requests that do not pass one.
+            keep_alive (bool): If False, requests are sent with ``Connection: close``.
+            resilient (bool): If False, sessions bypass ResilienceLayer (no retries or circuit breaker).
+        """
+        updates = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "default_timeout": default_timeout,
+            "keep_alive": keep_alive,
+            "resilient": resilient,
+        }
+        with cls._lock:
+            cls._settings.update({key: value for key, value in updates.items() if value is not None})
+
+    @classmethod
+    def settings(cls) -> Dict[str, Any]:
+        """
+        Returns a copy of the current pool settings.
+        """
+        with cls._lock:
+            return dict(cls._settings)
+
+    @staticmethod
+    def base_url_of(url: str) -> str:
+        """
+        Normalizes a URL to its pool key, e.g. https://Example.com/api/x -> https://example.com.
+        """
+        parts = urlsplit(url)
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+    @classmethod
+    def _build_session(cls, adapter: HTTPAdapter, settings: Dict[str, Any]) -> PooledSession:
+        resilience = ResilienceLayer.shared() if settings["resilient"] else None
+        session = PooledSession(default_timeout=settings["default_timeout"], resilience=resilience,
+                                response_cache=ResponseCache.shared(), listeners=cls._listeners)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not settings["keep_alive"]:
+            session.headers["Connection"] = "close"
+        return session
+
+    @classmethod
+    def get_session(cls, url: str) -> PooledSession:
+        """
+        Returns a new session for the base URL of ``url`` with its own cookie jar and headers, mounted on the host's
+        shared connection pool (created on first use).
+        Args:
+            url (str): Any URL on the target host (base URL or full endpoint URL).
+        Returns:
+            PooledSession: Keep-alive session sharing the host's connections.
+        """
+        key = cls.base_url_of(url)
+        with cls._lock:
+            settings = dict(cls._settings)
+            adapter = cls._adapters.get(key)
+            if adapter is None:
+                adapter = HTTPAdapter(pool_connections=settings["pool_connections"],
+                                      pool_maxsize=settings["pool_maxsize"], max_retries=0)
+                cls._adapters[key] = adapter
+        return cls._build_session(adapter, settings)
+
+    @classmethod
+    def add_listener(cls, listener: Callable) -> None:
+        """
+        Registers listener(method, url, status_code, elapsed_seconds, error) for every pooled request.
+        """
+        with cls._lock:
+            cls._listeners.append(listener)
+
+    @classmethod
+    def remove_listener(cls, listener: Callable) -> None:
+        with cls._lock:
+            if listener in cls._listeners:
+                cls._listeners.remove(listener)
+
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Closes every shared connection pool and empties the registry.
+        """
+        with cls._lock:
+            adapters = list(cls._adapters.values())
+            cls._adapters.clear()
+        for adapter in adapters:
+            adapter.close()
@@ -0,0 +1,128 @@
+"""
+AsyncAPIPage.py
+
+Executive Summary:
+------------------
+asyncio counterpart for the API PageClasses (CartAPIPage, ProductSearchAPIPage, ProductInsertAPIPage,
+UserRegistrationAPIPage, ProfileAPIValidationPage, ...). Wrapping a page in AsyncAPIPage exposes every public
+method under the same name as a coroutine, so independent calls can be awaited concurrently and an API suite
+finishes in roughly the time of its longest call chain instead of the sum of all calls.
+
+Detailed Analysis:
+------------------
+- Calls run on one shared worker pool sized to ``APISessionPool.settings()["pool_maxsize"]`` and reuse the pooled
+  keep-alive sessions of APISessionPool, so concurrency never opens more connections than the pool allows.
+- ``AsyncAPIPage.run()`` drives coroutines on one shared event loop for synchronous callers (pytest without plugins,
+  orchestrators); code already inside a running loop simply awaits the methods.
+- Non-callable attributes (``jwt_token``, ``cart_id``, ...) are passed through unchanged.
+
+Implementation Guide:
+---------------------
+1. page = AsyncAPIPage(ProductSearchAPIPage(db_config))
+2. empty, missing = AsyncAPIPage.run(AsyncAPIPage.gather(page.send_search_with_empty_query(),
+                                                         page.send_search_without_query()))
+3. Await dependent steps in sequence (e.g. CartAPIPage.sign_in_user before add_product_to_cart).
+4. Call AsyncAPIPage.shutdown() at session teardown.
+
+Quality Assurance Report:
+-------------------------
+- Assertions raised inside wrapped methods propagate unchanged to the awaiting caller.
+- Methods that mutate page state must not be awaited concurrently on the same page instance.
+
+Troubleshooting Guide:
+----------------------
+- "This event loop is already running": inside async code await the coroutine instead of calling run().
+- Little speed-up: raise ``pool_maxsize`` via APISessionPool.configure() before the first call.
+
+Future Considerations:
+----------------------
+- Native non-blocking transport once an async HTTP client is part of the stack.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, List, Optional
+
+from auto_scripts.Pages.APISessionPool import APISessionPool
+
+
+class AsyncAPIPage:
+    """
+    Wraps a synchronous API PageClass and exposes its public methods as coroutines with the same names.
+    """
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+
+    def __init__(self, page: Any):
+        """
+        Args:
+            page: Instance of a synchronous API PageClass.
+        """
+        self._page = page
+
+    @property
+    def page(self) -> Any:
+        return self._page
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._page, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor(), functools.partial(attr, *args, **kwargs))
+
+        return call
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """
+        Returns the shared worker pool, sized to the HTTP connection pool.
+        """
+        with cls._lock:
+            if cls._executor is None:
+                max_workers = APISessionPool.settings()["pool_maxsize"]
+                cls._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="async-api-page")
+            return cls._executor
+
+    @classmethod
+    def event_loop(cls) -> asyncio.AbstractEventLoop:
+        """
+        Returns the shared event loop used by run().
+        """
+        with cls._lock:
+            if cls._loop is None or cls._loop.is_closed():
+                cls._loop = asyncio.new_event_loop()
+            return cls._loop
+
+    @classmethod
+    def run(cls, awaitable: Awaitable) -> Any:
+        """
+        Runs an awaitable to completion on the shared event loop (for synchronous callers).
+        """
+        return cls.event_loop().run_until_complete(awaitable)
+
+    @staticmethod
+    async def gather(*awaitables: Awaitable, return_exceptions: bool = False) -> List[Any]:
+        """
+        Awaits independent page calls concurrently and returns their results in order.
+        """
+        return list(await asyncio.gather(*awaitables, return_exceptions=return_exceptions))
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Stops the shared worker pool and closes the shared event loop.
+        """
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+            loop, cls._loop = cls._loop, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if loop is not None and not loop.is_closed():
+            loop.close()
@@ -0,0 +1,122 @@
+"""
+BatchQuery.py
+
+Executive Summary:
+------------------
+Set-based lookups for data-driven DB verification. Instead of one query (and formerly one connection) per record,
+keys are deduplicated and fetched with chunked ``WHERE key IN (...)`` queries on a single pooled connection, so
+verifying 1,000 registrations takes one or two round trips instead of 1,000.
+
+Detailed Analysis:
+------------------
+- ``rows_by_keys`` returns {key: row} for the keys that exist; absent keys are simply missing from the dict.
+- ``chunk_size`` (default 1000) bounds the parameter count per statement; all chunks share one connection.
+- ``compare_records`` compares many expected/actual records field by field in one pass and returns per-key results.
+- Table and column names are validated as plain identifiers; key values are always bound as parameters.
+
+Implementation Guide:
+---------------------
+1. rows = BatchQuery.rows_by_keys(db_config, "users", "username", usernames, cursorclass=pymysql.cursors.DictCursor)
+2. results = BatchQuery.compare_records(expected_by_key, rows, fields=["email"])
+3. Used by DatabaseValidationHelper.get_users_from_db, UserRegistrationAPIPage.verify_users_in_db and
+   ProductInsertAPIPage.verify_products_in_db.
+
+Quality Assurance Report:
+-------------------------
+- Duplicate keys are queried once; result order does not depend on input order.
+
+Troubleshooting Guide:
+----------------------
+- "too many placeholders"/packet size errors: lower ``chunk_size``.
+
+Future Considerations:
+----------------------
+- Temporary-table joins for key lists in the hundreds of thousands.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class BatchQuery:
+    """
+    Chunked IN-list lookups and vectorized record comparison for DB verification helpers.
+    """
+    CHUNK_SIZE = 1000
+
+    @classmethod
+    def rows_by_keys(cls, db_config: Dict[str, Any], table: str, key_column: str, keys: Iterable[Any],
+                     columns: Optional[Sequence[str]] = None, chunk_size: Optional[int] = None,
+                     driver: str = "pymysql", **connect_overrides) -> Dict[Any, Any]:
+        """
+        Fetches the rows of ``table`` whose ``key_column`` is in ``keys``.
+        Args:
+            db_config (dict): Connection parameters for DBConnectionPool.
+            table (str): Table name.
+            key_column (str): Lookup column.
+            keys (iterable): Keys to fetch.
+            columns (list, optional): Selected columns (default all); must include ``key_column`` for tuple rows.
+            chunk_size (int, optional): Keys per IN list.
+            driver (str): "pymysql" or "psycopg2".
+            connect_overrides: e.g. ``cursorclass=pymysql.cursors.DictCursor`` for dict rows.
+        Returns:
+            dict: {key: row} for existing keys.
+        """
+        for name in [table, key_column, *(columns or [])]:
+            assert IDENTIFIER.match(name), f"Invalid SQL identifier: {name!r}"
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        select = ", ".join(columns) if columns else "*"
+        rows: Dict[Any, Any] = {}
+        with DBConnectionPool.connection(db_config, driver=driver, **connect_overrides) as conn:
+            with conn.cursor() as cursor:
+                key_index = None
+                for start in range(0, len(unique_keys), chunk_size):
+                    chunk = unique_keys[start:start + chunk_size]
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    cursor.execute(f"SELECT {select} FROM {table} WHERE {key_column} IN ({placeholders})", chunk)
+                    if key_index is None and cursor.description:
+                        names = [d[0] for d in cursor.description]
+                        key_index = names.index(key_column) if key_column in names else 0
+                    for row in cursor.fetchall():
+                        rows[row[key_column] if isinstance(row, dict) else row[key_index]] = row
+        return rows
+
+    @staticmethod
+    def compare_records(expected: Dict[Any, Dict[str, Any]], actual: Dict[Any, Dict[str, Any]],
+                        fields: Sequence[str], forbidden: Sequence[str] = (),
+                        normalize=str) -> Dict[Any, Dict[str, Any]]:
+        """
+        Compares expected and actual records per key in one pass.
+        Args:
+            expected (dict): {key: expected record}.
+            actual (dict): {key: actual record} (e.g. from rows_by_keys).
+            fields (list): Fields compared after ``normalize``.
+            forbidden (list): Fields that must not be present in the actual record.
+            normalize (callable): Value normalization before comparison (default str).
+        Returns:
+            dict: {key: {"match": bool, "missing": bool, "mismatches": [...]}} for every expected key.
+        """
+        results: Dict[Any, Dict[str, Any]] = {}
+        for key, want in expected.items():
+            got = actual.get(key)
+            if got is None:
+                results[key] = {"match": False, "missing": True, "mismatches": ["record not found"]}
+                continue
+            mismatches: List[str] = []
+            for field in fields:
+                if field not in want or field not in got:
+                    mismatches.append(f"Missing field '{field}' in comparison.")
+                elif normalize(want[field]) != normalize(got[field]):
+                    mismatches.append(f"Mismatch in field '{field}': expected={want[field]}, actual={got[field]}")
+            for field in forbidden:
+                if field in got:
+                    mismatches.append(f"Field '{field}' should not be present.")
+            results[key] = {"match": not mismatches, "missing": False, "mismatches": mismatches}
+        return results
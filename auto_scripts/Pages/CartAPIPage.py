@@ -40,14 +40,16 @@ Future Considerations:
 - Extend to support multiple products and cart operations.
 - Parameterize API endpoints and DB queries for environment-agnostic execution.
 - Integrate with service virtualization for non-prod environments.
-- Add retry logic for transient failures and network instability.
+- Transient API failures are retried by ResilienceLayer through the pooled APISessionPool session.
 """
 
 import requests
 import logging
 from typing import Dict, Any, Optional
-from JWTUtils import JWTUtils  # Assumed utility for JWT handling
-import psycopg2  # Example DB connector; adjust as per your stack
+from auto_scripts.Pages.JWTUtils import JWTUtils
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool  # psycopg2 connections; adjust driver as per your stack
+from auto_scripts.Pages.DBSnapshot import DBSnapshot
 
 class CartAPIPage:
     """
@@ -59,8 +61,9 @@ class CartAPIPage:
     ADD_TO_CART_API = f"{BASE_URL}/api/cart/items"
     GET_CART_API = f"{BASE_URL}/api/cart"
 
-    def __init__(self, db_config: Dict[str, Any], logger: Optional[logging.Logger] = None):
-        self.session = requests.Session()
+    def __init__(self, db_config: Dict[str, Any], logger: Optional[logging.Logger] = None,
+                 session: Optional[requests.Session] = None):
+        self.session = session or APISessionPool.get_session(self.BASE_URL)
         self.jwt_token = None
         self.user_id = None
         self.cart_id = None
@@ -99,8 +102,7 @@ class CartAPIPage:
         """
         Queries the database to verify cart and item creation.
         """
-        conn = psycopg2.connect(**self.db_config)
-        try:
+        with DBConnectionPool.connection(self.db_config, driver="psycopg2") as conn:
             with conn.cursor() as cur:
                 # Verify cart exists
                 cur.execute("SELECT cartid, userid FROM carts WHERE userid=%s", (self.user_id,))
@@ -114,8 +116,6 @@ class CartAPIPage:
                 assert item_row, f"No cart item found for cartId={self.cart_id}"
                 db_product_id, db_quantity = item_row
                 self.logger.info(f"DB check: cartId={self.cart_id}, productId={db_product_id}, quantity={db_quantity}")
-        finally:
-            conn.close()
 
     def get_cart_details(self) -> Dict[str, Any]:
         """
@@ -129,13 +129,19 @@ class CartAPIPage:
         self.logger.info(f"Cart details: {data}")
         return data
 
-    def run_full_cart_creation_flow(self, email: str, password: str, product_id: str, quantity: int) -> None:
+    def run_full_cart_creation_flow(self, email: str, password: str, product_id: str, quantity: int,
+                                    snapshot: Optional[DBSnapshot] = None) -> None:
         """
         Orchestrates the full test flow as per TC-SCRUM-96-010.
+        If a DBSnapshot of the shop tables is passed, adding to the cart must only insert carts/cart_items rows.
         """
         self.sign_in_user(email, password)
+        before = snapshot.capture() if snapshot is not None else None
         self.add_product_to_cart(product_id, quantity)
         self.verify_cart_in_database()
+        if snapshot is not None:
+            DBSnapshot.assert_unchanged(snapshot.diff(before),
+                                        allow={"carts": ["inserted"], "cart_items": ["inserted"]})
         cart_details = self.get_cart_details()
         # Final assertions
         items = cart_details["items"]
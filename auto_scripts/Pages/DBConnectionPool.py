@@ -0,0 +1,261 @@
+"""
+DBConnectionPool.py
+
+Executive Summary:
+------------------
+Process-wide pool of database connections, one pool per (driver, db_config). All DB-validating PageClasses borrow
+connections from here instead of calling ``pymysql.connect``/``psycopg2.connect`` and ``close`` on every check, so
+connection setup is paid once per worker and parallel runs stay under the test database's connection limit.
+
+Detailed Analysis:
+------------------
+- One interface over pymysql and psycopg2: ``with DBConnectionPool.connection(db_config, driver=...) as conn``
+  yields a plain DB-API connection; drivers are imported lazily, so only the one in use must be installed.
+- ``max_size`` bounds open connections per pool; borrowers wait up to ``acquire_timeout`` for a free one.
+- Health check: a connection idle for longer than ``health_check_after`` seconds is pinged before reuse and
+  replaced if dead; connections idle for longer than ``idle_timeout`` are closed instead of reused.
+- On release the open transaction is rolled back (a no-op after ``commit()``), so the next borrower never sees a
+  stale snapshot or uncommitted writes. Connections that raised a driver error are discarded.
+- New connections are opened through ResilienceLayer.shared(), keyed "<driver>://<host>", with retries on
+  transient connect errors.
+
+Implementation Guide:
+---------------------
+1. Optionally tune once per run: ``DBConnectionPool.configure(max_size=20)``.
+2. ``with DBConnectionPool.connection(self.db_config, cursorclass=pymysql.cursors.DictCursor) as conn: ...``
+3. PostgreSQL: ``DBConnectionPool.connection(self.db_config, driver="psycopg2")``.
+   Offline: ``StandInDatabase().install()`` (SQLiteStandIn) routes every pool to an embedded SQLite database.
+4. ``DBConnectionPool.close_all()`` at session teardown (also registered with atexit).
+
+Quality Assurance Report:
+-------------------------
+- Distinct connect options (e.g. ``cursorclass``) get distinct pools, so borrowers always get what they asked for.
+- Settings changed via ``configure()`` apply to pools created afterwards.
+
+Troubleshooting Guide:
+----------------------
+- "No free DB connection": raise ``max_size`` or look for code holding connections outside a ``with`` block.
+- "Too many connections" on the server: lower ``max_size``; the total is max_size x pools x worker processes.
+
+Future Considerations:
+----------------------
+- Per-pool usage statistics for LoadTestRunner reports.
+"""
+
+import atexit
+import contextlib
+import importlib
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from auto_scripts.Pages.ResilienceLayer import ResilienceLayer
+
+
+class DBConnectionPool:
+    """
+    Bounded, health-checked pool of connections for one driver and connection config.
+    """
+    DRIVERS = {
+        "pymysql": {"scheme": "mysql", "transient": ("err.OperationalError",)},
+        "psycopg2": {"scheme": "postgresql", "transient": ("OperationalError",)},
+        "sqlite": {"scheme": "sqlite", "transient": ("OperationalError",), "module": "auto_scripts.Pages.SQLiteStandIn"},
+    }
+    _settings: Dict[str, Any] = {
+        "max_size": 10,
+        "acquire_timeout": 30.0,
+        "health_check_after": 30.0,
+        "idle_timeout": 300.0,
+    }
+    _pools: Dict[Tuple, "DBConnectionPool"] = {}
+    _stand_in: Optional[str] = None
+    _lock = threading.Lock()
+
+    def __init__(self, driver: str, connect_kwargs: Dict[str, Any], max_size: int = 10, acquire_timeout: float = 30.0,
+                 health_check_after: float = 30.0, idle_timeout: float = 300.0):
+        """
+        Args:
+            driver (str): "pymysql", "psycopg2" or "sqlite" (the embedded SQLiteStandIn).
+            connect_kwargs (dict): Keyword arguments for the driver's ``connect``.
+            max_size (int): Maximum open connections.
+            acquire_timeout (float): Seconds to wait for a free connection.
+            health_check_after (float): Idle seconds after which a connection is pinged before reuse.
+            idle_timeout (float): Idle seconds after which a connection is closed instead of reused.
+        """
+        assert driver in self.DRIVERS, f"Unsupported DB driver '{driver}', expected one of {sorted(self.DRIVERS)}"
+        self.driver = driver
+        self.connect_kwargs = dict(connect_kwargs)
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_after = health_check_after
+        self.idle_timeout = idle_timeout
+        self.module = importlib.import_module(self.DRIVERS[driver].get("module", driver))
+        self.transient_errors = tuple(self._resolve(name) for name in self.DRIVERS[driver]["transient"])
+        self.breaker_key = f"{self.DRIVERS[driver]['scheme']}://{self.connect_kwargs.get('host', 'localhost')}"
+        self._idle: List[Tuple[Any, float]] = []
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle_lock = threading.Lock()
+
+    def _resolve(self, dotted: str) -> type:
+        target = self.module
+        for part in dotted.split("."):
+            target = getattr(target, part)
+        return target
+
+    # --- registry ---
+    @classmethod
+    def configure(cls, max_size: Optional[int] = None, acquire_timeout: Optional[float] = None,
+                  health_check_after: Optional[float] = None, idle_timeout: Optional[float] = None) -> None:
+        """
+        Updates pool settings for pools created after this call.
+        """
+        updates = {
+            "max_size": max_size,
+            "acquire_timeout": acquire_timeout,
+            "health_check_after": health_check_after,
+            "idle_timeout": idle_timeout,
+        }
+        with cls._lock:
+            cls._settings.update({key: value for key, value in updates.items() if value is not None})
+
+    @classmethod
+    def use_stand_in(cls, database: Optional[str]) -> None:
+        """
+        Routes every pool to the embedded SQLite stand-in ``database`` (None restores the real drivers).
+        Existing pools are closed so no borrower keeps a connection to the previous backend.
+        """
+        cls.close_all()
+        with cls._lock:
+            cls._stand_in = database
+
+    @classmethod
+    def effective_driver(cls, driver: str) -> str:
+        """
+        Returns the driver that will actually serve ``driver`` requests ("sqlite" while a stand-in is installed).
+        """
+        return "sqlite" if cls._stand_in is not None else driver
+
+    @staticmethod
+    def key_of(driver: str, connect_kwargs: Dict[str, Any]) -> Tuple:
+        return (driver,) + tuple(sorted((str(k), repr(v)) for k, v in connect_kwargs.items()))
+
+    @classmethod
+    def for_config(cls, db_config: Dict[str, Any], driver: str = "pymysql", **connect_overrides) -> "DBConnectionPool":
+        """
+        Returns the shared pool for ``db_config`` (plus overrides such as ``cursorclass``), creating it on first use.
+        """
+        if cls._stand_in is not None:
+            driver, db_config = "sqlite", {"database": cls._stand_in}
+        connect_kwargs = {**db_config, **connect_overrides}
+        key = cls.key_of(driver, connect_kwargs)
+        with cls._lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(driver, connect_kwargs, **cls._settings)
+                cls._pools[key] = pool
+            return pool
+
+    @classmethod
+    def connection(cls, db_config: Dict[str, Any], driver: str = "pymysql", **connect_overrides):
+        """
+        Borrows a connection from the shared pool for ``db_config``; use as a context manager.
+        """
+        return cls.for_config(db_config, driver, **connect_overrides).borrow()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Closes every idle pooled connection and empties the registry.
+        """
+        with cls._lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+
+    # --- pool ---
+    def _connect(self) -> Any:
+        return ResilienceLayer.shared().call(self.breaker_key, self.module.connect,
+                                             retry_exceptions=self.transient_errors, **self.connect_kwargs)
+
+    def _is_alive(self, conn: Any) -> bool:
+        try:
+            if self.driver in ("pymysql", "sqlite"):
+                conn.ping(reconnect=False)
+            else:
+                if conn.closed:
+                    return False
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _acquire(self) -> Any:
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No free DB connection within {self.acquire_timeout}s "
+                               f"({self.breaker_key}, max_size={self.max_size})")
+        try:
+            while True:
+                with self._idle_lock:
+                    if not self._idle:
+                        break
+                    conn, released_at = self._idle.pop()
+                idle_for = time.monotonic() - released_at
+                if idle_for > self.idle_timeout:
+                    self._close_quietly(conn)
+                elif idle_for <= self.health_check_after or self._is_alive(conn):
+                    return conn
+                else:
+                    self._close_quietly(conn)
+            return self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: Any, broken: bool) -> None:
+        try:
+            if not broken:
+                try:
+                    conn.rollback()
+                except Exception:
+                    broken = True
+            if broken:
+                self._close_quietly(conn)
+            else:
+                with self._idle_lock:
+                    self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextlib.contextmanager
+    def borrow(self) -> Iterator[Any]:
+        """
+        Yields a healthy connection and returns it to the pool afterwards.
+        """
+        conn = self._acquire()
+        broken = False
+        try:
+            yield conn
+        except BaseException as e:
+            broken = isinstance(e, self.module.Error)
+            raise
+        finally:
+            self._release(conn, broken)
+
+    def close(self) -> None:
+        with self._idle_lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+
+atexit.register(DBConnectionPool.close_all)
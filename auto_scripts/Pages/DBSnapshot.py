@@ -0,0 +1,236 @@
+"""
+DBSnapshot.py
+
+Executive Summary:
+------------------
+Before/after snapshots of watched tables for side-effect assertions. A snapshot stores lightweight per-table
+fingerprints (row count, key range, chunk checksums and compact per-row hashes computed in the database); after the
+step under test, only chunks whose checksum changed are re-read, and the diff lists exactly which rows were inserted,
+updated or deleted. Tables are fingerprinted in parallel, so "nothing else changed" is a complete guarantee at a
+fraction of the cost of full-table reads.
+
+Detailed Analysis:
+------------------
+- Builds on TableIntegrityChecker: same row hash, chunking and dialects (MySQL, PostgreSQL 14+).
+- Capture per table: COUNT/MIN/MAX, per-chunk COUNT + BIT_XOR checksums and, with ``exact=True``, (key, hash) pairs
+  streamed through a server-side cursor into compact arrays (16 bytes per row; column values are never fetched).
+  All three reads of a table run in one REPEATABLE READ transaction (TableIntegrityChecker.consistent_read), so
+  concurrent writers cannot make them disagree. Each table has its own transaction; tables are diffed separately.
+- Keys are stored as unsigned 64-bit (``array("Q")``) when non-negative, signed when negative keys exist, and in a
+  plain list when they fit neither (e.g. BIGINT UNSIGNED mixed with negatives).
+- Diff: one checksum query per table; row hashes are streamed only for changed chunks and merged against the
+  snapshot to classify inserted / updated / deleted keys.
+- ``exact=False`` skips per-row hashes and reports changed key ranges with row-count deltas only.
+- Tables are processed concurrently on ``max_workers`` threads, each on its own pooled connection.
+- ``diff(before, keys={"products": [...]})`` scopes the row-level diff of a table to given keys, so a test asserts
+  only on its own rows while parallel tests write to the same table.
+
+Implementation Guide:
+---------------------
+1. snapshot = DBSnapshot(db_config, {"products": ["name", "description", "price"]})
+2. before = snapshot.capture()
+3. ... step under test ...
+4. diff = snapshot.diff(before)
+5. DBSnapshot.assert_unchanged(diff)                         # nothing changed at all
+   DBSnapshot.assert_unchanged(diff, allow={"carts": ["inserted"]})   # only the expected side effect
+   DBSnapshot.assert_unchanged(snapshot.diff(before, keys={"products": [own_id]}))   # shared table, own rows only
+   DBSnapshot.assert_unchanged(diff, allow_keys={"products": {"inserted": [own_id]}})  # whole table, one known insert
+
+Quality Assurance Report:
+-------------------------
+- Row key lists are capped at ``max_row_diffs`` per kind; counts are always exact.
+- ``allow_keys`` permits changes to named rows only: any other row of that kind (counted, even beyond the cap) fails.
+- A table whose column list changed between capture and diff is rejected rather than diffed.
+
+Troubleshooting Guide:
+----------------------
+- Spurious updates on every run: exclude columns the application rewrites (e.g. updated_at) from the watch list.
+- Slow capture on very large tables: use ``exact=False`` for tables where range-level diffs are enough.
+
+Future Considerations:
+----------------------
+- Persisting snapshots to disk for cross-process comparisons.
+"""
+
+import bisect
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from auto_scripts.Pages.TableIntegrityChecker import TableIntegrityChecker
+
+HASH_MASK = (1 << 64) - 1
+
+
+class DBSnapshot:
+    """
+    Captures fingerprints of watched tables and diffs them after a test step.
+    """
+    CHANGE_KINDS = ("inserted", "updated", "deleted")
+
+    def __init__(self, db_config: Dict[str, Any], tables: Dict[str, Sequence[str]], keys: Optional[Dict[str, str]] = None,
+                 driver: str = "pymysql", chunk_size: int = 10000, exact: bool = True, max_workers: int = 4,
+                 max_row_diffs: int = 1000):
+        """
+        Args:
+            db_config (dict): Connection parameters for DBConnectionPool.
+            tables (dict): Watched table -> columns covered by the fingerprint.
+            keys (dict, optional): Table -> integer primary key column (default "id").
+            driver (str): "pymysql" or "psycopg2".
+            chunk_size (int): Key range per checksum chunk.
+            exact (bool): Keep per-row hashes for an exact row-level diff.
+            max_workers (int): Tables fingerprinted in parallel.
+            max_row_diffs (int): Cap on keys listed per change kind and table.
+        """
+        keys = keys or {}
+        self.checkers = {
+            table: TableIntegrityChecker(db_config, table, columns, key=keys.get(table, "id"), driver=driver,
+                                         chunk_size=chunk_size)
+            for table, columns in tables.items()
+        }
+        self.exact = exact
+        self.max_workers = max_workers
+        self.max_row_diffs = max_row_diffs
+
+    def _parallel(self, func, tables: Iterable[str]) -> Dict[str, Any]:
+        tables = list(tables)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(tables)))) as executor:
+            return dict(zip(tables, executor.map(func, tables)))
+
+    # --- capture ---
+    @staticmethod
+    def _key_store(min_key: Any, max_key: Any):
+        if isinstance(min_key, int) and isinstance(max_key, int):
+            if 0 <= min_key and max_key <= HASH_MASK:
+                return array("Q")
+            if -(1 << 63) <= min_key and max_key < 1 << 63:
+                return array("q")
+        return []
+
+    def _capture_table(self, table: str) -> Dict[str, Any]:
+        checker = self.checkers[table]
+        with checker.consistent_read() as conn:
+            row_count, min_key, max_key = checker.key_stats(conn)
+            fingerprint = {
+                "columns": list(checker.columns),
+                "row_count": row_count,
+                "key_range": [min_key, max_key],
+                "chunks": checker._range_checksums(None, None, checker.chunk_size, conn=conn),
+                "keys": None,
+                "hashes": None,
+            }
+            if self.exact:
+                keys, hashes = self._key_store(min_key, max_key), array("Q")
+                for key, row_hash in checker.stream_row_hashes(conn=conn):
+                    keys.append(key)
+                    hashes.append(row_hash & HASH_MASK)
+                fingerprint["keys"], fingerprint["hashes"] = keys, hashes
+        return fingerprint
+
+    def capture(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Fingerprints every watched table (in parallel).
+        Returns:
+            dict: table -> fingerprint, to be passed to diff().
+        """
+        return self._parallel(self._capture_table, self.checkers)
+
+    # --- diff ---
+    def _record(self, result: Dict[str, Any], kind: str, key: Any) -> None:
+        if result["scope"] is not None and key not in result["scope"]:
+            return
+        result["counts"][kind] += 1
+        if len(result[kind]) < self.max_row_diffs:
+            result[kind].append(key)
+
+    def _diff_chunk_rows(self, checker: TableIntegrityChecker, before: Dict[str, Any], start: int,
+                         result: Dict[str, Any]) -> None:
+        keys, hashes = before["keys"], before["hashes"]
+        i = bisect.bisect_left(keys, start)
+        end = bisect.bisect_left(keys, start + checker.chunk_size)
+        for key, row_hash in checker.stream_row_hashes(start, start + checker.chunk_size):
+            while i < end and keys[i] < key:
+                self._record(result, "deleted", keys[i])
+                i += 1
+            if i < end and keys[i] == key:
+                if hashes[i] != row_hash & HASH_MASK:
+                    self._record(result, "updated", key)
+                i += 1
+            else:
+                self._record(result, "inserted", key)
+        for j in range(i, end):
+            self._record(result, "deleted", keys[j])
+
+    def _diff_table(self, table: str, before: Dict[str, Any], scope: Optional[set] = None) -> Dict[str, Any]:
+        checker = self.checkers[table]
+        assert before["columns"] == checker.columns, f"Watched columns of '{table}' changed since capture"
+        after_chunks = checker._range_checksums(None, None, checker.chunk_size)
+        result = {
+            "row_count_before": before["row_count"],
+            "row_count_after": sum(count for count, _ in after_chunks.values()),
+            "changed_ranges": [],
+            "counts": {kind: 0 for kind in self.CHANGE_KINDS},
+            "inserted": [],
+            "updated": [],
+            "deleted": [],
+            "exact": before["keys"] is not None,
+            "scope": scope,
+        }
+        for start in sorted(set(before["chunks"]) | set(after_chunks)):
+            if before["chunks"].get(start) == after_chunks.get(start):
+                continue
+            if scope is not None and not any(start <= key < start + checker.chunk_size for key in scope):
+                continue
+            result["changed_ranges"].append([start, start + checker.chunk_size])
+            if result["exact"]:
+                self._diff_chunk_rows(checker, before, start, result)
+        if result["exact"] and scope is not None:
+            result["changed"] = any(result["counts"].values())
+        else:
+            result["changed"] = bool(result["changed_ranges"])
+        return result
+
+    def diff(self, before: Dict[str, Dict[str, Any]],
+             keys: Optional[Dict[str, Iterable[Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Compares the current state of the watched tables with a capture() result (tables in parallel).
+        Args:
+            before (dict): Result of capture().
+            keys (dict, optional): Table -> keys; changes to other rows of that table are ignored.
+        Returns:
+            dict: table -> {"changed", "counts", "inserted", "updated", "deleted", "changed_ranges", ...}
+        """
+        scopes = {table: set(table_keys) for table, table_keys in (keys or {}).items()}
+        return self._parallel(lambda table: self._diff_table(table, before[table], scopes.get(table)), before)
+
+    @classmethod
+    def assert_unchanged(cls, diff: Dict[str, Dict[str, Any]], allow: Optional[Dict[str, List[str]]] = None,
+                         allow_keys: Optional[Dict[str, Dict[str, Iterable[Any]]]] = None) -> None:
+        """
+        Raises AssertionError if any watched table changed beyond the ``allow``ed change kinds and ``allow_keys`` rows.
+        Args:
+            diff (dict): Result of diff().
+            allow (dict, optional): Table -> allowed change kinds, e.g. {"carts": ["inserted"]}; "*" allows any.
+            allow_keys (dict, optional): Table -> {kind: keys}, e.g. {"products": {"inserted": [42]}}; only those
+                rows may change in that way.
+        """
+        allow = allow or {}
+        allow_keys = allow_keys or {}
+        problems = []
+        for table, result in diff.items():
+            if not result["changed"]:
+                continue
+            if not result["exact"]:
+                if "*" not in allow.get(table, ()):
+                    # Range-level diffs cannot tell allowed rows from others.
+                    problems.append(f"{table}: key ranges {result['changed_ranges'][:10]} changed")
+                continue
+            for kind in cls.CHANGE_KINDS:
+                if not result["counts"][kind] or {kind, "*"} & set(allow.get(table, ())):
+                    continue
+                allowed = set(allow_keys.get(table, {}).get(kind, ()))
+                unexpected = [key for key in result[kind] if key not in allowed]
+                if result["counts"][kind] > len(result[kind]) - len(unexpected):
+                    problems.append(f"{table}: {result['counts'][kind] - len(result[kind]) + len(unexpected)} rows "
+                                    f"{kind} {unexpected[:10]}")
+        assert not problems, "Unexpected database side effects: " + "; ".join(problems)
@@ -0,0 +1,193 @@
+"""
+EventualConsistency.py
+
+Executive Summary:
+------------------
+Generic "await condition" facility for eventually-consistent side effects (DB rows written by replicas or async
+workers, log lines written by the mail worker). A probe is polled with exponential backoff, jitter and an overall
+deadline; verification completes as soon as the data lands, without fixed sleeps and without failing on lag that
+stays within the deadline. Time-to-consistency is recorded per condition as a latency histogram.
+
+Detailed Analysis:
+------------------
+- ``AwaitCondition.until(probe, name)`` calls ``probe()`` until it returns a truthy value; exceptions listed in
+  ``ignore`` (default AssertionError) count as "not yet".
+- Delay before poll n: ``min(max_delay, initial_delay * multiplier**n)`` scaled by ``uniform(1 - jitter, 1)`` and
+  clipped to the remaining deadline, so the final poll happens right at the deadline.
+- On timeout, ConsistencyTimeout (an AssertionError) carries the condition name, attempts and the last probe error.
+- Probe factories: ``db_row`` (query through DBConnectionPool) and ``log_line`` (reads through the shared LogReader
+  from the last mark, so each poll only reads newly appended bytes).
+- ``AwaitCondition.metrics()`` returns time-to-consistency summaries (LatencyHistogram) and timeout counts.
+
+Implementation Guide:
+---------------------
+1. ``AwaitCondition.until(lambda: page.verify_user_in_db(username, email), "user row visible", timeout=30)``
+2. ``AwaitCondition.until(AwaitCondition.log_line(path, lambda line: email in line), "confirmation email logged")``
+3. Report ``AwaitCondition.metrics()`` at the end of a run to watch replication / worker lag trends.
+
+Quality Assurance Report:
+-------------------------
+- Unexpected exceptions from probes propagate immediately instead of being retried until the deadline.
+- Metrics are thread-safe; parallel workers share one registry per process.
+
+Troubleshooting Guide:
+----------------------
+- Frequent ConsistencyTimeout: check the metrics p99 against the deadline before raising ``timeout``.
+
+Future Considerations:
+----------------------
+- Push-based waits for other sources (log lines already use LogFollower).
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.LogReader import LogMark, LogReader
+from auto_scripts.Pages.Metrics import LatencyHistogram
+
+
+class ConsistencyTimeout(AssertionError):
+    """
+    Raised when a condition did not become true before its deadline.
+    """
+
+    def __init__(self, name: str, timeout: float, attempts: int, last_error: Optional[BaseException] = None):
+        detail = f": {last_error}" if last_error is not None else ""
+        super().__init__(f"'{name}' not satisfied within {timeout}s after {attempts} attempts{detail}")
+        self.name = name
+        self.timeout = timeout
+        self.attempts = attempts
+        self.last_error = last_error
+
+
+class AwaitCondition:
+    """
+    Polls probes with exponential backoff and jitter until they succeed or a deadline passes.
+    """
+    DEFAULTS = {
+        "timeout": 30.0,
+        "initial_delay": 0.05,
+        "max_delay": 2.0,
+        "multiplier": 2.0,
+        "jitter": 0.5,
+    }
+    _histograms: Dict[str, LatencyHistogram] = {}
+    _timeouts: Dict[str, int] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def until(cls, probe: Callable[[], Any], name: str, timeout: Optional[float] = None,
+              initial_delay: Optional[float] = None, max_delay: Optional[float] = None,
+              multiplier: Optional[float] = None, jitter: Optional[float] = None,
+              ignore: Tuple[type, ...] = (AssertionError,)) -> Any:
+        """
+        Polls ``probe`` until it returns a truthy value.
+        Args:
+            probe (callable): Condition check; returns the awaited value or a falsy value / raises ``ignore``.
+            name (str): Condition name for errors and metrics.
+            timeout (float): Overall deadline in seconds.
+            initial_delay (float): First backoff delay in seconds.
+            max_delay (float): Backoff cap in seconds.
+            multiplier (float): Backoff growth factor.
+            jitter (float): Fraction of each delay randomized away (0 = none, 1 = full jitter).
+            ignore (tuple): Exception types treated as "not yet".
+        Returns:
+            The probe's first truthy result.
+        Raises:
+            ConsistencyTimeout: If the deadline passes first.
+        """
+        settings = {**cls.DEFAULTS, **{k: v for k, v in {
+            "timeout": timeout, "initial_delay": initial_delay, "max_delay": max_delay,
+            "multiplier": multiplier, "jitter": jitter}.items() if v is not None}}
+        started = time.monotonic()
+        deadline = started + settings["timeout"]
+        attempts = 0
+        last_error: Optional[BaseException] = None
+        while True:
+            attempts += 1
+            try:
+                result = probe()
+                if result:
+                    cls._record(name, time.monotonic() - started)
+                    return result
+                last_error = None
+            except ignore as e:
+                last_error = e
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                with cls._lock:
+                    cls._timeouts[name] = cls._timeouts.get(name, 0) + 1
+                raise ConsistencyTimeout(name, settings["timeout"], attempts, last_error)
+            delay = min(settings["max_delay"], settings["initial_delay"] * settings["multiplier"] ** (attempts - 1))
+            delay *= random.uniform(1 - settings["jitter"], 1)
+            time.sleep(min(delay, remaining))
+
+    # --- probes ---
+    @staticmethod
+    def db_row(db_config: Dict[str, Any], sql: str, params: Sequence[Any] = (), driver: str = "pymysql",
+               **connect_overrides) -> Callable[[], Any]:
+        """
+        Returns a probe yielding the first row of ``sql`` (None while no row matches).
+        """
+        def probe():
+            with DBConnectionPool.connection(db_config, driver=driver, **connect_overrides) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    return cursor.fetchone()
+        return probe
+
+    @staticmethod
+    def log_line(path: str, predicate: Callable[[str], bool], from_end: bool = False,
+                 since: Optional[LogMark] = None) -> Callable[[], Optional[str]]:
+        """
+        Returns a probe yielding the first log line matching ``predicate``. Reads go through the shared LogReader, so
+        each poll only sees lines appended since the previous poll; rotation and truncation are handled there.
+        Args:
+            path (str): Log file.
+            predicate (callable): Line matcher.
+            from_end (bool): Ignore lines already present when the probe is created.
+            since (LogMark, optional): Start from this mark (e.g. taken at test start); overrides ``from_end``.
+        """
+        reader = LogReader.for_path(path)
+        state = {"mark": since or reader.mark(at_start=not from_end)}
+
+        def probe():
+            lines, state["mark"] = reader.read_since(state["mark"])
+            return next((line for line in lines if predicate(line)), None)
+        return probe
+
+    # --- metrics ---
+    @classmethod
+    def _record(cls, name: str, elapsed: float) -> None:
+        with cls._lock:
+            cls._histograms.setdefault(name, LatencyHistogram()).record(elapsed * 1_000_000)
+
+    @classmethod
+    def record(cls, name: str, elapsed: Optional[float]) -> None:
+        """
+        Records a wait performed outside ``until`` (e.g. LogFollower); ``elapsed`` None records a timeout.
+        """
+        if elapsed is not None:
+            cls._record(name, elapsed)
+            return
+        with cls._lock:
+            cls._timeouts[name] = cls._timeouts.get(name, 0) + 1
+
+    @classmethod
+    def metrics(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns {condition: time-to-consistency summary (ms) plus "timeouts"}.
+        """
+        with cls._lock:
+            names = set(cls._histograms) | set(cls._timeouts)
+            return {name: {**(cls._histograms[name].summary() if name in cls._histograms else {"count": 0}),
+                           "timeouts": cls._timeouts.get(name, 0)} for name in sorted(names)}
+
+    @classmethod
+    def reset_metrics(cls) -> None:
+        with cls._lock:
+            cls._histograms.clear()
+            cls._timeouts.clear()
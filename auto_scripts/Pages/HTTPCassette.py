@@ -0,0 +1,233 @@
+"""
+HTTPCassette.py
+
+Executive Summary:
+------------------
+Record/replay layer for the shared HTTP client. In record mode every request made through an APISessionPool session
+is captured into a compact cassette file with secrets redacted; in replay mode the same requests are answered from
+memory without touching the network. API-level suites then run offline and deterministically on developer machines
+and in CI, and the framework's own overhead becomes measurable with LoadTestRunner against a cassette.
+
+Detailed Analysis:
+------------------
+- Match key: method, host, path, normalized (sorted, redacted) query and sha256 of the canonical request body
+  (JSON bodies are hashed with sorted keys, so dict ordering does not matter).
+- Repeated identical requests replay their recorded responses in order; the last one repeats when exhausted.
+- Redaction: values of secret-looking keys (token, password, secret, apiKey, ...) in query strings and JSON response
+  bodies are replaced. JWTs keep header and payload and lose their signature, so claim extraction still works offline.
+- Request headers (Authorization, Cookie) are never written to the cassette.
+- Replay bypasses retries and circuit breaking; listeners (LoadTestRunner) still see every replayed call.
+- Replayed responses are fully read ``requests.Response`` objects with an in-memory ``raw`` stream, so
+  ``stream=True`` consumers (``iter_content``/``iter_lines``/``close``) behave as against the network.
+
+Implementation Guide:
+---------------------
+1. Record once against a live or stand-in backend:
+   ``with HTTPCassette("cassettes/tc_scrum96_009.json", mode="record"): page.run_tc_scrum96_009()``
+2. Replay offline: same block with ``mode="replay"``.
+3. CI without code changes: set ``API_CASSETTE=cassettes/suite.json`` and ``API_CASSETTE_MODE=replay``.
+
+Quality Assurance Report:
+-------------------------
+- A request missing from the cassette raises CassetteMissError in replay mode instead of silently going online.
+- Cassettes are written atomically when the recording block exits.
+
+Troubleshooting Guide:
+----------------------
+- CassetteMissError after changing test data: re-record; the body hash covers the full request payload.
+- Non-deterministic payloads (timestamps, uuids): pass ``ignore_body=True`` for those endpoints' cassettes.
+
+Future Considerations:
+----------------------
+- Per-endpoint body normalizers instead of the all-or-nothing ``ignore_body``.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CassetteMissError(LookupError):
+    """
+    Raised in replay mode when no recorded interaction matches a request.
+    """
+
+
+class HTTPCassette:
+    """
+    Records HTTP interactions of pooled sessions into a cassette file and replays them from memory.
+    """
+    MODES = ("record", "replay")
+    SECRET_KEYS = re.compile(r"(token|password|passwd|secret|api[_-]?key|authorization|jwt)", re.IGNORECASE)
+    JWT_PATTERN = re.compile(r"^[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+$")
+    KEPT_RESPONSE_HEADERS = ("Content-Type",)
+
+    _active: Optional["HTTPCassette"] = None
+    _env_loaded = False
+    _lock = threading.Lock()
+
+    def __init__(self, path: str, mode: str = "replay", ignore_body: bool = False):
+        """
+        Args:
+            path (str): Cassette file.
+            mode (str): "record" or "replay".
+            ignore_body (bool): Match on method, path and query only.
+        """
+        assert mode in self.MODES, f"Unknown cassette mode '{mode}', expected one of {self.MODES}"
+        self.path = path
+        self.mode = mode
+        self.ignore_body = ignore_body
+        self.interactions: Dict[Tuple, List[Dict[str, Any]]] = {}
+        self._replay_positions: Dict[Tuple, int] = {}
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self.load()
+
+    # --- activation ---
+    @classmethod
+    def active(cls) -> Optional["HTTPCassette"]:
+        """
+        Returns the active cassette, activating one from API_CASSETTE/API_CASSETTE_MODE on first call.
+        """
+        if cls._active is None and not cls._env_loaded:
+            with cls._lock:
+                if not cls._env_loaded:
+                    cls._env_loaded = True
+                    path = os.environ.get("API_CASSETTE")
+                    if path:
+                        cls._active = cls(path, os.environ.get("API_CASSETTE_MODE", "replay"))
+        return cls._active
+
+    def __enter__(self) -> "HTTPCassette":
+        with HTTPCassette._lock:
+            HTTPCassette._active = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        with HTTPCassette._lock:
+            if HTTPCassette._active is self:
+                HTTPCassette._active = None
+        if self.mode == "record":
+            self.save()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    # --- matching ---
+    def _redact(self, key: str, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: self._redact(k, v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._redact(key, v) for v in value]
+        if not (key and self.SECRET_KEYS.search(key)) or value is None:
+            return value
+        if isinstance(value, str) and self.JWT_PATTERN.match(value):
+            header, payload, _ = value.split(".")
+            return f"{header}.{payload}.REDACTED"
+        return "<redacted>"
+
+    @staticmethod
+    def _body_bytes(kwargs: Dict[str, Any]) -> bytes:
+        if kwargs.get("json") is not None:
+            return json.dumps(kwargs["json"], sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        data = kwargs.get("data")
+        if data is None:
+            return b""
+        if isinstance(data, bytes):
+            raw = data
+        elif isinstance(data, str):
+            raw = data.encode("utf-8")
+        else:
+            return json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+        try:
+            return json.dumps(json.loads(raw), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            return raw
+
+    def key_for(self, method: str, url: str, kwargs: Dict[str, Any]) -> Tuple:
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        params = kwargs.get("params") or {}
+        for name, value in (params.items() if isinstance(params, dict) else params):
+            for v in (value if isinstance(value, (list, tuple)) else [value]):
+                query.append((str(name), "" if v is None else str(v)))
+        query = sorted((name, str(self._redact(name, value))) for name, value in query)
+        body_hash = "" if self.ignore_body else hashlib.sha256(self._body_bytes(kwargs)).hexdigest()
+        return (method.upper(), parts.netloc.lower(), parts.path or "/", tuple(tuple(q) for q in query), body_hash)
+
+    # --- record / replay ---
+    def record(self, method: str, url: str, response: Any, **kwargs) -> None:
+        if self.mode != "record":
+            return
+        content_type = response.headers.get("Content-Type", "") if getattr(response, "headers", None) else ""
+        body: Any = response.text if getattr(response, "content", None) else ""
+        if "json" in content_type and body:
+            try:
+                body = self._redact("", json.loads(body))
+            except ValueError:
+                pass
+        entry = {
+            "status": response.status_code,
+            "headers": {h: response.headers[h] for h in self.KEPT_RESPONSE_HEADERS if h in response.headers},
+            "body": body,
+        }
+        with self._lock:
+            self.interactions.setdefault(self.key_for(method, url, kwargs), []).append(entry)
+
+    def replay(self, method: str, url: str, **kwargs) -> requests.Response:
+        key = self.key_for(method, url, kwargs)
+        with self._lock:
+            entries = self.interactions.get(key)
+            if not entries:
+                raise CassetteMissError(f"No recorded interaction for {method.upper()} {url} in {self.path}")
+            position = self._replay_positions.get(key, 0)
+            self._replay_positions[key] = position + 1
+            entry = entries[min(position, len(entries) - 1)]
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        body = entry["body"]
+        text = body if isinstance(body, str) else json.dumps(body)
+        response._content = text.encode("utf-8")
+        # Behave like a fully read response, so streaming consumers (iter_content, iter_lines, close) work too.
+        response._content_consumed = True
+        response.raw = io.BytesIO(response._content)
+        response.encoding = "utf-8"
+        response.url = url
+        response.reason = "REPLAYED"
+        return response
+
+    # --- persistence ---
+    def load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        interactions = {}
+        for item in document.get("interactions", []):
+            key = (item["method"], item["host"], item["path"], tuple(tuple(q) for q in item["query"]), item["body_sha256"])
+            interactions[key] = item["responses"]
+        self.interactions = interactions
+        self._replay_positions = {}
+
+    def save(self) -> None:
+        with self._lock:
+            items = [
+                {"method": k[0], "host": k[1], "path": k[2], "query": [list(q) for q in k[3]],
+                 "body_sha256": k[4], "responses": v}
+                for k, v in sorted(self.interactions.items(), key=lambda kv: kv[0][:3])
+            ]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": items}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
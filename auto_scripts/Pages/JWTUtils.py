@@ -5,30 +5,35 @@ Strictly validates structure, claims, and signature using Python best practices.
 
 Requires: PyJWT (install via pip if needed)
 """
-import jwt
 import datetime
 from typing import Any, Dict, Optional
 
+from auto_scripts.Pages.JWTVerifier import TokenVerifier
+
 class JWTUtils:
+    USER_ID_CLAIMS = ("userId", "user_id", "uid", "sub")
+
     @staticmethod
-    def decode_jwt(token: str, secret: Optional[str] = None, algorithms=None, verify_signature: bool = True) -> Dict[str, Any]:
+    def decode_jwt(token: str, secret: Optional[str] = None, algorithms=None, verify_signature: bool = True,
+                   public_key=None) -> Dict[str, Any]:
         """
-        Decodes a JWT token. If secret is provided and verify_signature is True, validates the signature.
-        Returns the decoded payload (claims) as a dictionary.
+        Decodes a JWT token. If secret (HS*) or public_key (RS*/ES*) is provided and verify_signature is True,
+        validates the signature. Returns the decoded payload (claims) as a dictionary.
+        Verified payloads are cached until 'exp' by the shared TokenVerifier.
         """
         if algorithms is None:
             algorithms = ["HS256", "RS256"]
-        options = {"verify_signature": verify_signature}
-        try:
-            if verify_signature and secret:
-                payload = jwt.decode(token, secret, algorithms=algorithms)
-            else:
-                payload = jwt.decode(token, options={"verify_signature": False}, algorithms=algorithms)
-            return payload
-        except jwt.ExpiredSignatureError:
-            raise AssertionError("JWT token signature has expired.")
-        except jwt.InvalidTokenError as e:
-            raise AssertionError(f"Invalid JWT token: {e}")
+        return TokenVerifier.shared().verify(token, secret=secret, public_key=public_key, algorithms=algorithms,
+                                             verify_signature=verify_signature)
+
+    @staticmethod
+    def decode_user_id(token: str, secret: Optional[str] = None, public_key=None) -> Optional[Any]:
+        """
+        Returns the user id claim (userId, user_id, uid, then sub) of a JWT token, or None.
+        """
+        payload = JWTUtils.decode_jwt(token, secret, public_key=public_key,
+                                      verify_signature=bool(secret or public_key))
+        return next((payload[claim] for claim in JWTUtils.USER_ID_CLAIMS if payload.get(claim)), None)
 
     @staticmethod
     def validate_claims(payload: Dict[str, Any], expected_sub: str, leeway_sec: int = 60*5, exp_hours: int = 24):
@@ -60,12 +65,15 @@ class JWTUtils:
 # Executive Summary:
 # JWTUtils.py provides strict JWT decoding and validation for Selenium/Python automation, supporting signature and claims checks as required by TC_SCRUM96_004.
 # Analysis:
-# All claims (sub, exp, iat) validated. Signature checked if secret provided. Robust error handling.
+# All claims (sub, exp, iat) validated. Signature checked if secret (HS*) or public_key (RS*/ES*) provided.
+# Decoding goes through TokenVerifier (JWTVerifier.py): verified payloads are cached by token digest until 'exp' and
+# parsed keys / issuer key sets (JWKS) are cached, so repeated decodes of the same token are cheap.
 # Implementation Guide:
 # Use JWTUtils.validate_jwt(token, expected_sub, secret) for end-to-end validation.
+# Use JWTUtils.decode_user_id(token) to read the user id claim; TokenVerifier.shared().verify_batch() for load tests.
 # Quality Assurance:
 # All errors raise AssertionError with clear messages for debugging. Compatible with PyJWT and Python 3.6+.
 # Troubleshooting:
 # If validation fails, check token structure, claims, and backend signing key. Install PyJWT if missing.
 # Future Considerations:
-# Extend for additional claims, RS256 public key validation, and audience/aud claim checks as needed.
+# Extend for additional claims and audience/aud claim checks as needed (TokenVerifier.verify accepts audience/issuer).
@@ -0,0 +1,415 @@
+"""
+JWTVerifier.py
+
+Executive Summary:
+------------------
+Caching JWT verifier. A token is verified once; the verified payload is cached by token digest until the token's
+``exp``, so orchestrators and load tests that decode the same token again and again pay a dictionary lookup instead
+of a signature check. Signing keys are parsed once (PEM / secret / JWK) and key sets (JWKS) are cached per issuer
+with rotation-aware refresh, which removes the dominant CPU cost of repeated RS256/ES256 verification.
+
+Detailed Analysis:
+------------------
+- ``TokenVerifier.verify(token, ...)``: the cache key is sha256(token) plus the verification options (key identity,
+  audience, issuer, algorithms, signature on/off), so a payload verified against one key is never served to a caller
+  expecting another. Hits return a copy of the payload; failures are never cached.
+- Expiry: verified entries live until ``exp`` (+ ``leeway``); a hit past that raises the same AssertionError as a
+  fresh expired token. Tokens without ``exp`` are cached for ``NO_EXP_TTL`` seconds. Unverified decodes
+  (``verify_signature=False``) do not check ``exp``, exactly like PyJWT, and stay cached until evicted (LRU beyond
+  ``max_entries``).
+- Key sources, in order: ``public_key`` (PEM or key object), ``secret`` (HMAC), the JWKS of the token's issuer when
+  that issuer was registered with ``KeySetCache.register_issuer`` (or ``jwks_uri`` is passed); otherwise the token
+  is decoded without signature verification (the historical JWTUtils.decode_jwt behaviour).
+- ``KeySetCache``: prepared keys keyed by (algorithm family, digest of the key material); key sets per issuer are
+  fetched through APISessionPool, refreshed after ``ttl`` seconds and refreshed early when a token carries an unknown
+  ``kid`` (key rotation), at most once per ``min_refresh_interval`` so a flood of bad ``kid`` values cannot hammer
+  the issuer. If a refresh fails, the previous key set stays in use.
+- ``verify_batch(tokens, ...)`` verifies each distinct token once and returns TokenResult(token, payload, error) in
+  input order; one bad token does not fail the batch.
+- ``stats()`` reports hits, misses, expired hits, failures, evictions, key set fetches and cache sizes.
+
+Implementation Guide:
+---------------------
+1. Plain decode (cached): ``JWTUtils.decode_jwt(token, verify_signature=False)`` or
+   ``TokenVerifier.shared().verify(token, verify_signature=False)``.
+2. RS256 with a PEM key: ``TokenVerifier.shared().verify(token, public_key=pem, algorithms=["RS256"])``.
+3. JWKS: ``KeySetCache.shared().register_issuer("https://auth.example.com")`` once, then
+   ``TokenVerifier.shared().verify(token, issuer="https://auth.example.com")``.
+4. Load tests: ``results = TokenVerifier.shared().verify_batch(tokens, public_key=pem)``;
+   ``failed = [r for r in results if r.error]``.
+
+Quality Assurance Report:
+-------------------------
+- Raw tokens and secrets are never stored as cache keys, only their digests. Key objects are identified by a digest
+  of their serialized public key (never by ``id()``, which is reused after garbage collection); key objects that
+  cannot be serialized disable payload caching for that call.
+- Thread-safe; caches are guarded by locks and key set fetches are serialized per issuer.
+- All verification errors surface as AssertionError, like the rest of the page layer.
+
+Troubleshooting Guide:
+----------------------
+- "No signing key 'kid' for issuer": the issuer rotated keys faster than ``min_refresh_interval`` or the token was
+  signed by another environment; check the JWKS document.
+- Stale payload after changing the server secret: call ``TokenVerifier.shared().clear()``.
+
+Future Considerations:
+----------------------
+- OpenID discovery (``/.well-known/openid-configuration``) for issuers whose JWKS lives elsewhere.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import jwt
+from jwt.algorithms import get_default_algorithms
+
+from auto_scripts.Pages.APISessionPool import APISessionPool
+
+DEFAULT_ALGORITHMS = ("HS256", "RS256")
+
+
+def _digest(value: Any) -> Optional[str]:
+    """
+    sha256 of a token, secret or PEM; key objects are identified by their serialized public key (DER
+    SubjectPublicKeyInfo). Returns None for objects that cannot be serialized; those are never cached.
+    """
+    if isinstance(value, jwt.PyJWK):
+        value = value.key
+    if not isinstance(value, (str, bytes)):
+        try:
+            from cryptography.hazmat.primitives import serialization
+            public = value.public_key() if hasattr(value, "public_key") else value
+            value = public.public_bytes(serialization.Encoding.DER,
+                                        serialization.PublicFormat.SubjectPublicKeyInfo)
+        except (ImportError, AttributeError, TypeError, ValueError):
+            return None
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+class TokenResult(NamedTuple):
+    """
+    Outcome of one token in ``verify_batch``: the payload, or the AssertionError it failed with.
+    """
+    token: str
+    payload: Optional[Dict[str, Any]]
+    error: Optional[AssertionError]
+
+
+class _KeySet(NamedTuple):
+    keys: Dict[Optional[str], jwt.PyJWK]
+    fetched_at: float
+
+
+class KeySetCache:
+    """
+    Parsed signing keys and per-issuer JWKS key sets.
+    """
+    _shared: Optional["KeySetCache"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, ttl: float = 600.0, min_refresh_interval: float = 30.0, fetch_timeout: float = 10.0):
+        """
+        Args:
+            ttl (float): Seconds a fetched key set is used before it is refreshed.
+            min_refresh_interval (float): Minimum seconds between refreshes triggered by unknown ``kid`` values.
+            fetch_timeout (float): HTTP timeout for JWKS requests.
+        """
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.fetch_timeout = fetch_timeout
+        self._prepared: Dict[Tuple[str, str], Any] = {}
+        self._issuers: Dict[str, str] = {}
+        self._sets: Dict[str, _KeySet] = {}
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    @classmethod
+    def shared(cls) -> "KeySetCache":
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # --- static keys ---
+    def static_key(self, key: Any, algorithm: str) -> Any:
+        """
+        Returns ``key`` (PEM, secret or key object) prepared for ``algorithm``, parsing it only once.
+        """
+        implementation = get_default_algorithms().get(algorithm)
+        if implementation is None:
+            raise AssertionError(f"Unsupported JWT algorithm: {algorithm}")
+        if not isinstance(key, (str, bytes)):
+            return implementation.prepare_key(key)
+        cache_key = (type(implementation).__name__, _digest(key))
+        with self._lock:
+            prepared = self._prepared.get(cache_key)
+        if prepared is None:
+            try:
+                prepared = implementation.prepare_key(key)
+            except (jwt.InvalidKeyError, ValueError, TypeError) as e:
+                raise AssertionError(f"Invalid {algorithm} key: {e}")
+            with self._lock:
+                self._prepared[cache_key] = prepared
+        return prepared
+
+    # --- key sets ---
+    def register_issuer(self, issuer: str, jwks_uri: Optional[str] = None) -> None:
+        """
+        Enables JWKS verification for ``issuer`` (default URI: ``{issuer}/.well-known/jwks.json``).
+        """
+        with self._lock:
+            self._issuers[issuer] = jwks_uri or f"{issuer.rstrip('/')}/.well-known/jwks.json"
+
+    def jwks_uri(self, issuer: Optional[str]) -> Optional[str]:
+        with self._lock:
+            return self._issuers.get(issuer) if issuer else None
+
+    def _fetch(self, issuer: str, uri: str, stale: Optional[_KeySet]) -> _KeySet:
+        try:
+            response = APISessionPool.get_session(uri).get(uri, timeout=self.fetch_timeout)
+            assert response.status_code == 200, f"JWKS fetch from {uri} failed: {response.status_code}"
+            documents = response.json().get("keys", [])
+        except Exception as e:
+            if stale is None:
+                raise AssertionError(f"Could not fetch key set for issuer {issuer}: {e}")
+            # Keep verifying with the previous keys; retry after the refresh interval.
+            key_set = stale._replace(fetched_at=time.monotonic())
+        else:
+            keys: Dict[Optional[str], jwt.PyJWK] = {}
+            for document in documents:
+                if document.get("use", "sig") != "sig":
+                    continue
+                try:
+                    parsed = jwt.PyJWK(document)
+                except (jwt.PyJWKError, jwt.InvalidKeyError):
+                    continue
+                keys[parsed.key_id] = parsed
+            key_set = _KeySet(keys, time.monotonic())
+            with self._lock:
+                self.fetches += 1
+        with self._lock:
+            self._sets[issuer] = key_set
+        return key_set
+
+    def signing_key(self, issuer: str, kid: Optional[str], jwks_uri: Optional[str] = None) -> Any:
+        """
+        Returns the prepared key ``kid`` of ``issuer``'s key set, refreshing the set when it is stale or when ``kid``
+        is unknown (rotation).
+        """
+        uri = jwks_uri or self.jwks_uri(issuer)
+        assert uri, f"No key set registered for issuer {issuer}"
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(issuer, threading.Lock())
+        with fetch_lock:
+            key_set = self._sets.get(issuer)
+            if key_set is None or time.monotonic() - key_set.fetched_at > self.ttl:
+                key_set = self._fetch(issuer, uri, key_set)
+            key = self._lookup(key_set, kid)
+            if key is None and time.monotonic() - key_set.fetched_at >= self.min_refresh_interval:
+                key_set = self._fetch(issuer, uri, key_set)
+                key = self._lookup(key_set, kid)
+        if key is None:
+            raise AssertionError(f"No signing key {kid!r} for issuer {issuer}")
+        return key.key
+
+    @staticmethod
+    def _lookup(key_set: _KeySet, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        if kid is None and len(key_set.keys) == 1:
+            return next(iter(key_set.keys.values()))
+        return key_set.keys.get(kid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._prepared.clear()
+            self._sets.clear()
+            self.fetches = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"prepared_keys": len(self._prepared), "key_sets": len(self._sets), "key_set_fetches": self.fetches}
+
+
+class TokenVerifier:
+    """
+    Verifies JWTs once and serves repeated verifications from a digest-keyed cache until ``exp``.
+    """
+    NO_EXP_TTL = 300.0
+    _shared: Optional["TokenVerifier"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries: int = 10000, keys: Optional[KeySetCache] = None):
+        """
+        Args:
+            max_entries (int): Maximum cached payloads (LRU eviction).
+            keys (KeySetCache, optional): Key cache (default KeySetCache.shared()).
+        """
+        self.max_entries = max_entries
+        self.keys = keys or KeySetCache.shared()
+        self._entries: "OrderedDict[Tuple, Tuple[float, bool, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = self._empty_counters()
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {"hits": 0, "misses": 0, "expired": 0, "failures": 0, "evictions": 0}
+
+    @classmethod
+    def shared(cls) -> "TokenVerifier":
+        """
+        Returns the process-wide verifier used by JWTUtils.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # --- cache ---
+    def _cached(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            valid_until, has_exp, payload = entry
+            if time.time() >= valid_until:
+                del self._entries[key]
+                if has_exp:
+                    self._counters["expired"] += 1
+                    raise AssertionError("JWT token signature has expired.")
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return dict(payload)
+
+    def _store(self, key: Tuple, payload: Dict[str, Any], verified: bool, leeway: float) -> None:
+        exp = payload.get("exp")
+        has_exp = verified and isinstance(exp, (int, float))
+        if not verified:
+            valid_until = float("inf")
+        elif has_exp:
+            valid_until = exp + leeway
+        else:
+            valid_until = time.time() + self.NO_EXP_TTL
+        with self._lock:
+            self._entries[key] = (valid_until, has_exp, dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        """
+        Drops all cached payloads and resets the counters (parsed keys are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._counters = self._empty_counters()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["expired"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats.update(self.keys.stats())
+        return stats
+
+    # --- verification ---
+    def _key_for(self, secret: Any, public_key: Any, issuer: Optional[str],
+                 jwks_uri: Optional[str]) -> Tuple[str, Any]:
+        """
+        Returns (key identity for the cache, key material or None for a key set / unverified decode). The identity
+        is None for key objects that cannot be serialized; their payloads are not cached.
+        """
+        material = public_key if public_key is not None else secret
+        if material is not None:
+            return _digest(material), material
+        if jwks_uri or self.keys.jwks_uri(issuer):
+            # The key set is resolved after the cache lookup.
+            return "jwks:" + (issuer or jwks_uri), None
+        return "none", None
+
+    def verify(self, token: str, secret: Optional[Union[str, bytes]] = None, public_key: Any = None,
+               algorithms: Optional[Sequence[str]] = None, audience: Optional[Union[str, Sequence[str]]] = None,
+               issuer: Optional[str] = None, verify_signature: bool = True, leeway: float = 0,
+               jwks_uri: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Verifies ``token`` (or serves the cached payload of an earlier verification).
+        Args:
+            token (str): Encoded JWT.
+            secret (str, optional): HMAC secret.
+            public_key (optional): PEM string/bytes or key object for RS*/ES*/PS*/EdDSA.
+            algorithms (list[str], optional): Accepted algorithms (default HS256, RS256).
+            audience (str or list, optional): Expected ``aud``.
+            issuer (str, optional): Expected ``iss``; also selects the registered key set.
+            verify_signature (bool): False decodes without checking signature or expiry.
+            leeway (float): Clock skew tolerance in seconds for ``exp``/``nbf``/``iat``.
+            jwks_uri (str, optional): Key set URL to use for this token (overrides the issuer registration).
+        Returns:
+            dict: Token payload.
+        Raises:
+            AssertionError: Expired, malformed or unverifiable token.
+        """
+        algorithms = tuple(algorithms or DEFAULT_ALGORITHMS)
+        if verify_signature:
+            identity, material = self._key_for(secret, public_key, issuer, jwks_uri)
+        else:
+            identity, material = "none", None
+        audiences = (audience,) if isinstance(audience, str) else tuple(audience or ())
+        key = (_digest(token), identity, audiences, issuer, algorithms)
+        payload = self._cached(key) if identity is not None else None
+        if payload is not None:
+            return payload
+        try:
+            payload = self._decode(token, identity, material, algorithms, audience, issuer, leeway, jwks_uri)
+        except AssertionError:
+            with self._lock:
+                self._counters["failures"] += 1
+            raise
+        if identity is not None:
+            self._store(key, payload, identity != "none", leeway)
+        return payload
+
+    def _decode(self, token: str, identity: str, material: Any, algorithms: Tuple[str, ...],
+                audience: Any, issuer: Optional[str], leeway: float, jwks_uri: Optional[str]) -> Dict[str, Any]:
+        try:
+            if identity == "none":
+                return jwt.decode(token, options={"verify_signature": False}, algorithms=list(algorithms))
+            header = jwt.get_unverified_header(token)
+            algorithm = header.get("alg")
+            if algorithm not in algorithms:
+                raise AssertionError(f"Invalid JWT token: algorithm {algorithm!r} not in {list(algorithms)}")
+            if material is not None:
+                prepared = self.keys.static_key(material, algorithm)
+            else:
+                token_issuer = (issuer or jwt.decode(token, options={"verify_signature": False}).get("iss")
+                                or jwks_uri)
+                prepared = self.keys.signing_key(token_issuer, header.get("kid"), jwks_uri)
+            return jwt.decode(token, prepared, algorithms=[algorithm], audience=audience, issuer=issuer,
+                              leeway=leeway)
+        except jwt.ExpiredSignatureError:
+            raise AssertionError("JWT token signature has expired.")
+        except jwt.InvalidTokenError as e:
+            raise AssertionError(f"Invalid JWT token: {e}")
+
+    def verify_batch(self, tokens: Iterable[str], **options) -> List[TokenResult]:
+        """
+        Verifies many tokens (same options as ``verify``); each distinct token is verified once.
+        Returns:
+            list[TokenResult]: One result per input token, in input order.
+        """
+        tokens = list(tokens)
+        outcomes: Dict[str, Tuple[Optional[Dict[str, Any]], Optional[AssertionError]]] = {}
+        for token in dict.fromkeys(tokens):
+            try:
+                outcomes[token] = (self.verify(token, **options), None)
+            except AssertionError as e:
+                outcomes[token] = (None, e)
+        return [TokenResult(token, *outcomes[token]) for token in tokens]
@@ -0,0 +1,329 @@
+"""
+LoadTestRunner.py
+
+Executive Summary:
+------------------
+Load-generation mode that replays the user journeys already encoded in the API PageClasses (CartAPIPage sign in ->
+add item -> get cart, ProductSearchAPIPage searches, UserRegistrationAPIPage registration) as virtual users. The same
+code that verifies the shop's backend is used to capacity-test it, against the local stand-in or a staging host.
+
+Detailed Analysis:
+------------------
+- Closed model: ``concurrency`` virtual users loop over the journey until ``duration`` or ``iterations`` is reached.
+- Open model: journeys start at ``arrival_rate`` per second (at most ``concurrency`` in flight); arrivals that find
+  no free slot are counted as ``dropped_arrivals`` instead of silently lowering the rate.
+- Workers are asyncio tasks on the shared AsyncAPIPage loop; each journey runs on a worker thread with pooled sessions.
+- Per-endpoint latency comes from an APISessionPool listener (network calls only, cache hits excluded) and is kept in
+  HDR-style log-linear histograms (Metrics.LatencyHistogram, ~1% relative error); journeys get their own histograms.
+- The JSON report holds throughput, error rates, status-code counts and latency percentiles per endpoint and journey.
+
+Implementation Guide:
+---------------------
+1. python -m auto_scripts.Pages.LoadTestRunner --journey search --users 20 --duration 60 \
+       --base-url http://localhost:8080 --report load_report.json
+2. Cart journey needs ``--params '{"email": "...", "password": "...", "product_id": "P1", "quantity": 1}'``.
+3. Programmatic use: ``LoadTestRunner("cart", concurrency=50, journey_params={...}).run()`` returns the report dict.
+
+Quality Assurance Report:
+-------------------------
+- Journey failures (assertions, exceptions) are counted, never raised; the first messages are kept in the report.
+- Endpoint errors are transport exceptions and HTTP 5xx; expected 4xx (e.g. search without query) are not errors.
+
+Troubleshooting Guide:
+----------------------
+- Throughput plateaus early: raise ``--users`` and check ``dropped_arrivals``; the pool is resized to ``--users``
+  only for sessions created after the run starts.
+- Circuit breaker opens under load: that is the backend failing; disable with APISessionPool.configure(resilient=False).
+
+Future Considerations:
+----------------------
+- Ramp-up profiles and coordinated-omission correction for the open model.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.AsyncAPIPage import AsyncAPIPage
+from auto_scripts.Pages.Metrics import LatencyHistogram
+
+
+class LoadMetrics:
+    """
+    Thread-safe per-key latency, status and error accounting.
+    """
+    ERROR_SAMPLE_SIZE = 20
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._statuses: Dict[str, Dict[str, int]] = {}
+        self.error_samples: List[str] = []
+        self._lock = threading.Lock()
+
+    def record(self, key: str, elapsed: float, error: Optional[str] = None, status_code: Optional[int] = None) -> None:
+        with self._lock:
+            histogram = self._histograms.setdefault(key, LatencyHistogram())
+            histogram.record(elapsed * 1_000_000)
+            if status_code is not None:
+                statuses = self._statuses.setdefault(key, {})
+                statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+            if error is not None:
+                self._errors[key] = self._errors.get(key, 0) + 1
+                if len(self.error_samples) < self.ERROR_SAMPLE_SIZE:
+                    self.error_samples.append(f"{key}: {error}")
+
+    def report(self, elapsed_seconds: float) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            report = {}
+            for key in sorted(self._histograms):
+                entry = self._histograms[key].summary()
+                errors = self._errors.get(key, 0)
+                entry["errors"] = errors
+                entry["error_rate"] = round(errors / entry["count"], 4) if entry["count"] else 0.0
+                entry["throughput_rps"] = round(entry["count"] / elapsed_seconds, 3) if elapsed_seconds else 0.0
+                if key in self._statuses:
+                    entry["status_codes"] = dict(sorted(self._statuses[key].items()))
+                report[key] = entry
+            return report
+
+
+class VirtualUser:
+    """
+    Per-virtual-user state: index, iteration counter and lazily created page objects.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.iteration = 0
+        self.pages: Dict[str, Any] = {}
+
+    def page(self, name: str, factory: Callable[[], Any]) -> Any:
+        if name not in self.pages:
+            self.pages[name] = factory()
+        return self.pages[name]
+
+
+class LoadTestRunner:
+    """
+    Runs API PageClass journeys as virtual users and reports per-endpoint latency, throughput and error rates.
+    """
+    DEFAULT_BASE_URL = "https://example-ecommerce.com"
+    ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{8,})$")
+
+    def __init__(self, journey: str, base_url: Optional[str] = None, concurrency: int = 10,
+                 arrival_rate: Optional[float] = None, duration: float = 60.0, iterations: Optional[int] = None,
+                 journey_params: Optional[Dict[str, Any]] = None, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            journey (str): One of JOURNEYS ("cart", "search", "registration").
+            base_url (str, optional): Target host; defaults to the PageClasses' BASE_URL.
+            concurrency (int): Virtual users (closed model) or max in-flight journeys (open model).
+            arrival_rate (float, optional): Journeys started per second; enables the open model.
+            duration (float): Seconds to generate load.
+            iterations (int, optional): Stop after this many journeys per virtual user (closed model).
+            journey_params (dict, optional): Journey inputs, e.g. cart credentials and product.
+        """
+        if journey not in self.JOURNEYS:
+            raise ValueError(f"Unknown journey '{journey}', expected one of {sorted(self.JOURNEYS)}")
+        self.journey = journey
+        self.base_url = (base_url or self.DEFAULT_BASE_URL).rstrip("/")
+        self.concurrency = concurrency
+        self.arrival_rate = arrival_rate
+        self.duration = duration
+        self.iterations = iterations
+        self.journey_params = journey_params or {}
+        self.logger = logger or logging.getLogger(__name__)
+        self.endpoint_metrics = LoadMetrics()
+        self.journey_metrics = LoadMetrics()
+        self.dropped_arrivals = 0
+
+    # --- page wiring ---
+    def _rebase(self, page: Any) -> Any:
+        """
+        Points a PageClass instance at ``base_url`` by rewriting its URL constants and pooled session.
+        """
+        if self.base_url == self.DEFAULT_BASE_URL:
+            return page
+        for name in dir(type(page)):
+            value = getattr(page, name, None)
+            if name.isupper() and isinstance(value, str) and value.startswith(self.DEFAULT_BASE_URL):
+                setattr(page, name, self.base_url + value[len(self.DEFAULT_BASE_URL):])
+        if hasattr(page, "base_url"):
+            page.base_url = self.base_url
+        if hasattr(page, "session"):
+            page.session = APISessionPool.get_session(self.base_url)
+        return page
+
+    def endpoint_key(self, method: str, url: str) -> str:
+        segments = [":id" if self.ID_SEGMENT.match(seg) else seg for seg in urlsplit(url).path.split("/")]
+        return f"{method.upper()} {'/'.join(segments) or '/'}"
+
+    def _on_request(self, method, url, status_code, elapsed, error) -> None:
+        failure = repr(error) if error is not None else (f"HTTP {status_code}" if status_code >= 500 else None)
+        self.endpoint_metrics.record(self.endpoint_key(method, url), elapsed, failure, status_code)
+
+    # --- journeys ---
+    def _journey_cart(self, user: VirtualUser) -> None:
+        from auto_scripts.Pages.CartAPIPage import CartAPIPage
+        params = self.journey_params
+        page = user.page("cart", lambda: self._rebase(CartAPIPage(db_config=params.get("db_config", {}))))
+        page.sign_in_user(params["email"], params["password"])
+        page.add_product_to_cart(params["product_id"], int(params.get("quantity", 1)))
+        page.get_cart_details()
+
+    def _journey_search(self, user: VirtualUser) -> None:
+        from auto_scripts.Pages.ProductSearchAPIPage import ProductSearchAPIPage
+        page = user.page("search", lambda: self._rebase(ProductSearchAPIPage(db_config={})))
+        empty_result = page.validate_api_response(page.send_search_with_empty_query(), expect_all_products=True)
+        assert empty_result["pass"], empty_result["message"]
+        no_query_result = page.validate_no_query_response(page.send_search_without_query())
+        assert no_query_result["pass"], no_query_result["message"]
+
+    def _journey_registration(self, user: VirtualUser) -> None:
+        from PageClasses.UserRegistrationAPIPage import UserRegistrationAPIPage
+        params = self.journey_params
+        page = user.page("registration", lambda: UserRegistrationAPIPage(self.base_url, params.get("db_config", {}), None))
+        suffix = f"{user.index}_{user.iteration}_{uuid.uuid4().hex[:8]}"
+        page.register_user_api({
+            "username": f"loaduser_{suffix}",
+            "email": f"loaduser_{suffix}@{params.get('email_domain', 'example.com')}",
+            "password": params.get("password", "LoadTest123!"),
+            "firstName": params.get("first_name", "Load"),
+            "lastName": params.get("last_name", "User"),
+        })
+
+    JOURNEYS = {
+        "cart": _journey_cart,
+        "search": _journey_search,
+        "registration": _journey_registration,
+    }
+
+    def _run_journey(self, user: VirtualUser) -> None:
+        started = time.perf_counter()
+        error = None
+        try:
+            self.JOURNEYS[self.journey](self, user)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.journey_metrics.record(self.journey, time.perf_counter() - started, error)
+        user.iteration += 1
+
+    # --- workers ---
+    async def _closed_model(self, loop, executor, deadline: float) -> None:
+        async def worker(index: int):
+            user = VirtualUser(index)
+            while time.monotonic() < deadline and (self.iterations is None or user.iteration < self.iterations):
+                await loop.run_in_executor(executor, self._run_journey, user)
+        await asyncio.gather(*(worker(i) for i in range(self.concurrency)))
+
+    async def _open_model(self, loop, executor, deadline: float) -> None:
+        slots = asyncio.Semaphore(self.concurrency)
+        idle_users = [VirtualUser(i) for i in range(self.concurrency)]
+        in_flight = set()
+
+        async def arrival(user: VirtualUser):
+            try:
+                await loop.run_in_executor(executor, self._run_journey, user)
+            finally:
+                idle_users.append(user)
+                slots.release()
+
+        interval = 1.0 / self.arrival_rate
+        next_arrival = time.monotonic()
+        while next_arrival < deadline:
+            await asyncio.sleep(max(next_arrival - time.monotonic(), 0))
+            next_arrival += interval
+            if slots.locked():
+                self.dropped_arrivals += 1
+                continue
+            await slots.acquire()
+            task = asyncio.ensure_future(arrival(idle_users.pop()))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def _run_async(self) -> float:
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + self.duration
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="load-vu") as executor:
+            if self.arrival_rate:
+                await self._open_model(loop, executor, deadline)
+            else:
+                await self._closed_model(loop, executor, deadline)
+        return time.perf_counter() - started
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Generates load and returns the report dict.
+        """
+        started_at = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+        if APISessionPool.settings()["pool_maxsize"] < self.concurrency:
+            APISessionPool.configure(pool_maxsize=self.concurrency)
+        APISessionPool.add_listener(self._on_request)
+        try:
+            elapsed = AsyncAPIPage.run(self._run_async())
+        finally:
+            APISessionPool.remove_listener(self._on_request)
+        journeys = self.journey_metrics.report(elapsed)
+        summary = journeys.get(self.journey, {"count": 0, "errors": 0})
+        report = {
+            "journey": self.journey,
+            "base_url": self.base_url,
+            "mode": "open" if self.arrival_rate else "closed",
+            "concurrency": self.concurrency,
+            "arrival_rate": self.arrival_rate,
+            "started_at": started_at,
+            "elapsed_s": round(elapsed, 3),
+            "journeys_completed": summary["count"],
+            "journeys_failed": summary["errors"],
+            "dropped_arrivals": self.dropped_arrivals,
+            "journeys": journeys,
+            "endpoints": self.endpoint_metrics.report(elapsed),
+            "error_samples": self.journey_metrics.error_samples + self.endpoint_metrics.error_samples,
+        }
+        self.logger.info(f"Load run finished: {summary['count']} journeys, {summary['errors']} failed in {elapsed:.1f}s")
+        return report
+
+    @staticmethod
+    def write_report(report: Dict[str, Any], path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run API PageClass journeys as load.")
+    parser.add_argument("--journey", required=True, choices=sorted(LoadTestRunner.JOURNEYS))
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--users", type=int, default=10, help="Virtual users / max in-flight journeys")
+    parser.add_argument("--rate", type=float, default=None, help="Arrival rate (journeys/s); enables open model")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--params", default="{}", help="Journey parameters as JSON")
+    parser.add_argument("--report", default="load_report.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    runner = LoadTestRunner(args.journey, base_url=args.base_url, concurrency=args.users, arrival_rate=args.rate,
+                            duration=args.duration, iterations=args.iterations, journey_params=json.loads(args.params))
+    report = runner.run()
+    LoadTestRunner.write_report(report, args.report)
+    print(f"Report written to {args.report}: {report['journeys_completed']} journeys, "
+          f"{report['journeys_failed']} failed, {report['dropped_arrivals']} dropped arrivals")
+    return 0 if report["journeys_failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
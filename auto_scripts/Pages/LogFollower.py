@@ -0,0 +1,215 @@
+"""
+LogFollower.py
+
+Executive Summary:
+------------------
+Blocking "wait for log line" API. A follower thread per log file is woken by inotify file-change notifications
+(polling fallback where inotify is unavailable) and hands every new line to the waiting assertions; a wait returns
+as soon as a matching line is written, or raises ConsistencyTimeout. Log-based assertions no longer fail when the
+backend logs "SQL injection detected" or "registration success" a moment after the API responds, and they do not
+sleep longer than needed.
+
+Detailed Analysis:
+------------------
+- ``LogFollower.for_path(path).wait_for(predicate, timeout, since=mark)``: lines after ``since`` (default: now) that
+  are already in the log are checked immediately in the caller; otherwise the caller blocks on an Event.
+- One follower thread per file, shared by all concurrent waiters (threads of one process); it starts with the first
+  waiter and exits when the last one leaves. Reads go through the shared LogReader, so each wake-up reads only the
+  appended bytes and rotation/truncation are handled there.
+- Notifications: inotify (via ctypes, Linux) on the log's directory, which also reports rotation and re-creation.
+  A wake-up every ``poll_interval`` seconds is kept as a safety net for filesystems without events (NFS, some
+  container volumes); without inotify the follower polls every ``fallback_interval`` seconds.
+- Wait durations and timeouts are recorded in AwaitCondition.metrics() under the wait's name.
+
+Implementation Guide:
+---------------------
+1. ``mark = LogReader.for_path(path).mark()`` at test start (PageClasses do this in ``__init__``).
+2. ``line = LogFollower.for_path(path).wait_for(lambda l: "SQL injection" in l, timeout=10, since=mark)``
+
+Quality Assurance Report:
+-------------------------
+- Predicates run on the follower thread; exceptions they raise are re-raised in the waiting caller.
+- A waiter never misses lines written between its catch-up check and its registration: each waiter keeps its own
+  LogReader mark.
+
+Troubleshooting Guide:
+----------------------
+- Waits always end near ``poll_interval`` boundaries: inotify is unavailable or the filesystem sends no events.
+
+Future Considerations:
+----------------------
+- kqueue / ReadDirectoryChangesW notifications on macOS and Windows agents.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from auto_scripts.Pages.EventualConsistency import AwaitCondition, ConsistencyTimeout
+from auto_scripts.Pages.LogReader import LogMark, LogReader
+
+# inotify event mask: IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_INOTIFY_MASK = 0x002 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+_IN_NONBLOCK_CLOEXEC = os.O_NONBLOCK | 0o2000000
+
+
+class _Inotify:
+    """
+    Minimal inotify watch on one directory via ctypes.
+    """
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _INOTIFY_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Waiter:
+    def __init__(self, predicate: Callable[[str], bool], mark: LogMark):
+        self.predicate = predicate
+        self.mark = mark
+        self.event = threading.Event()
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self.checks = 0
+
+
+class LogFollower:
+    """
+    Shared follower of one log file serving blocking waits for matching lines.
+    """
+    POLL_INTERVAL = 1.0
+    FALLBACK_INTERVAL = 0.1
+
+    _followers: Dict[str, "LogFollower"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, path: str, poll_interval: Optional[float] = None, fallback_interval: Optional[float] = None):
+        """
+        Args:
+            path (str): Log file path.
+            poll_interval (float, optional): Safety-net wake-up interval when inotify is active.
+            fallback_interval (float, optional): Polling interval without inotify.
+        """
+        self.path = path
+        self.reader = LogReader.for_path(path)
+        self.poll_interval = poll_interval or self.POLL_INTERVAL
+        self.fallback_interval = fallback_interval or self.FALLBACK_INTERVAL
+        self._waiters: List[_Waiter] = []
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.notifications = "pending"
+
+    @classmethod
+    def for_path(cls, path: str) -> "LogFollower":
+        """
+        Returns the shared follower for ``path``, creating it on first use.
+        """
+        key = os.path.abspath(path)
+        with cls._registry_lock:
+            follower = cls._followers.get(key)
+            if follower is None:
+                follower = cls(path)
+                cls._followers[key] = follower
+            return follower
+
+    # --- waiting ---
+    def _check(self, waiter: _Waiter) -> bool:
+        waiter.checks += 1
+        try:
+            lines, waiter.mark = self.reader.read_since(waiter.mark)
+            waiter.result = next((line for line in lines if waiter.predicate(line)), None)
+        except Exception as e:
+            waiter.error = e
+        if waiter.result is not None or waiter.error is not None:
+            waiter.event.set()
+            return True
+        return False
+
+    def wait_for(self, predicate: Callable[[str], bool], timeout: float = 30.0, since: Optional[LogMark] = None,
+                 name: Optional[str] = None) -> str:
+        """
+        Blocks until a line after ``since`` matches ``predicate``.
+        Args:
+            predicate (callable): Line matcher.
+            timeout (float): Deadline in seconds.
+            since (LogMark, optional): Consider lines after this mark (default: lines written from now on).
+            name (str, optional): Condition name for errors and metrics.
+        Returns:
+            str: The first matching line.
+        Raises:
+            ConsistencyTimeout: If no matching line appears before the deadline.
+        """
+        name = name or f"log line in {os.path.basename(self.path)}"
+        started = time.monotonic()
+        waiter = _Waiter(predicate, since or self.reader.mark())
+        with self._lock:
+            if not self._check(waiter):
+                self._waiters.append(waiter)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._follow, name=f"LogFollower:{self.path}",
+                                                    daemon=True)
+                    self._thread.start()
+        try:
+            waiter.event.wait(timeout)
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        if waiter.error is not None:
+            raise waiter.error
+        if waiter.result is None:
+            AwaitCondition.record(name, None)
+            raise ConsistencyTimeout(name, timeout, waiter.checks)
+        AwaitCondition.record(name, time.monotonic() - started)
+        return waiter.result
+
+    # --- follower thread ---
+    def _notifier(self) -> Optional[_Inotify]:
+        try:
+            notifier = _Inotify(os.path.dirname(os.path.abspath(self.path)))
+            self.notifications = "inotify"
+            return notifier
+        except (OSError, AttributeError):
+            self.notifications = "polling"
+            return None
+
+    def _follow(self) -> None:
+        notifier = self._notifier()
+        try:
+            while True:
+                if notifier is not None:
+                    notifier.wait(self.poll_interval)
+                else:
+                    time.sleep(self.fallback_interval)
+                with self._lock:
+                    self._waiters = [waiter for waiter in self._waiters if not self._check(waiter)]
+                    if not self._waiters:
+                        self._thread = None
+                        return
+        finally:
+            if notifier is not None:
+                notifier.close()
@@ -0,0 +1,232 @@
+"""
+LogPatternScanner.py
+
+Executive Summary:
+------------------
+Memory-mapped multi-pattern log scanner. Security tests send many injection/XSS payloads; instead of one full log
+scan per payload, every pending payload is compiled into one Aho-Corasick automaton and the log is scanned once.
+Hits come back with byte offsets, the full log line and its parsed timestamp, so N payloads are verified in a single
+pass over the (mapped) file.
+
+Detailed Analysis:
+------------------
+- ``AhoCorasick``: trie + failure links flattened into a DFA (one dict per state, missing bytes fall back to the root),
+  so the scan loop is a single dict lookup per byte. In the root state a compiled byte class of pattern start bytes
+  skips ahead at C speed. ``case_insensitive`` folds ASCII letters in patterns and input.
+- ``LogPatternScanner.scan()`` mmaps the file read-only and feeds the automaton from ``start`` (e.g. a LogReader
+  mark taken at test start) to ``end``; nothing is copied into Python strings except the lines that contain hits.
+- ``first_only`` (default) retires a pattern after its first accepted hit and stops the scan as soon as every pattern
+  is found. ``accept`` filters hits by their line (e.g. "the line must say SQL injection").
+- Timestamps: ``[YYYY-MM-DD HH:MM:SS]`` or ISO ``YYYY-MM-DDTHH:MM:SS`` at any position in the line, parsed to datetime.
+
+Implementation Guide:
+---------------------
+1. ``scanner = LogPatternScanner(log_path)``
+2. ``hits = scanner.scan(payloads, since=mark, accept=lambda hit: "SQL injection" in hit.line)``
+3. ``missing = [p for p in payloads if not hits[p]]`` -> assert not missing.
+
+Quality Assurance Report:
+-------------------------
+- Overlapping patterns (e.g. "admin'--" and "'--") are all reported.
+- Missing or empty files yield no hits instead of mmap errors.
+
+Troubleshooting Guide:
+----------------------
+- No hits for a payload the application rewrites (HTML-escaped, URL-encoded): scan for the logged form too.
+
+Future Considerations:
+----------------------
+- Rotated/compressed log sets are scanned by LogSetScanner with the same automaton.
+"""
+
+import mmap
+import os
+import re
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from auto_scripts.Pages.LogReader import LogMark, LogReader
+
+TIMESTAMP_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})")
+_FOLD = bytes(c + 32 if 65 <= c <= 90 else c for c in range(256))
+
+
+def parse_timestamp(line: str) -> Optional[datetime]:
+    """
+    Returns the first ``YYYY-MM-DD HH:MM:SS`` (or ISO ``T``-separated) timestamp in ``line``, if any.
+    """
+    match = TIMESTAMP_PATTERN.search(line)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(f"{match.group(1)} {match.group(2)}", "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+class LogHit(NamedTuple):
+    """
+    One pattern occurrence: byte offset of the match, offset of its line, the decoded line and its timestamp.
+    """
+    pattern: str
+    offset: int
+    line_offset: int
+    line: str
+    timestamp: Optional[datetime]
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over bytes, flattened to a DFA.
+    """
+
+    def __init__(self, patterns: Sequence[bytes], case_insensitive: bool = False):
+        """
+        Args:
+            patterns (list[bytes]): Non-empty byte patterns.
+            case_insensitive (bool): Fold ASCII letters in patterns and input.
+        """
+        self.case_insensitive = case_insensitive
+        self.lengths = [len(p) for p in patterns]
+        self.delta: List[Dict[int, int]] = [{}]
+        self.outputs: List[List[int]] = [[]]
+        for index, pattern in enumerate(patterns):
+            assert pattern, "Empty patterns are not supported"
+            if case_insensitive:
+                pattern = pattern.translate(_FOLD)
+            state = 0
+            for byte in pattern:
+                nxt = self.delta[state].get(byte)
+                if nxt is None:
+                    nxt = len(self.delta)
+                    self.delta.append({})
+                    self.outputs.append([])
+                    self.delta[state][byte] = nxt
+                state = nxt
+            self.outputs[state].append(index)
+        starts = b"".join(re.escape(bytes([byte])) for byte in self.delta[0])
+        self.first = re.compile(b"[" + starts + b"]" if starts else b"(?!)")
+        self._build()
+
+    def _build(self) -> None:
+        fail = [0] * len(self.delta)
+        queue = deque(self.delta[0].values())
+        while queue:
+            state = queue.popleft()
+            for byte, nxt in list(self.delta[state].items()):
+                queue.append(nxt)
+                f = fail[state]
+                while f and byte not in self.delta[f]:
+                    f = fail[f]
+                fail[nxt] = self.delta[f].get(byte, 0) if self.delta[f].get(byte, 0) != nxt else 0
+                self.outputs[nxt] = self.outputs[nxt] + self.outputs[fail[nxt]]
+            # Flatten: inherit transitions of the failure state (already complete, BFS order).
+            if state:
+                for byte, nxt in self.delta[fail[state]].items():
+                    self.delta[state].setdefault(byte, nxt)
+
+    def iter_matches(self, data, start: int = 0, end: Optional[int] = None):
+        """
+        Yields (match start offset, pattern index) for every occurrence in ``data[start:end]``.
+        """
+        delta, outputs, lengths, first = self.delta, self.outputs, self.lengths, self.first
+        fold = _FOLD if self.case_insensitive else None
+        state = 0
+        end = len(data) if end is None else end
+        position = start
+        step = 1 << 20
+        while position < end:
+            block = data[position:min(position + step, end)]
+            if fold is not None:
+                block = block.translate(fold)
+            i, size = 0, len(block)
+            while i < size:
+                if not state:
+                    # In the root state, skip (in C) to the next byte that can start a pattern.
+                    match = first.search(block, i)
+                    if match is None:
+                        break
+                    i = match.start()
+                state = delta[state].get(block[i], 0)
+                if outputs[state]:
+                    for index in outputs[state]:
+                        yield position + i + 1 - lengths[index], index
+                i += 1
+            position += size
+
+
+class LogPatternScanner:
+    """
+    Single-pass, memory-mapped scan of one log file for many literal patterns.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Log file path.
+        """
+        self.path = path
+
+    def start_offset(self, since: Optional[LogMark]) -> int:
+        """
+        Byte offset where a LogReader mark starts (0 if the file rotated or was truncated since).
+        """
+        if since is None:
+            return 0
+        reader = LogReader.for_path(self.path)
+        reader.poll()  # the reader only notices a rotation or truncation when it polls
+        return since.offset if since.generation == reader.generation else 0
+
+    @staticmethod
+    def _line_at(data, offset: int, end: int):
+        line_start = data.rfind(b"\n", 0, offset) + 1
+        line_end = data.find(b"\n", offset, end)
+        line_end = end if line_end == -1 else line_end
+        return line_start, data[line_start:line_end].rstrip(b"\r").decode("utf-8", errors="replace")
+
+    def scan(self, patterns: Sequence[str], since: Optional[LogMark] = None, start: Optional[int] = None,
+             end: Optional[int] = None, case_insensitive: bool = False, first_only: bool = True,
+             accept: Optional[Callable[[LogHit], bool]] = None) -> Dict[str, List[LogHit]]:
+        """
+        Scans the log once for all ``patterns``.
+        Args:
+            patterns (list[str]): Literal patterns (payloads).
+            since (LogMark, optional): Start at this LogReader mark.
+            start (int, optional): Start byte offset (overrides ``since``).
+            end (int, optional): End byte offset (default: current file size).
+            case_insensitive (bool): ASCII case-insensitive matching.
+            first_only (bool): Keep only the first accepted hit per pattern and stop once all are found.
+            accept (callable, optional): Hit filter; rejected hits are ignored.
+        Returns:
+            dict: {pattern: [LogHit, ...]} ([] when not found).
+        """
+        unique = list(dict.fromkeys(patterns))
+        hits: Dict[str, List[LogHit]] = {pattern: [] for pattern in unique}
+        if not unique or not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return hits
+        automaton = AhoCorasick([p.encode("utf-8") for p in unique], case_insensitive=case_insensitive)
+        pending = set(range(len(unique)))
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = len(data) if end is None else min(end, len(data))
+            begin = self.start_offset(since) if start is None else start
+            for offset, index in automaton.iter_matches(data, begin, end):
+                if first_only and index not in pending:
+                    continue
+                line_offset, line = self._line_at(data, offset, end)
+                hit = LogHit(unique[index], offset, line_offset, line, parse_timestamp(line))
+                if accept is not None and not accept(hit):
+                    continue
+                hits[unique[index]].append(hit)
+                if first_only:
+                    pending.discard(index)
+                    if not pending:
+                        break
+        return hits
+
+    @staticmethod
+    def missing(hits: Dict[str, List[LogHit]]) -> List[str]:
+        """
+        Returns the patterns without hits.
+        """
+        return [pattern for pattern, found in hits.items() if not found]
@@ -0,0 +1,236 @@
+"""
+LogReader.py
+
+Executive Summary:
+------------------
+Shared, incremental log reader for all log assertions. Each log file has one process-wide reader that remembers how
+far it has read; a test records a mark at its start and later searches only the lines appended after that mark.
+Rotation (rename + new file) and truncation are detected, and a bounded in-memory index of recent lines answers
+most searches without touching the disk again. A log assertion costs the size of the test's own output, not the
+size of a multi-gigabyte application log.
+
+Detailed Analysis:
+------------------
+- ``poll()`` reads only bytes appended since the previous poll through a persistent file handle, splitting complete
+  lines into the recent-lines index (``recent_lines`` entries, oldest evicted first); a trailing partial line waits
+  for its newline.
+- The first poll starts at the end of the existing log (at the start of its last, possibly partial, line), so
+  taking a mark never reads history; only ``mark(at_start=True)`` and ``find()``/``search()`` without a mark read
+  the current file from byte 0, and they do so on demand.
+- Rotation: when the path points to a new inode, the old handle is drained to EOF first (so lines written just
+  before rotation are not lost), then the new file is read from byte 0. Truncation (size below the read offset)
+  restarts at byte 0. Each new file starts a new ``generation``.
+- ``mark()`` returns a LogMark (generation, byte offset, line sequence number) for "now"; ``mark(at_start=True)``
+  marks the beginning of the current file.
+- ``read_since(mark)`` answers from the index when it still holds the mark's line; otherwise it re-reads the
+  current file from the mark's byte offset (or from 0 if the file rotated since the mark).
+- Thread-safe; all PageClasses reading the same path share one reader via ``LogReader.for_path(path)``.
+
+Implementation Guide:
+---------------------
+1. At test start: ``mark = LogReader.for_path(log_path).mark()`` (PageClasses do this in ``__init__``).
+2. Assertion: ``line = LogReader.for_path(log_path).find(lambda l: "SQL injection" in l, since=mark)``.
+3. Regex: ``LogReader.for_path(log_path).search(r"SQL injection detected.*payload", since=mark, flags=re.I)``.
+
+Quality Assurance Report:
+-------------------------
+- Missing files read as empty until they appear.
+- Lines are decoded as UTF-8 with replacement characters; line endings are stripped.
+
+Troubleshooting Guide:
+----------------------
+- Expected line not found: make sure the mark was taken before the action that logs it.
+
+Future Considerations:
+----------------------
+- Compressed rotated files (app.log.1.gz) when a mark predates rotation.
+"""
+
+import collections
+import os
+import re
+import threading
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+
+class LogMark(NamedTuple):
+    """
+    Position in a log: file generation, byte offset and sequence number of the next line (None: file start).
+    """
+    generation: int
+    offset: int
+    seq: Optional[int]
+
+
+class LogReader:
+    """
+    Offset-tracking reader of one log file with rotation/truncation handling and a recent-lines index.
+    """
+    READ_SIZE = 1024 * 1024
+    RECENT_LINES = 10000
+
+    _readers: Dict[str, "LogReader"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, path: str, recent_lines: Optional[int] = None):
+        """
+        Args:
+            path (str): Log file path.
+            recent_lines (int, optional): Size of the in-memory index of recent lines.
+        """
+        self.path = path
+        self.generation = 0
+        self.offset = 0
+        self.next_seq = 0
+        self.recent: Deque[Tuple[int, int, int, str]] = collections.deque(maxlen=recent_lines or self.RECENT_LINES)
+        self._handle = None
+        self._inode: Optional[Tuple[int, int]] = None
+        self._partial = b""
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_path(cls, path: str) -> "LogReader":
+        """
+        Returns the shared reader for ``path``, creating it on first use.
+        """
+        key = os.path.abspath(path)
+        with cls._registry_lock:
+            reader = cls._readers.get(key)
+            if reader is None:
+                reader = cls(path)
+                cls._readers[key] = reader
+            return reader
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._registry_lock:
+            readers = list(cls._readers.values())
+            cls._readers.clear()
+        for reader in readers:
+            reader.close()
+
+    # --- reading ---
+    def _consume(self, data: bytes) -> int:
+        start = self.offset - len(self._partial)
+        self.offset += len(data)
+        chunks = (self._partial + data).split(b"\n")
+        self._partial = chunks.pop()
+        for raw in chunks:
+            self.recent.append((self.next_seq, self.generation, start, raw.rstrip(b"\r").decode("utf-8", errors="replace")))
+            self.next_seq += 1
+            start += len(raw) + 1
+        return len(chunks)
+
+    def _drain(self) -> int:
+        lines = 0
+        while True:
+            data = self._handle.read(self.READ_SIZE)
+            if not data:
+                return lines
+            lines += self._consume(data)
+
+    def _line_start_before(self, size: int) -> int:
+        """
+        Offset just after the last newline before ``size`` (0 if there is none).
+        """
+        end = size
+        while end > 0:
+            start = max(0, end - self.READ_SIZE)
+            self._handle.seek(start)
+            newline = self._handle.read(end - start).rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            end = start
+        return 0
+
+    def _open(self, stat: os.stat_result, at_end: bool = False) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = open(self.path, "rb")
+        self._inode = (stat.st_dev, stat.st_ino)
+        self.generation += 1
+        self.offset = self._line_start_before(stat.st_size) if at_end else 0
+        self._handle.seek(self.offset)
+        self._partial = b""
+
+    def poll(self) -> int:
+        """
+        Reads bytes appended since the last poll into the index.
+        Returns:
+            int: Number of new complete lines.
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return self._drain() if self._handle is not None else 0
+            lines = 0
+            if self._handle is None:
+                self._open(stat, at_end=True)
+            elif (stat.st_dev, stat.st_ino) != self._inode:
+                lines += self._drain()
+                if self._partial:
+                    lines += self._consume(b"\n")
+                self._open(stat)
+            elif stat.st_size < self.offset:
+                self._handle.seek(0)
+                self.generation += 1
+                self.offset = 0
+                self._partial = b""
+            return lines + self._drain()
+
+    # --- marks and searches ---
+    def mark(self, at_start: bool = False) -> LogMark:
+        """
+        Returns a mark for the current end of the log (or the start of the current file with ``at_start``).
+        """
+        with self._lock:
+            self.poll()
+            if at_start:
+                return LogMark(self.generation, 0, None)
+            return LogMark(self.generation, self.offset - len(self._partial), self.next_seq)
+
+    def _read_file(self, generation: int, offset: int) -> List[str]:
+        if generation != self.generation:
+            offset = 0
+        end = self.offset - len(self._partial)
+        if end <= offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(end - offset)
+        return [raw.rstrip(b"\r").decode("utf-8", errors="replace") for raw in data.split(b"\n")[:-1]]
+
+    def read_since(self, mark: LogMark) -> Tuple[List[str], LogMark]:
+        """
+        Returns the complete lines appended after ``mark`` and a mark for the position after them.
+        """
+        with self._lock:
+            self.poll()
+            end_mark = LogMark(self.generation, self.offset - len(self._partial), self.next_seq)
+            if mark.seq is not None and (not self.recent or self.recent[0][0] <= mark.seq):
+                first = self.recent[0][0] if self.recent else self.next_seq
+                lines = [entry[3] for entry in list(self.recent)[mark.seq - first:]]
+            else:
+                lines = self._read_file(mark.generation, mark.offset)
+            return lines, end_mark
+
+    def find(self, predicate: Callable[[str], bool], since: Optional[LogMark] = None) -> Optional[str]:
+        """
+        Returns the first line after ``since`` (default: start of the current file) matching ``predicate``.
+        """
+        lines, _ = self.read_since(since or LogMark(self.generation, 0, None))
+        return next((line for line in lines if predicate(line)), None)
+
+    def search(self, pattern: str, since: Optional[LogMark] = None, flags: int = 0) -> Optional[str]:
+        """
+        Returns the first line after ``since`` containing a match of the regex ``pattern``.
+        """
+        regex = re.compile(pattern, flags)
+        return self.find(lambda line: regex.search(line) is not None, since=since)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
@@ -0,0 +1,258 @@
+"""
+LogSetScanner.py
+
+Executive Summary:
+------------------
+Log assertions over a whole log set (``/var/log/app/security.log*``): the active file plus rotated ``.1`` segments
+and compressed ``.gz`` / ``.zst`` segments. Segments are pruned by the timestamp range of their first and last lines,
+decompressed as streams and scanned in parallel across a process pool with the Aho-Corasick automaton from
+LogPatternScanner. Searching a day of rotated security logs takes seconds instead of a sequential scan of everything.
+
+Detailed Analysis:
+------------------
+- ``segments(start, end)``: files matching the glob, oldest first (by mtime), each with its first/last line
+  timestamps. Plain files read the first line and the tail; compressed segments read the first line from the stream
+  and use the file mtime as the last timestamp (logrotate compresses after the last write, gzip keeps the mtime).
+  A segment's last timestamp is also capped by the first timestamp of the next newer segment.
+  Ranges are cached per (path, size, mtime). Segments entirely outside [start, end] are skipped; segments with
+  unknown timestamps are always scanned.
+- ``scan(patterns, ...)``: one task per segment on a ProcessPoolExecutor (inline for a single segment or
+  ``max_workers=1``). Each task streams its segment in blocks split at line boundaries and reports
+  LogSetHit(segment, pattern, offset, line, timestamp); ``offset`` is in the decompressed stream.
+- Hit filters must be picklable, so they are declarative: ``required`` substrings that the line must contain and the
+  [start, end] window applied to hit timestamps.
+- ``.zst`` needs the ``zstandard`` package, imported only when such a segment is scanned.
+
+Implementation Guide:
+---------------------
+1. ``scanner = LogSetScanner("/var/log/app/security.log*")``
+2. ``hits = scanner.scan(payloads, start=test_started_at, required=["SQL injection"])``
+3. ``assert not LogSetScanner.missing(hits)``
+
+Quality Assurance Report:
+-------------------------
+- Timestamps are compared naively (log local time); pass naive datetimes for ``start``/``end``.
+- ``first_only`` keeps the earliest hit per pattern in segment order.
+
+Troubleshooting Guide:
+----------------------
+- A payload is missing but the line exists: check ``start``/``end`` against the log's timezone.
+- "zstandard is required": ``pip install zstandard`` on the agent.
+
+Future Considerations:
+----------------------
+- Persisted segment timestamp index shared across test runs.
+"""
+
+import glob
+import gzip
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from auto_scripts.Pages.LogPatternScanner import AhoCorasick, parse_timestamp
+
+BLOCK_SIZE = 4 * 1024 * 1024
+TAIL_SIZE = 64 * 1024
+
+
+class LogSegment(NamedTuple):
+    path: str
+    first: Optional[datetime]
+    last: Optional[datetime]
+
+
+class LogSetHit(NamedTuple):
+    """
+    One pattern occurrence in a log segment (offset within the decompressed segment).
+    """
+    segment: str
+    pattern: str
+    offset: int
+    line: str
+    timestamp: Optional[datetime]
+
+
+def open_segment(path: str) -> io.BufferedIOBase:
+    """
+    Opens a log segment for streamed binary reading, decompressing ``.gz`` and ``.zst``.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(f"zstandard is required to scan {path}") from e
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    return open(path, "rb")
+
+
+def _decode(raw: bytes) -> str:
+    return raw.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def _in_window(timestamp: Optional[datetime], start: Optional[datetime], end: Optional[datetime]) -> bool:
+    if timestamp is None:
+        return True
+    return (start is None or timestamp >= start) and (end is None or timestamp <= end)
+
+
+def scan_segment(path: str, patterns: Sequence[str], case_insensitive: bool = False, first_only: bool = True,
+                 required: Sequence[str] = (), start: Optional[datetime] = None,
+                 end: Optional[datetime] = None) -> List[LogSetHit]:
+    """
+    Streams one segment through an Aho-Corasick automaton (process pool task; arguments are picklable).
+    """
+    automaton = AhoCorasick([p.encode("utf-8") for p in patterns], case_insensitive=case_insensitive)
+    required_bytes = [r.encode("utf-8").lower() if case_insensitive else r.encode("utf-8") for r in required]
+    pending = set(range(len(patterns)))
+    hits: List[LogSetHit] = []
+    base, carry = 0, b""
+    with open_segment(path) as stream:
+        while pending or not first_only:
+            data = stream.read(BLOCK_SIZE)
+            block = carry + data
+            if not data:
+                cut = len(block)
+            else:
+                cut = block.rfind(b"\n") + 1
+                if not cut:
+                    carry = block
+                    continue
+            lines, carry = block[:cut], block[cut:]
+            for offset, index in automaton.iter_matches(lines):
+                if first_only and index not in pending:
+                    continue
+                line_start = lines.rfind(b"\n", 0, offset) + 1
+                line_end = lines.find(b"\n", offset)
+                raw = lines[line_start:len(lines) if line_end == -1 else line_end]
+                folded = raw.lower() if case_insensitive else raw
+                if any(r not in folded for r in required_bytes):
+                    continue
+                line = _decode(raw)
+                timestamp = parse_timestamp(line)
+                if not _in_window(timestamp, start, end):
+                    continue
+                hits.append(LogSetHit(path, patterns[index], base + offset, line, timestamp))
+                pending.discard(index)
+                if first_only and not pending:
+                    break
+            base += cut
+            if not data:
+                break
+    return hits
+
+
+class LogSetScanner:
+    """
+    Parallel, timestamp-pruned multi-pattern scan over a glob of plain and compressed log segments.
+    """
+    _ranges: Dict[Tuple[str, int, float], Tuple[Optional[datetime], Optional[datetime]]] = {}
+
+    def __init__(self, log_glob: str, max_workers: Optional[int] = None):
+        """
+        Args:
+            log_glob (str): Glob matching the active log and its rotated segments (e.g. "security.log*").
+            max_workers (int, optional): Process pool size (default: CPU count).
+        """
+        self.log_glob = log_glob
+        self.max_workers = max_workers
+
+    # --- segments ---
+    @staticmethod
+    def _first_timestamp(path: str) -> Optional[datetime]:
+        with open_segment(path) as stream:
+            for _ in range(10):
+                line = stream.readline()
+                if not line:
+                    return None
+                timestamp = parse_timestamp(_decode(line))
+                if timestamp is not None:
+                    return timestamp
+        return None
+
+    @staticmethod
+    def _last_timestamp(path: str, stat: os.stat_result) -> Optional[datetime]:
+        if path.endswith((".gz", ".zst")):
+            return datetime.fromtimestamp(stat.st_mtime)
+        with open(path, "rb") as f:
+            f.seek(max(0, stat.st_size - TAIL_SIZE))
+            tail = f.read().splitlines()
+        for raw in reversed(tail):
+            timestamp = parse_timestamp(_decode(raw))
+            if timestamp is not None:
+                return timestamp
+        return None
+
+    def segment(self, path: str) -> LogSegment:
+        """
+        Returns ``path`` with its first/last line timestamps (cached while the file is unchanged).
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+        if key not in self._ranges:
+            self._ranges[key] = (self._first_timestamp(path), self._last_timestamp(path, stat))
+        first, last = self._ranges[key]
+        return LogSegment(path, first, last)
+
+    def segments(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[LogSegment]:
+        """
+        Returns the segments overlapping [start, end], oldest first.
+        """
+        paths = sorted((p for p in glob.glob(self.log_glob) if os.path.isfile(p)), key=os.path.getmtime)
+        ordered = [self.segment(path) for path in paths]
+        selected = []
+        for position, segment in enumerate(ordered):
+            following = ordered[position + 1].first if position + 1 < len(ordered) else None
+            if following is not None and (segment.last is None or following < segment.last):
+                # A rotated segment ends before the next one starts; tighter than a compressed segment's mtime.
+                segment = segment._replace(last=following)
+            if start is not None and segment.last is not None and segment.last < start:
+                continue
+            if end is not None and segment.first is not None and segment.first > end:
+                continue
+            selected.append(segment)
+        return selected
+
+    # --- scanning ---
+    def scan(self, patterns: Sequence[str], start: Optional[datetime] = None, end: Optional[datetime] = None,
+             case_insensitive: bool = False, first_only: bool = True,
+             required: Sequence[str] = ()) -> Dict[str, List[LogSetHit]]:
+        """
+        Scans all segments overlapping [start, end] for ``patterns`` in parallel.
+        Args:
+            patterns (list[str]): Literal patterns (payloads).
+            start (datetime, optional): Ignore segments and hits before this time.
+            end (datetime, optional): Ignore segments and hits after this time.
+            case_insensitive (bool): ASCII case-insensitive matching (also for ``required``).
+            first_only (bool): Keep only the earliest hit per pattern.
+            required (list[str]): Substrings every hit line must contain.
+        Returns:
+            dict: {pattern: [LogSetHit, ...]} ([] when not found).
+        """
+        unique = list(dict.fromkeys(patterns))
+        hits: Dict[str, List[LogSetHit]] = {pattern: [] for pattern in unique}
+        segments = self.segments(start, end) if unique else []
+        args = (unique, case_insensitive, first_only, tuple(required), start, end)
+        if len(segments) <= 1 or self.max_workers == 1:
+            results = [scan_segment(segment.path, *args) for segment in segments]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(scan_segment, segment.path, *args) for segment in segments]
+                results = [future.result() for future in futures]
+        for segment_hits in results:
+            for hit in segment_hits:
+                if first_only and hits[hit.pattern]:
+                    continue
+                hits[hit.pattern].append(hit)
+        return hits
+
+    @staticmethod
+    def missing(hits: Dict[str, List[LogSetHit]]) -> List[str]:
+        """
+        Returns the patterns without hits.
+        """
+        return [pattern for pattern, found in hits.items() if not found]
@@ -0,0 +1,281 @@
+"""
+LogStore.py
+
+Executive Summary:
+------------------
+Structured log ingestion into an indexed SQLite store. Log lines are parsed once into typed columns (timestamp,
+level, category, user, payload, message) as they are appended, and log assertions become indexed queries
+("security events for payload X between t0 and t1") instead of regexes over raw text. Dozens of assertions per run
+share one incremental ingestion per log file.
+
+Detailed Analysis:
+------------------
+- Ingestion is lazy: ``register(path)`` only records a LogReader mark (no parsing), and every query first runs
+  ``ingest`` for the sources it touches, which reads only lines appended since the previous ingest through the
+  shared LogReader (rotation/truncation handled there), parses them with ``LogLineParser`` and inserts them in one
+  ``executemany``. A source starts at the current end of the log unless registered with ``from_start=True``.
+- Schema: ``log_events(id, source, ts, level, category, user, payload, message, seq)``; ``ts`` is ISO text
+  (sortable), ``seq`` is the LogReader line sequence number. Indexes: (category, ts), (user, ts), (payload),
+  (source, id), (source, seq). ``since=<LogMark>`` scopes a query to lines after a LogReader mark, so pages take a
+  cheap reader mark at creation instead of ingesting; ``mark(path)`` (ingest, then the highest id) still works with
+  ``after_id``.
+- Bounded: the store keeps the newest ``max_events`` events (default ``MAX_EVENTS``) and deletes older ones after
+  each ingest, so the process-wide store does not grow for the lifetime of a long run.
+- Parsing (``LogLineParser``): timestamp ``YYYY-MM-DD HH:MM:SS`` (optionally bracketed or ISO ``T``), level
+  (DEBUG/INFO/WARN/WARNING/ERROR/CRITICAL/FATAL), category from ordered ``CATEGORY_RULES`` (first match wins),
+  user from ``user=``/``username=``/``email=`` or the first e-mail address, payload from ``payload=`` or the text
+  after "detected:" / "attempt:" / "blocked:" (trailing ``key=value`` fields stripped).
+- Queries: ``events(...)`` filters on any column, ``contains`` does a substring match on the message (after the
+  indexed filters narrowed the rows), ``count(...)`` counts. ``security_events(payload, start, end)`` is the
+  common security assertion.
+- ``LogStore.shared()`` is one in-memory store per process; SQLite access is serialized by a lock.
+
+Implementation Guide:
+---------------------
+1. At test start: ``store = LogStore.shared(); store.register(log_path); mark = LogReader.for_path(log_path).mark()``.
+2. Run the action.
+3. ``events = store.security_events("admin'--", since=mark)`` (ingests first); assert events and events[0].ts.
+
+Quality Assurance Report:
+-------------------------
+- Lines the parser does not understand are still stored (category "other", raw message), so nothing is lost.
+- Timestamps that fail to parse are stored as NULL; "has a timestamp" assertions test ``ts``.
+- Events older than the newest ``max_events`` are gone; keep the bound above the lines one test run produces.
+
+Troubleshooting Guide:
+----------------------
+- Events in the wrong category: add a rule ahead of the matching one in ``LogLineParser.CATEGORY_RULES``.
+
+Future Considerations:
+----------------------
+- Backfilling from rotated/compressed segments (LogSetScanner.open_segment) for historical queries.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from auto_scripts.Pages.LogPatternScanner import parse_timestamp
+from auto_scripts.Pages.LogReader import LogMark, LogReader
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    ts TEXT,
+    level TEXT,
+    category TEXT NOT NULL,
+    user TEXT,
+    payload TEXT,
+    message TEXT NOT NULL,
+    seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_log_events_category_ts ON log_events (category, ts);
+CREATE INDEX IF NOT EXISTS idx_log_events_user_ts ON log_events (user, ts);
+CREATE INDEX IF NOT EXISTS idx_log_events_payload ON log_events (payload);
+CREATE INDEX IF NOT EXISTS idx_log_events_source_id ON log_events (source, id);
+CREATE INDEX IF NOT EXISTS idx_log_events_source_seq ON log_events (source, seq);
+"""
+COLUMNS = ("source", "ts", "level", "category", "user", "payload", "message", "seq")
+
+
+class LogEvent(NamedTuple):
+    id: int
+    source: str
+    ts: Optional[str]
+    level: Optional[str]
+    category: str
+    user: Optional[str]
+    payload: Optional[str]
+    message: str
+    seq: Optional[int] = None
+
+    @property
+    def timestamp(self) -> Optional[datetime]:
+        return datetime.fromisoformat(self.ts) if self.ts else None
+
+
+class LogLineParser:
+    """
+    Parses raw log lines into (ts, level, category, user, payload, message).
+    """
+    LEVEL = re.compile(r"\b(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL)\b")
+    USER = re.compile(r"\b(?:user(?:name)?|email)\s*[=:]\s*['\"]?([^\s,;'\"]+)", re.IGNORECASE)
+    EMAIL = re.compile(r"[A-Za-z0-9_.+-]+@[A-Za-z0-9-]+\.[A-Za-z0-9-.]+")
+    PAYLOAD = re.compile(r"\bpayload\s*[=:]\s*(.+)$|\b(?:detected|attempt|blocked)\s*:\s*(.+)$", re.IGNORECASE)
+    TRAILING_FIELDS = re.compile(r"(?:\s+[A-Za-z_]\w*=\S+)+$")
+    CATEGORY_RULES: List[Tuple[str, re.Pattern]] = [
+        ("sql_injection", re.compile(r"SQL injection", re.IGNORECASE)),
+        ("xss", re.compile(r"\bXSS\b|cross-site scripting", re.IGNORECASE)),
+        ("failed_login", re.compile(r"FAILED_LOGIN|failed login|login failed", re.IGNORECASE)),
+        ("registration", re.compile(r"registration success|confirmation email", re.IGNORECASE)),
+        ("password_reset", re.compile(r"password reset", re.IGNORECASE)),
+    ]
+
+    def parse(self, line: str) -> Tuple[Optional[str], Optional[str], str, Optional[str], Optional[str], str]:
+        timestamp = parse_timestamp(line)
+        level = self.LEVEL.search(line)
+        category = next((name for name, rule in self.CATEGORY_RULES if rule.search(line)), "other")
+        user = self.USER.search(line) or self.EMAIL.search(line)
+        payload = self.PAYLOAD.search(line)
+        return (
+            timestamp.isoformat(sep=" ") if timestamp else None,
+            ("WARN" if level.group(1) == "WARNING" else level.group(1)) if level else None,
+            category,
+            (user.group(1) if user.re is self.USER else user.group(0)) if user else None,
+            next((self.TRAILING_FIELDS.sub("", group).strip() for group in payload.groups() if group), None)
+            if payload else None,
+            line,
+        )
+
+
+class LogStore:
+    """
+    Incrementally ingested, indexed store of parsed log events.
+    """
+    MAX_EVENTS = 100000
+
+    _shared: Optional["LogStore"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, database: str = ":memory:", parser: Optional[LogLineParser] = None,
+                 max_events: Optional[int] = None):
+        """
+        Args:
+            database (str): SQLite file, or ":memory:".
+            parser (LogLineParser, optional): Line parser (default LogLineParser()).
+            max_events (int, optional): Number of newest events kept (default MAX_EVENTS).
+        """
+        self.parser = parser or LogLineParser()
+        self.max_events = max_events or self.MAX_EVENTS
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._marks: Dict[str, LogMark] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def shared(cls) -> "LogStore":
+        """
+        Returns the process-wide in-memory store.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    # --- ingestion ---
+    def register(self, path: str, from_start: bool = False) -> None:
+        """
+        Starts tracking ``path`` at its current end (or from the start of the current file). Nothing is parsed until
+        the first ingest or query.
+        """
+        with self._lock:
+            if path not in self._marks:
+                self._marks[path] = LogReader.for_path(path).mark(at_start=from_start)
+
+    def ingest(self, path: str) -> int:
+        """
+        Parses and stores lines appended to ``path`` since the previous ingest.
+        Returns:
+            int: Number of events ingested.
+        """
+        with self._lock:
+            self.register(path)
+            lines, self._marks[path] = LogReader.for_path(path).read_since(self._marks[path])
+            if lines:
+                # read_since returns the newest complete lines, so they end just before the end mark's sequence number.
+                first_seq = self._marks[path].seq - len(lines)
+                rows = [(path,) + self.parser.parse(line) + (first_seq + i,) for i, line in enumerate(lines)]
+                self._conn.executemany(
+                    f"INSERT INTO log_events ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows
+                )
+                self._conn.execute("DELETE FROM log_events WHERE id <= (SELECT MAX(id) FROM log_events) - ?",
+                                   (self.max_events,))
+                self._conn.commit()
+            return len(lines)
+
+    def _ingest_for(self, source: Optional[str]) -> None:
+        with self._lock:
+            for path in ([source] if source is not None else list(self._marks)):
+                self.ingest(path)
+
+    def mark(self, path: str) -> int:
+        """
+        Ingests ``path`` and returns the highest event id; pass it as ``after_id`` to see only later events.
+        """
+        with self._lock:
+            self.ingest(path)
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM log_events").fetchone()[0]
+
+    # --- queries ---
+    @staticmethod
+    def _where(source: Optional[str], category: Optional[str], level: Optional[str], user: Optional[str],
+               payload: Optional[str], contains: Optional[str], start: Optional[datetime], end: Optional[datetime],
+               after_id: Optional[int], since: Optional[LogMark] = None) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        for column, value in (("source", source), ("category", category), ("level", level), ("user", user),
+                              ("payload", payload)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start.isoformat(sep=" "))
+        if end is not None:
+            clauses.append("ts <= ?")
+            params.append(end.isoformat(sep=" "))
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        if since is not None and since.seq is not None:
+            clauses.append("seq >= ?")
+            params.append(since.seq)
+        if contains is not None:
+            clauses.append("instr(message, ?) > 0")
+            params.append(contains)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def events(self, source: Optional[str] = None, category: Optional[str] = None, level: Optional[str] = None,
+               user: Optional[str] = None, payload: Optional[str] = None, contains: Optional[str] = None,
+               start: Optional[datetime] = None, end: Optional[datetime] = None, after_id: Optional[int] = None,
+               since: Optional[LogMark] = None, limit: Optional[int] = None) -> List[LogEvent]:
+        """
+        Ingests ``source`` (every registered source if None), then returns events matching every given filter, in
+        log order.
+        """
+        where, params = self._where(source, category, level, user, payload, contains, start, end, after_id, since)
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM log_events{where} ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            self._ingest_for(source)
+            return [LogEvent(*row) for row in self._conn.execute(sql, params)]
+
+    def count(self, **filters) -> int:
+        """
+        Counts events matching the ``events()`` filters.
+        """
+        where, params = self._where(*(filters.get(name) for name in (
+            "source", "category", "level", "user", "payload", "contains", "start", "end", "after_id", "since")))
+        with self._lock:
+            self._ingest_for(filters.get("source"))
+            return self._conn.execute(f"SELECT COUNT(*) FROM log_events{where}", params).fetchone()[0]
+
+    def security_events(self, payload: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                        categories: Sequence[str] = ("sql_injection", "xss"),
+                        after_id: Optional[int] = None, since: Optional[LogMark] = None,
+                        source: Optional[str] = None) -> List[LogEvent]:
+        """
+        Security events (SQL injection / XSS) mentioning ``payload`` between ``start`` and ``end``.
+        """
+        events = [event for category in categories
+                  for event in self.events(source=source, category=category, contains=payload, start=start, end=end,
+                                           after_id=after_id, since=since)]
+        return sorted(events, key=lambda event: event.id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
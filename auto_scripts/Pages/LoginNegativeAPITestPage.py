@@ -13,7 +13,7 @@ Implements:
 Strict adherence to Python best practices for maintainability and downstream automation.
 """
 
-import requests
+from auto_scripts.Pages.APISessionPool import APISessionPool
 
 class LoginNegativeAPITestPage:
     """
@@ -23,6 +23,13 @@ class LoginNegativeAPITestPage:
     LOGIN_API_URL = "https://example-ecommerce.com/api/auth/login"
     SESSION_STORE_API_URL = "https://example-ecommerce.com/api/sessions"  # Example endpoint; adjust as needed.
 
+    def __init__(self, session=None):
+        """
+        Args:
+            session (requests.Session, optional): HTTP session; defaults to the shared APISessionPool session.
+        """
+        self.session = session or APISessionPool.get_session(self.LOGIN_API_URL)
+
     def register_test_user(self, user_data):
         """
         Registers a test user via API.
@@ -34,7 +41,7 @@ class LoginNegativeAPITestPage:
             RuntimeError: If registration fails
         """
         headers = {"Content-Type": "application/json"}
-        resp = requests.post(self.REGISTER_API_URL, json=user_data, headers=headers, timeout=10)
+        resp = self.session.post(self.REGISTER_API_URL, json=user_data, headers=headers, timeout=10)
         if resp.status_code not in [200, 201]:
             raise RuntimeError(f"User registration failed: {resp.text}")
         return resp
@@ -50,7 +57,7 @@ class LoginNegativeAPITestPage:
         """
         payload = {"username": username, "password": incorrect_password}
         headers = {"Content-Type": "application/json"}
-        resp = requests.post(self.LOGIN_API_URL, json=payload, headers=headers, timeout=10)
+        resp = self.session.post(self.LOGIN_API_URL, json=payload, headers=headers, timeout=10)
         return resp
 
     def validate_negative_login_response(self, resp):
@@ -84,7 +91,7 @@ class LoginNegativeAPITestPage:
         """
         headers = {"Content-Type": "application/json"}
         params = {"username": username}
-        resp = requests.get(self.SESSION_STORE_API_URL, headers=headers, params=params, timeout=10)
+        resp = self.session.get(self.SESSION_STORE_API_URL, headers=headers, params=params, timeout=10)
         if resp.status_code != 200:
             # If session store endpoint unavailable, treat as no session
             return True
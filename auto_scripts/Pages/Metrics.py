@@ -0,0 +1,93 @@
+"""
+Metrics.py
+
+Executive Summary:
+------------------
+Shared measurement primitives for the tooling modules. LatencyHistogram records latencies in an HDR-style
+log-linear histogram so load runs (LoadTestRunner) and time-to-consistency waits (EventualConsistency) report
+percentiles with bounded memory and without importing each other.
+
+Detailed Analysis:
+------------------
+- Values are integer microseconds; each power-of-two range is split into ``2 ** sub_bucket_bits`` linear buckets,
+  giving ~1% relative error at the default two significant figures.
+- ``percentile`` returns the highest equivalent value of the bucket holding the requested rank, capped at ``max``.
+
+Implementation Guide:
+---------------------
+1. histogram = LatencyHistogram()
+2. histogram.record(elapsed_seconds * 1_000_000)
+3. histogram.summary() -> {"count", "min_ms", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}
+
+Quality Assurance Report:
+-------------------------
+- Negative samples are clamped to zero; an empty histogram reports zeros instead of raising.
+
+Troubleshooting Guide:
+----------------------
+- Percentiles look quantized: raise ``significant_figures`` (memory grows with the number of occupied buckets).
+
+Future Considerations:
+----------------------
+- Histogram merging for multi-process load runs.
+"""
+
+import math
+from typing import Dict
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear latency histogram over integer microseconds.
+    """
+
+    def __init__(self, significant_figures: int = 2):
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def _shift(self, value: int) -> int:
+        return max(value.bit_length() - self.sub_bucket_bits, 0)
+
+    def record(self, micros: int) -> None:
+        micros = max(int(micros), 0)
+        shift = self._shift(micros)
+        bucket = (micros >> shift) << shift
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum += micros
+        self.min = micros if self.min is None else min(self.min, micros)
+        self.max = max(self.max, micros)
+
+    def percentile(self, pct: float) -> int:
+        """
+        Returns the highest equivalent value (microseconds) at or below which ``pct`` percent of samples fall.
+        """
+        if not self.total:
+            return 0
+        target = max(math.ceil(pct / 100.0 * self.total), 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(bucket + (1 << self._shift(bucket)) - 1, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns count and latency statistics in milliseconds.
+        """
+        def ms(micros):
+            return round(micros / 1000.0, 3)
+        return {
+            "count": self.total,
+            "min_ms": ms(self.min or 0),
+            "mean_ms": ms(self.sum / self.total) if self.total else 0.0,
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max),
+        }
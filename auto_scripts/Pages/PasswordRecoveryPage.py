@@ -32,7 +32,7 @@ Troubleshooting Guide:
 
 Future Considerations:
 ----------------------
-- Integrate with real email API for inbox validation.
+- Inbox validation: pass a Mailbox (SMTPCaptureSink) to read the real reset link; without one the link is mocked.
 - Parameterize URLs for multi-environment support.
 - Add retry logic and audit reporting.
 """
@@ -44,6 +44,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import re
 import datetime
+from typing import Any, Dict, Optional
+
+from auto_scripts.Pages.SMTPCaptureSink import Mailbox, parse_reset_link
 
 class PasswordRecoveryPage:
     # Locators from Locators.json
@@ -55,9 +58,19 @@ class PasswordRecoveryPage:
     USERNAME_RESULT = (By.CSS_SELECTOR, "span.recovered-username")
     INSTRUCTIONS_TEXT = (By.CSS_SELECTOR, "div.recovery-instructions")
 
-    def __init__(self, driver: WebDriver):
+    RESET_LINK_PATTERN = r"reset"
+    EMAIL_TIMEOUT = 30
+
+    def __init__(self, driver: WebDriver, mailbox: Optional[Mailbox] = None):
+        """
+        Args:
+            driver (WebDriver): Selenium WebDriver.
+            mailbox (Mailbox, optional): SMTPCaptureSink mailbox receiving the application's emails.
+        """
         self.driver = driver
         self.wait = WebDriverWait(self.driver, 10)
+        self.mailbox = mailbox
+        self.mailbox_mark = mailbox.mark() if mailbox is not None else 0
 
     def go_to_password_recovery_page(self):
         """
@@ -93,6 +106,8 @@ class PasswordRecoveryPage:
         Clicks the Submit button to trigger password recovery.
         """
         submit_btn = self.wait.until(EC.element_to_be_clickable(self.SUBMIT_BUTTON))
+        if self.mailbox is not None:
+            self.mailbox_mark = self.mailbox.mark()
         submit_btn.click()
 
     def get_success_message(self):
@@ -120,9 +135,41 @@ class PasswordRecoveryPage:
         Mocks the process of checking the email inbox for the password reset link.
         In real automation, integrate with email API. Here, returns a placeholder link.
         """
-        expiry = (datetime.datetime.utcnow() + datetime.timedelta(hours=12)).strftime("%Y%m%d%H%M")
+        expiry = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=12)).strftime("%Y%m%d%H%M")
         return f"https://app.example.com/reset-password?token=mocktoken&expires={expiry}"
 
+    def get_reset_link_from_mailbox(self, email: str, timeout: Optional[float] = None) -> str:
+        """
+        Waits for the password reset email sent to ``email`` after the last submit and returns its reset link.
+        Raises:
+            AssertionError: If no reset email (or no link in it) arrives before the deadline.
+        """
+        assert self.mailbox is not None, "No mailbox configured; pass an SMTPCaptureSink mailbox to the page."
+        message = self.mailbox.wait_for(
+            recipient=email, after_id=self.mailbox_mark, timeout=timeout or self.EMAIL_TIMEOUT,
+            predicate=lambda m: bool(m.links(self.RESET_LINK_PATTERN)), name="password reset email received"
+        )
+        return message.links(self.RESET_LINK_PATTERN)[0]
+
+    @staticmethod
+    def get_reset_link_details(link: str) -> Dict[str, Any]:
+        """
+        Returns {"url", "token", "expires"} for a reset link.
+        """
+        return parse_reset_link(link)
+
+    @staticmethod
+    def is_reset_link_expired(link: str, now: Optional[datetime.datetime] = None) -> bool:
+        """
+        True if the link's ``expires`` parameter lies in the past; links without expiry never expire.
+        ``now`` defaults to the current time; a naive ``now`` is taken as UTC.
+        """
+        expires = parse_reset_link(link)["expires"]
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=datetime.timezone.utc)
+        return expires is not None and expires <= now
+
     def run_tc_scrum74_008(self, email: str) -> dict:
         """
         Executes the TC_SCRUM74_008 workflow:
@@ -131,7 +178,7 @@ class PasswordRecoveryPage:
         3. Enter registered email address
         4. Click Submit button
         5. Validate success message
-        6. Check email inbox for password reset link (mocked)
+        6. Check email inbox for password reset link (captured mailbox, mocked without one)
         Returns:
             dict: Stepwise results and validation messages
         """
@@ -160,8 +207,11 @@ class PasswordRecoveryPage:
             # Step 5: Validate success message
             success_msg = self.get_success_message()
             results["step_5_success_message"] = success_msg
-            # Step 6: Check email inbox for password reset link (mocked)
-            reset_link = self.mock_check_email_inbox_for_reset_link(email)
+            # Step 6: Check email inbox for password reset link
+            if self.mailbox is not None:
+                reset_link = self.get_reset_link_from_mailbox(email)
+            else:
+                reset_link = self.mock_check_email_inbox_for_reset_link(email)
             results["step_6_email_inbox_check"] = reset_link
             results["overall_pass"] = all([
                 results["step_1_navigate_recovery"],
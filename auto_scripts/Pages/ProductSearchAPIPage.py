@@ -14,8 +14,9 @@ Detailed Analysis:
 
 Implementation Guide:
 ---------------------
-1. Instantiate ProductSearchAPIPage with db_config and optional logger.
-2. Call run_tc_scrum96_009() for end-to-end test.
+1. Instantiate ProductSearchAPIPage with db_config, optional logger and optional pooled session.
+2. Call run_tc_scrum96_009() for end-to-end test (run_tc_scrum96_009_concurrent() overlaps independent calls).
+   verify_all_products_via_pagination() walks every search page lazily for large catalogs.
 3. Validate returned dict for stepwise results and messages.
 4. Integrate into downstream automation as needed.
 
@@ -36,15 +37,21 @@ Troubleshooting Guide:
 Future Considerations:
 ----------------------
 - Parameterize endpoints and DB for multi-environment support.
-- Extend for additional product search scenarios (pagination, filtering, etc).
+- Extend for additional product search scenarios (filtering, sorting, etc).
 - Integrate with service virtualization for non-prod environments.
-- Add retry logic and audit reporting.
+- Add audit reporting (transient failures are retried by ResilienceLayer).
 """
 
 import requests
 import pymysql
 import logging
 from typing import Dict, Any, Optional
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.AsyncAPIPage import AsyncAPIPage
+from auto_scripts.Pages.ProductSearchPaginator import ProductSearchPaginator
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.ResponseCache import ResponseCache
+from auto_scripts.Pages.ResponseSchemas import ResponseSchemas
 
 class ProductSearchAPIPage:
     """
@@ -53,8 +60,10 @@ class ProductSearchAPIPage:
     BASE_URL = "https://example-ecommerce.com"
     PRODUCT_SEARCH_API = f"{BASE_URL}/api/products/search"
 
-    def __init__(self, db_config: Dict[str, Any], logger: Optional[logging.Logger] = None):
+    def __init__(self, db_config: Dict[str, Any], logger: Optional[logging.Logger] = None,
+                 session: Optional[requests.Session] = None):
         self.db_config = db_config
+        self.session = session or APISessionPool.get_session(self.BASE_URL)
         self.logger = logger or logging.getLogger(__name__)
 
     def get_product_count_from_db(self) -> int:
@@ -65,14 +74,8 @@ class ProductSearchAPIPage:
         Raises:
             AssertionError if count < 0 or DB fails
         """
-        conn = pymysql.connect(
-            host=self.db_config["host"],
-            user=self.db_config["user"],
-            password=self.db_config["password"],
-            database=self.db_config["database"],
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        try:
+        connect_config = {key: self.db_config[key] for key in ("host", "user", "password", "database")}
+        with DBConnectionPool.connection(connect_config, cursorclass=pymysql.cursors.DictCursor) as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT COUNT(*) AS cnt FROM products")
                 row = cur.fetchone()
@@ -81,8 +84,6 @@ class ProductSearchAPIPage:
                 assert count >= 0, f"Product count invalid: {count}"
                 self.logger.info(f"Product count in DB: {count}")
                 return count
-        finally:
-            conn.close()
 
     def send_search_with_empty_query(self) -> requests.Response:
         """
@@ -91,7 +92,7 @@ class ProductSearchAPIPage:
             requests.Response
         """
         params = {"query": ""}
-        resp = requests.get(self.PRODUCT_SEARCH_API, params=params, timeout=10)
+        resp = self.session.get(self.PRODUCT_SEARCH_API, params=params, timeout=10)
         self.logger.info(f"GET /api/products/search?query= response: {resp.status_code}")
         return resp
 
@@ -101,7 +102,7 @@ class ProductSearchAPIPage:
         Returns:
             requests.Response
         """
-        resp = requests.get(self.PRODUCT_SEARCH_API, timeout=10)
+        resp = self.session.get(self.PRODUCT_SEARCH_API, timeout=10)
         self.logger.info(f"GET /api/products/search (no query) response: {resp.status_code}")
         return resp
 
@@ -134,8 +135,10 @@ class ProductSearchAPIPage:
             elif expect_all_products:
                 if resp.status_code == 200 and (isinstance(json_body, list) or ("products" in json_body and isinstance(json_body["products"], list))):
                     products = json_body if isinstance(json_body, list) else json_body["products"]
-                    result["pass"] = len(products) >= 0
-                    result["message"] = f"Returned {len(products)} products"
+                    violations = ResponseSchemas.validate("GET /api/products/search", json_body)
+                    result["pass"] = not violations
+                    result["message"] = f"Returned {len(products)} products" if not violations else \
+                        f"Returned {len(products)} products with schema violations: {violations}"
                 elif resp.status_code == 200 and (json_body == [] or ("products" in json_body and json_body["products"] == [])):
                     result["pass"] = True
                     result["message"] = "Returned empty array as per business logic"
@@ -150,6 +153,58 @@ class ProductSearchAPIPage:
             result["message"] = f"Exception parsing/validating API response: {e}"
         return result
 
+    def iter_all_products(self, query: Optional[str] = "", page_size: int = 100, **paginator_options) -> ProductSearchPaginator:
+        """
+        Returns a lazy, prefetching paginator over /api/products/search (see ProductSearchPaginator).
+        """
+        return ProductSearchPaginator(self.session, self.PRODUCT_SEARCH_API, query=query, page_size=page_size,
+                                      **paginator_options)
+
+    def verify_all_products_via_pagination(self, expected_count: Optional[int] = None, query: Optional[str] = "",
+                                           page_size: int = 100, max_violations: int = 20) -> Dict[str, Any]:
+        """
+        Verifies that the search returns all N products by walking every page in bounded memory.
+        Each product is schema-checked as it is parsed while the next page is prefetched.
+        Args:
+            expected_count (int, optional): Expected number of products; defaults to the products table count.
+            query (str, optional): Search query ("" for all products).
+            page_size (int): Products per page.
+            max_violations (int): Cap on reported schema violations.
+        Returns:
+            dict: Validation results
+        """
+        result = {
+            "expected_count": expected_count,
+            "returned_count": 0,
+            "pages": 0,
+            "violations": [],
+            "pass": False,
+            "message": None
+        }
+        try:
+            if expected_count is None:
+                expected_count = self.get_product_count_from_db()
+                result["expected_count"] = expected_count
+            item_validator = ResponseSchemas.validator("product")
+            paginator = self.iter_all_products(query=query, page_size=page_size)
+            violation_count = 0
+            for index, product in enumerate(paginator):
+                violations = []
+                item_validator(product, f"$[{index}]", None, violations)
+                violation_count += len(violations)
+                if len(result["violations"]) < max_violations:
+                    result["violations"].extend(violations[:max_violations - len(result["violations"])])
+            result["returned_count"] = paginator.items_yielded
+            result["pages"] = paginator.pages_fetched
+            result["pass"] = violation_count == 0 and paginator.items_yielded == expected_count
+            result["message"] = (f"Returned {paginator.items_yielded}/{expected_count} products over "
+                                 f"{paginator.pages_fetched} pages with {violation_count} schema violations")
+        except Exception as e:
+            result["pass"] = False
+            result["message"] = f"Exception paginating/validating search results: {e}"
+        self.logger.info(f"Paginated product search: {result['message']}")
+        return result
+
     def run_tc_scrum96_009(self) -> Dict[str, Any]:
         """
         Executes the TC_SCRUM96_009 workflow:
@@ -182,15 +237,61 @@ class ProductSearchAPIPage:
 
             # Step 3: API GET without query param
             resp_no_query = self.send_search_without_query()
-            # Business logic: HTTP 400 with error, or all products (legacy)
-            if resp_no_query.status_code == 400:
-                api3_result = self.validate_api_response(resp_no_query, expect_error=True)
-            else:
-                api3_result = self.validate_api_response(resp_no_query, expect_all_products=True)
+            api3_result = self.validate_no_query_response(resp_no_query)
+            results["step_3_api_no_query"] = api3_result
+            assert api3_result["pass"], f"API GET without query param failed: {api3_result['message']}"
+
+            results["overall_pass"] = True
+        except Exception as e:
+            results["exception"] = f"Test flow failed: {str(e)}"
+        if ResponseCache.shared().enabled:
+            results["response_cache"] = ResponseCache.shared().stats()
+        return results
+
+    def validate_no_query_response(self, resp: requests.Response) -> Dict[str, Any]:
+        """
+        Validates the response of a search without query param.
+        Business logic: HTTP 400 with error, or all products (legacy).
+        """
+        if resp.status_code == 400:
+            return self.validate_api_response(resp, expect_error=True)
+        return self.validate_api_response(resp, expect_all_products=True)
+
+    def run_tc_scrum96_009_concurrent(self) -> Dict[str, Any]:
+        """
+        Same workflow and result structure as run_tc_scrum96_009, but the DB count and both
+        independent search requests are awaited concurrently via AsyncAPIPage.
+        Returns:
+            dict: Stepwise results and validation messages
+        """
+        results = {
+            "step_1_db_product_count": None,
+            "step_2_api_empty_query": None,
+            "step_3_api_no_query": None,
+            "overall_pass": False,
+            "exception": None
+        }
+        try:
+            page = AsyncAPIPage(self)
+            count, resp_empty_query, resp_no_query = AsyncAPIPage.run(AsyncAPIPage.gather(
+                page.get_product_count_from_db(),
+                page.send_search_with_empty_query(),
+                page.send_search_without_query()
+            ))
+            results["step_1_db_product_count"] = count
+            assert count >= 5, f"Products table contains less than 5 test products (found {count})"
+
+            api2_result = self.validate_api_response(resp_empty_query, expect_all_products=True)
+            results["step_2_api_empty_query"] = api2_result
+            assert api2_result["pass"], f"API GET with empty query failed: {api2_result['message']}"
+
+            api3_result = self.validate_no_query_response(resp_no_query)
             results["step_3_api_no_query"] = api3_result
             assert api3_result["pass"], f"API GET without query param failed: {api3_result['message']}"
 
             results["overall_pass"] = True
         except Exception as e:
             results["exception"] = f"Test flow failed: {str(e)}"
+        if ResponseCache.shared().enabled:
+            results["response_cache"] = ResponseCache.shared().stats()
         return results
@@ -0,0 +1,202 @@
+"""
+ProductSearchPaginator.py
+
+Executive Summary:
+------------------
+Lazy paginator over /api/products/search. Products are yielded one at a time from a generator, each page body is
+parsed incrementally from the response stream, and the next page is fetched in the background while the current one
+is being validated. Verifying that a search returns all N products on a large catalog therefore runs in bounded
+memory and overlaps network I/O with assertions.
+
+Detailed Analysis:
+------------------
+- Pages are requested with ``<page_param>=n&<size_param>=page_size`` (defaults ``page``/``pageSize``, 1-based).
+- The body may be a bare JSON array or an object with a ``products`` array; items are decoded one by one with
+  ``json.JSONDecoder.raw_decode`` over ``iter_content`` byte chunks decoded as UTF-8 (``codecs.iterdecode``), so only
+  one chunk plus one product is held at a time.
+- Iteration stops on a short or empty page, after ``X-Total-Pages`` pages when the header is sent, or at ``max_pages``
+  (default ``DEFAULT_MAX_PAGES``). A backend that ignores the pagination parameters is detected as well: a page with
+  more than ``page_size`` items is taken as the full result, and a page whose first item repeats the previous page's
+  first item (same ``id``) ends iteration without yielding the repeat.
+- Prefetch uses one background worker and a second pooled keep-alive connection.
+
+Implementation Guide:
+---------------------
+1. paginator = ProductSearchPaginator(page.session, page.PRODUCT_SEARCH_API, query="", page_size=200)
+2. for product in paginator: ...   (or ProductSearchAPIPage.verify_all_products_via_pagination())
+3. ``paginator.pages_fetched`` / ``paginator.items_yielded`` for reporting.
+
+Quality Assurance Report:
+-------------------------
+- Non-200 pages raise AssertionError with status and page number.
+- The background fetch is cancelled/closed when iteration stops early.
+
+Troubleshooting Guide:
+----------------------
+- Zero products from a non-empty catalog: check page parameter names against the backend contract.
+
+Future Considerations:
+----------------------
+- Cursor-based pagination (``nextCursor``) once the backend exposes it.
+"""
+
+import codecs
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional
+
+ARRAY_START = re.compile(r'^\s*\[|"products"\s*:\s*\[')
+
+
+def iter_json_array_items(chunks: Iterator[str]) -> Iterator[Any]:
+    """
+    Incrementally decodes the items of a top-level JSON array or of a "products" array from text chunks.
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buf, pos = "", 0
+
+    def fill() -> bool:
+        nonlocal buf, pos
+        for chunk in chunks:
+            if chunk:
+                buf, pos = buf[pos:] + chunk, 0
+                return True
+        return False
+
+    match = ARRAY_START.search(buf)
+    while match is None:
+        if not fill():
+            return
+        match = ARRAY_START.search(buf)
+    pos = match.end()
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            if not fill():
+                raise ValueError("Truncated JSON array in response body")
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if not fill():
+                raise
+            continue
+        if end == len(buf) and not isinstance(item, (dict, list, str)):
+            # A number/literal at the chunk boundary may continue in the next chunk.
+            if fill():
+                continue
+        pos = end
+        yield item
+
+
+class ProductSearchPaginator:
+    """
+    Generator-based, prefetching paginator over the product search endpoint.
+    """
+    CHUNK_SIZE = 64 * 1024
+    DEFAULT_MAX_PAGES = 10000
+
+    def __init__(self, session: Any, url: str, query: Optional[str] = "", page_size: int = 100,
+                 page_param: str = "page", size_param: str = "pageSize", start_page: int = 1,
+                 max_pages: Optional[int] = DEFAULT_MAX_PAGES, prefetch: bool = True, timeout: float = 30):
+        """
+        Args:
+            session: HTTP session (normally the page's pooled session).
+            url (str): Search endpoint URL.
+            query (str, optional): Search query; None omits the ``query`` param.
+            page_size (int): Products requested per page.
+            page_param (str) / size_param (str): Pagination parameter names.
+            start_page (int): First page number.
+            max_pages (int, optional): Hard stop (None disables it).
+            prefetch (bool): Fetch page n+1 while page n is consumed.
+        """
+        self.session = session
+        self.url = url
+        self.query = query
+        self.page_size = page_size
+        self.page_param = page_param
+        self.size_param = size_param
+        self.start_page = start_page
+        self.max_pages = max_pages
+        self.prefetch = prefetch
+        self.timeout = timeout
+        self.pages_fetched = 0
+        self.items_yielded = 0
+
+    def _params(self, page_number: int) -> Dict[str, Any]:
+        params = {self.page_param: page_number, self.size_param: self.page_size}
+        if self.query is not None:
+            params["query"] = self.query
+        return params
+
+    def _fetch(self, page_number: int):
+        response = self.session.get(self.url, params=self._params(page_number), stream=True, timeout=self.timeout)
+        assert response.status_code == 200, \
+            f"Search page {page_number} failed: HTTP {response.status_code}"
+        return response
+
+    def _last_page(self, response, page_number: int) -> Optional[int]:
+        total_pages = response.headers.get("X-Total-Pages") if response.headers else None
+        limits = [int(total_pages) + self.start_page - 1] if total_pages and str(total_pages).isdigit() else []
+        if self.max_pages is not None:
+            limits.append(self.start_page + self.max_pages - 1)
+        return min(limits) if limits else None
+
+    @staticmethod
+    def _item_key(item: Any) -> Any:
+        if isinstance(item, dict) and item.get("id") is not None:
+            return ("id", item["id"])
+        return ("item", json.dumps(item, sort_keys=True, default=str))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-prefetch") if self.prefetch else None
+        pending = None
+        previous_first = None
+        try:
+            page_number = self.start_page
+            response = self._fetch(page_number)
+            while True:
+                self.pages_fetched += 1
+                last_page = self._last_page(response, page_number)
+                more_possible = last_page is None or page_number < last_page
+                if executor is not None and more_possible:
+                    pending = executor.submit(self._fetch, page_number + 1)
+                count = 0
+                repeated = False
+                try:
+                    chunks = codecs.iterdecode(response.iter_content(chunk_size=self.CHUNK_SIZE), "utf-8")
+                    for item in iter_json_array_items(chunks):
+                        if count == 0:
+                            first = self._item_key(item)
+                            if first == previous_first:
+                                # The backend ignored the page parameter and sent the same page again.
+                                repeated = True
+                                break
+                            previous_first = first
+                        count += 1
+                        self.items_yielded += 1
+                        yield item
+                finally:
+                    response.close()
+                if repeated or not more_possible or count != self.page_size:
+                    return
+                page_number += 1
+                if pending is not None:
+                    response, pending = pending.result(), None
+                else:
+                    response = self._fetch(page_number)
+        finally:
+            if pending is not None:
+                if not pending.cancel():
+                    try:
+                        pending.result().close()
+                    except Exception:
+                        pass
+            if executor is not None:
+                executor.shutdown(wait=False)
@@ -1,7 +1,18 @@
 import requests
 import pymysql
 import re
-from typing import Dict, Any
+import threading
+from datetime import datetime
+from typing import Dict, Any, FrozenSet, List, Optional, Sequence, Tuple
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.DBSnapshot import DBSnapshot
+from auto_scripts.Pages.LogFollower import LogFollower
+from auto_scripts.Pages.LogPatternScanner import LogHit, LogPatternScanner
+from auto_scripts.Pages.LogReader import LogMark, LogReader
+from auto_scripts.Pages.LogSetScanner import LogSetHit, LogSetScanner
+from auto_scripts.Pages.ResponseCache import ResponseCache
+from auto_scripts.Pages.TestDataIsolation import CreatedDataLedger
 
 class ProductSpecialCharAndInjectionTestPage:
     """
@@ -50,20 +61,36 @@ class ProductSpecialCharAndInjectionTestPage:
     - Parameterize endpoints, DB, and log paths for multi-environment support.
     - Extend for multi-locale error validation and log parsing.
     - Integrate with CI/CD for full E2E coverage.
-    - Add retry logic and audit reporting.
+    - Add audit reporting (transient failures are retried by ResilienceLayer).
+    - Log checks read only lines appended since the test-start mark (shared LogReader), never the whole log.
+    - check_application_logs_for_injection_payloads() verifies many payloads in one mmap pass (LogPatternScanner).
+    - check_log_set_for_injection_detection() also covers rotated/compressed segments (log_config "log_glob").
     """
 
     PRODUCT_API_URL = "https://example-ecommerce.com/api/products"
     PRODUCT_SEARCH_API_URL = "https://example-ecommerce.com/api/products/search"
+    # Seconds to wait for the backend to log an injection detection after the API response.
+    LOG_WAIT_TIMEOUT = 10
 
-    def __init__(self, db_config: Dict[str, Any], log_config: Dict[str, Any]):
+    # Table catalog per (host, database), shared by all instances; refreshed before any "table missing" verdict.
+    _catalog_cache: Dict[Tuple[Any, Any], FrozenSet[str]] = {}
+    _catalog_lock = threading.Lock()
+
+    def __init__(self, db_config: Dict[str, Any], log_config: Dict[str, Any],
+                 session: Optional[requests.Session] = None):
         """
         Args:
             db_config (dict): Database config with keys host, user, password, database
-            log_config (dict): Log config with key log_file_path
+            log_config (dict): Log config with key log_file_path (optional log_glob, default "<log_file_path>*")
+            session (requests.Session, optional): HTTP session; defaults to the shared APISessionPool session
         """
         self.db_config = db_config
+        self.session = session or APISessionPool.get_session(self.PRODUCT_API_URL)
         self.log_file_path = log_config.get("log_file_path")
+        self.log_glob = log_config.get("log_glob") or (f"{self.log_file_path}*" if self.log_file_path else None)
+        self.created_product: Optional[Dict[str, Any]] = None
+        self.log_mark: Optional[LogMark] = None
+        self.mark_log_start()
 
     def insert_product_with_special_chars(self, product_data: Dict[str, Any]) -> requests.Response:
         """
@@ -74,7 +101,22 @@ class ProductSpecialCharAndInjectionTestPage:
             requests.Response: API response
         """
         headers = {"Content-Type": "application/json"}
-        response = requests.post(self.PRODUCT_API_URL, json=product_data, headers=headers, timeout=10)
+        # Product names are not unique: remember existing ids so only the new row is tracked if no id comes back.
+        existing_ids = CreatedDataLedger.active_keys_where("products", "name", product_data["name"])
+        response = self.session.post(self.PRODUCT_API_URL, json=product_data, headers=headers, timeout=10)
+        if response.status_code in (200, 201):
+            try:
+                body = response.json() if response.content else {}
+            except ValueError:
+                body = {}
+            product_id = body.get("id", body.get("productId")) if isinstance(body, dict) else None
+            if product_id is not None:
+                CreatedDataLedger.track_active("products", "id", product_id)
+            else:
+                created_ids = CreatedDataLedger.track_active_created("products", "name", product_data["name"],
+                                                                     existing_ids)
+                product_id = created_ids[0] if len(created_ids) == 1 else None
+            self.created_product = {**product_data, "id": product_id}
         return response
 
     def search_product_via_api(self, search_query: str) -> requests.Response:
@@ -86,7 +128,7 @@ class ProductSpecialCharAndInjectionTestPage:
             requests.Response: API response
         """
         params = {"q": search_query}
-        response = requests.get(self.PRODUCT_SEARCH_API_URL, params=params, timeout=10)
+        response = self.session.get(self.PRODUCT_SEARCH_API_URL, params=params, timeout=10)
         return response
 
     def send_sql_injection_attempt(self, injection_string: str) -> requests.Response:
@@ -98,51 +140,150 @@ class ProductSpecialCharAndInjectionTestPage:
             requests.Response: API response
         """
         params = {"q": injection_string}
-        response = requests.get(self.PRODUCT_SEARCH_API_URL, params=params, timeout=10)
+        response = self.session.get(self.PRODUCT_SEARCH_API_URL, params=params, timeout=10)
         return response
 
-    def verify_db_integrity_for_products(self) -> bool:
+    def _connect_config(self) -> Dict[str, Any]:
+        return {key: self.db_config[key] for key in ("host", "user", "password", "database")}
+
+    def table_catalog(self, refresh: bool = False) -> FrozenSet[str]:
+        """
+        Returns the set of table names in the test database, cached process-wide after the first query.
+        """
+        key = (self.db_config["host"], self.db_config["database"])
+        with self._catalog_lock:
+            if not refresh and key in self._catalog_cache:
+                return self._catalog_cache[key]
+        with DBConnectionPool.connection(self._connect_config()) as connection:
+            with connection.cursor() as cursor:
+                cursor.execute("SHOW TABLES")
+                tables = frozenset(row[0] for row in cursor.fetchall())
+        with self._catalog_lock:
+            self._catalog_cache[key] = tables
+        return tables
+
+    def verify_db_integrity_for_products(self, product: Optional[Dict[str, Any]] = None) -> bool:
         """
         Verifies integrity of products table in DB (no dropped/altered table, special char records intact).
+        Looks up the product created in step 1 by primary key (by name if the API returned no id), so the
+        check is an index lookup regardless of catalog size.
+        Args:
+            product (dict, optional): Expected product with name, description and id; defaults to the product
+                created by insert_product_with_special_chars()
         Returns:
             bool: True if integrity passes, else raises AssertionError
         """
-        connection = pymysql.connect(
-            host=self.db_config["host"],
-            user=self.db_config["user"],
-            password=self.db_config["password"],
-            database=self.db_config["database"],
-            cursorclass=pymysql.cursors.DictCursor
-        )
+        product = product or self.created_product
+        assert product, "No inserted product to verify; run insert_product_with_special_chars() first."
+        if "products" not in self.table_catalog():
+            # The cached catalog may predate the table; only a fresh catalog can prove it missing.
+            assert "products" in self.table_catalog(refresh=True), \
+                "Products table does not exist (possible injection damage)."
+        if product.get("id") is not None:
+            query, key = "SELECT id, name, description, price FROM products WHERE id = %s", product["id"]
+        else:
+            query, key = "SELECT id, name, description, price FROM products WHERE name = %s", product["name"]
         try:
-            with connection.cursor() as cursor:
-                cursor.execute("SHOW TABLES LIKE 'products'")
-                table_exists = cursor.fetchone()
-                assert table_exists, "Products table does not exist (possible injection damage)."
-                cursor.execute("SELECT * FROM products WHERE name LIKE '%@%' OR description LIKE '%<script>%' LIMIT 1")
-                record = cursor.fetchone()
-                assert record, "Product with special characters not found in DB."
-        finally:
-            connection.close()
+            with DBConnectionPool.connection(self._connect_config(), cursorclass=pymysql.cursors.DictCursor) as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(query, (key,))
+                    record = cursor.fetchone()
+        except Exception:
+            assert "products" in self.table_catalog(refresh=True), \
+                "Products table does not exist (possible injection damage)."
+            raise
+        assert record, f"Inserted product {key!r} not found in DB."
+        assert record["name"] == product["name"], \
+            f"Product name altered in DB: expected {product['name']!r}, got {record['name']!r}"
+        if "description" in product:
+            assert record["description"] == product["description"], \
+                f"Product description altered in DB: expected {product['description']!r}, got {record['description']!r}"
         return True
 
+    def products_snapshot(self) -> DBSnapshot:
+        """
+        Returns a DBSnapshot watching the products table, used to prove that this test's insert is the only change
+        to the table.
+        """
+        return DBSnapshot(self.db_config, {"products": ["name", "description", "price"]})
+
+    def mark_log_start(self) -> Optional[LogMark]:
+        """
+        Marks the current end of the application log; log checks only scan lines appended after it.
+        """
+        if self.log_file_path:
+            self.log_mark = LogReader.for_path(self.log_file_path).mark()
+        return self.log_mark
+
     def check_application_logs_for_injection_detection(self, injection_string: str) -> bool:
         """
-        Checks application logs for SQL injection detection and logging.
+        Waits (up to LOG_WAIT_TIMEOUT) for an application log line appended since the test-start mark that reports
+        SQL injection detection for the payload.
         Args:
             injection_string (str): SQL injection payload
         Returns:
             bool: True if detection/logging found, else raises AssertionError
         """
+        pattern = re.compile(r"SQL injection detected.*" + re.escape(injection_string), re.IGNORECASE)
         try:
-            with open(self.log_file_path, "r", encoding="utf-8") as log_file:
-                logs = log_file.read()
-                detected = re.search(r"SQL injection detected.*" + re.escape(injection_string), logs, re.IGNORECASE)
-                assert detected, f"SQL injection not detected/logged for payload: {injection_string}"
+            detected = LogFollower.for_path(self.log_file_path).wait_for(
+                lambda line: pattern.search(line) is not None, timeout=self.LOG_WAIT_TIMEOUT, since=self.log_mark,
+                name="SQL injection detection logged"
+            )
+            assert detected, f"SQL injection not detected/logged for payload: {injection_string}"
         except Exception as e:
             raise AssertionError(f"Error reading logs: {str(e)}")
         return True
 
+    def check_application_logs_for_injection_payloads(self, injection_strings: Sequence[str]) -> Dict[str, LogHit]:
+        """
+        Checks application logs for SQL injection detection of every payload in a single pass.
+        Args:
+            injection_strings (list[str]): SQL injection payloads
+        Returns:
+            dict: {payload: first LogHit whose line reports "SQL injection detected" before the payload}
+        Raises:
+            AssertionError: If any payload was not detected/logged
+        """
+        def detected(hit: LogHit) -> bool:
+            prefix_end = hit.offset - hit.line_offset
+            return "sql injection detected" in hit.line.encode("utf-8")[:prefix_end].decode("utf-8", "replace").lower()
+
+        try:
+            hits = LogPatternScanner(self.log_file_path).scan(
+                injection_strings, since=self.log_mark, case_insensitive=True, accept=detected
+            )
+        except Exception as e:
+            raise AssertionError(f"Error reading logs: {str(e)}")
+        missing: List[str] = LogPatternScanner.missing(hits)
+        assert not missing, f"SQL injection not detected/logged for payloads: {missing}"
+        return {payload: found[0] for payload, found in hits.items()}
+
+    def check_log_set_for_injection_detection(self, injection_strings: Sequence[str],
+                                              start: Optional[datetime] = None,
+                                              end: Optional[datetime] = None) -> Dict[str, LogSetHit]:
+        """
+        Checks the application log set (active, rotated and compressed segments) for SQL injection detection of
+        every payload.
+        Args:
+            injection_strings (list[str]): SQL injection payloads
+            start (datetime, optional): Ignore segments and lines before this time
+            end (datetime, optional): Ignore segments and lines after this time
+        Returns:
+            dict: {payload: earliest LogSetHit}
+        Raises:
+            AssertionError: If any payload was not detected/logged
+        """
+        try:
+            hits = LogSetScanner(self.log_glob).scan(
+                injection_strings, start=start, end=end, case_insensitive=True, required=["SQL injection detected"]
+            )
+        except Exception as e:
+            raise AssertionError(f"Error reading logs: {str(e)}")
+        missing = LogSetScanner.missing(hits)
+        assert not missing, f"SQL injection not detected/logged for payloads: {missing}"
+        return {payload: found[0] for payload, found in hits.items()}
+
     def run_tc_scrum96_010(self, product_data: Dict[str, Any], injection_string: str) -> Dict[str, Any]:
         """
         End-to-end execution for TC_SCRUM96_010.
@@ -153,6 +294,12 @@ class ProductSpecialCharAndInjectionTestPage:
             dict: Stepwise results and validation messages
         """
         results = {}
+        self.mark_log_start()
+        try:
+            before_test = self.products_snapshot().capture()
+        except Exception as e:
+            before_test = None
+            results["step_4_db_snapshot_error"] = str(e)
         # Step 1: Insert product with special chars
         try:
             resp_insert = self.insert_product_with_special_chars(product_data)
@@ -171,7 +318,7 @@ class ProductSpecialCharAndInjectionTestPage:
         except Exception as e:
             results["step_2_api_search_pass"] = False
             results["step_2_api_search_error"] = str(e)
-        # Step 3: SQL injection attempt
+        # Step 3: SQL injection attempt (products table fingerprinted before step 1, diffed in step 4)
         try:
             resp_injection = self.send_sql_injection_attempt(injection_string)
             results["step_3_injection_response_status_code"] = resp_injection.status_code
@@ -184,6 +331,14 @@ class ProductSpecialCharAndInjectionTestPage:
         # Step 4: DB integrity check
         try:
             results["step_4_db_integrity_pass"] = self.verify_db_integrity_for_products()
+            assert before_test is not None, \
+                f"Products snapshot unavailable: {results.get('step_4_db_snapshot_error')}"
+            own_id = (self.created_product or {}).get("id")
+            assert own_id is not None, "Inserted product id unknown; cannot verify the products table."
+            # The whole table is diffed: this test's insert is the only change allowed.
+            diff = self.products_snapshot().diff(before_test)
+            results["step_4_db_snapshot_diff"] = {t: r["counts"] for t, r in diff.items()}
+            DBSnapshot.assert_unchanged(diff, allow_keys={"products": {"inserted": [own_id]}})
         except Exception as e:
             results["step_4_db_integrity_pass"] = False
             results["step_4_db_integrity_error"] = str(e)
@@ -200,4 +355,6 @@ class ProductSpecialCharAndInjectionTestPage:
             results.get("step_4_db_integrity_pass"),
             results.get("step_5_log_detection_pass")
         ])
+        if ResponseCache.shared().enabled:
+            results["response_cache"] = ResponseCache.shared().stats()
         return results
@@ -18,9 +18,10 @@ QA Report:
 - Database validation stub for integration
 """
 
-import requests
 from typing import Dict, Any
 import jwt
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.ResponseSchemas import ResponseSchemas
 
 class ProfileAPIValidationPage:
     """
@@ -33,16 +34,18 @@ class ProfileAPIValidationPage:
     BASE_URL = "https://example-ecommerce.com"
     PROFILE_ENDPOINT = "/api/users/profile"
 
-    def __init__(self, jwt_utils, registration_api, db_client=None):
+    def __init__(self, jwt_utils, registration_api, db_client=None, session=None):
         """
         Args:
             jwt_utils: Instance of JWTUtils for token operations
             registration_api: Instance of UserRegistrationAPIPage for registration/login
             db_client: Optional database client for validation
+            session: Optional requests.Session; defaults to the shared APISessionPool session
         """
         self.jwt_utils = jwt_utils
         self.registration_api = registration_api
         self.db_client = db_client
+        self.session = session or APISessionPool.get_session(self.BASE_URL)
 
     def register_and_login_user(self, user_data: Dict[str, Any]) -> str:
         """
@@ -75,7 +78,7 @@ class ProfileAPIValidationPage:
             Exception if API call fails
         """
         headers = {"Authorization": f"Bearer {jwt_token}"}
-        response = requests.get(self.BASE_URL + self.PROFILE_ENDPOINT, headers=headers)
+        response = self.session.get(self.BASE_URL + self.PROFILE_ENDPOINT, headers=headers)
         assert response.status_code == 200, f"Profile API failed: {response.text}"
         profile_data = response.json()
         return profile_data
@@ -90,10 +93,8 @@ class ProfileAPIValidationPage:
             AssertionError if validation fails
         """
         required_fields = ["userId", "username", "email", "firstName", "lastName", "registrationDate", "accountStatus"]
-        for field in required_fields:
-            assert field in profile_data, f"Missing field: {field}"
-            assert profile_data[field] == expected_data[field], f"Field {field} mismatch: {profile_data[field]} != {expected_data[field]}"
-        assert "password" not in profile_data, "Password should not be present in profile response"
+        expected = {field: expected_data[field] for field in required_fields}
+        ResponseSchemas.assert_valid("GET /api/users/profile", profile_data, expected=expected)
 
     def fetch_db_user(self, username: str) -> Dict[str, Any]:
         """
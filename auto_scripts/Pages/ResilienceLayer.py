@@ -0,0 +1,301 @@
+"""
+ResilienceLayer.py
+
+Executive Summary:
+------------------
+Retry, backoff and circuit-breaker layer shared by the API and DB PageClasses. A single transient 5xx, connection
+reset or DB hiccup is retried with jittered exponential backoff inside a bounded time budget, and a backend that keeps
+failing trips a per-host circuit breaker so every remaining call fails in milliseconds instead of waiting out its
+10-30 second timeout.
+
+Detailed Analysis:
+------------------
+- RetryPolicy: attempts, backoff base/cap, total retry budget, retryable statuses/exceptions, breaker thresholds.
+- Idempotency-aware: only GET/HEAD/OPTIONS/PUT/DELETE (or requests carrying an ``Idempotency-Key`` header) are
+  retried unless the policy sets ``retry_non_idempotent``.
+- Per-endpoint policies: ``add_policy(pattern, policy, methods)`` matches a regex against the URL path.
+- CircuitBreaker: closed -> open after ``failure_threshold`` consecutive failures -> half-open after ``reset_timeout``
+  (one trial call) -> closed on success. Breakers are keyed by backend plus the policy's breaker settings
+  (``failure_threshold``, ``reset_timeout``), so endpoints with different thresholds on one host do not share state.
+- Exceptions outside ``retry_exceptions`` (bugs, assertion errors) propagate without counting against the backend;
+  a half-open trial they interrupt is released so the next call can try again.
+- A failure that opens the breaker (including a failed half-open trial) ends the retries: the caller gets that
+  failure's exception or response, not a CircuitOpenError.
+- Discarded retryable responses (e.g. a 503 that is retried) are closed so they return their pooled connection.
+- Pooled sessions from APISessionPool route every request through ``ResilienceLayer.shared()``; DB code wraps
+  connects/queries with ``ResilienceLayer.shared().call(...)``.
+
+Implementation Guide:
+---------------------
+1. Optional tuning: ``ResilienceLayer.shared().add_policy(r"^/api/products/search", RetryPolicy(max_attempts=5))``.
+2. API PageClasses need no change; their pooled sessions are already resilient.
+3. DB calls: ``ResilienceLayer.shared().call(host, pymysql.connect, retry_exceptions=(pymysql.err.OperationalError,), ...)``.
+
+Quality Assurance Report:
+-------------------------
+- After the final attempt a retryable HTTP status is returned as-is, so existing status assertions report it.
+- CircuitOpenError is raised without touching the network while the breaker is open.
+
+Troubleshooting Guide:
+----------------------
+- CircuitOpenError early in a run: the backend failed ``failure_threshold`` times in a row; check its health.
+- POST not retried: by design; add an ``Idempotency-Key`` header or a policy with ``retry_non_idempotent=True``.
+
+Future Considerations:
+----------------------
+- Honour ``Retry-After`` headers on 429/503 responses.
+"""
+
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised when a call is rejected because the circuit breaker for its backend is open.
+    """
+
+
+class RetryPolicy:
+    """
+    Retry and circuit-breaker settings for one endpoint (or the default for all endpoints).
+    """
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.2, max_delay: float = 2.0,
+                 total_budget: float = 10.0, retry_statuses: Tuple[int, ...] = (502, 503, 504),
+                 retry_exceptions: Tuple[type, ...] = (OSError,), retry_non_idempotent: bool = False,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            max_attempts (int): Total attempts including the first call.
+            base_delay (float): Backoff base in seconds; attempt n sleeps uniform(0, min(max_delay, base_delay * 2**n)).
+            max_delay (float): Backoff cap in seconds.
+            total_budget (float): Maximum seconds spent on one call including all retries.
+            retry_statuses (tuple): HTTP statuses that count as transient failures.
+            retry_exceptions (tuple): Exception types that count as transient failures (requests errors are OSError).
+            retry_non_idempotent (bool): Retry POST/PATCH as well.
+            failure_threshold (int): Consecutive failures that open the circuit breaker.
+            reset_timeout (float): Seconds the breaker stays open before allowing a trial call.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.total_budget = total_budget
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.retry_non_idempotent = retry_non_idempotent
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the full-jitter backoff delay before retry number ``attempt`` (0-based).
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def is_retryable_method(self, method: str, headers: Optional[Dict[str, str]] = None) -> bool:
+        if self.retry_non_idempotent or method.upper() in self.IDEMPOTENT_METHODS:
+            return True
+        return any(key.lower() == "idempotency-key" for key in (headers or {}))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (closed / open / half-open).
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """
+        Returns True if a call may proceed; in half-open state only one trial call is let through.
+        """
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        Ends a call that neither succeeded nor failed against the backend; a half-open trial may be retried.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class ResilienceLayer:
+    """
+    Applies per-endpoint RetryPolicies and per-backend CircuitBreakers to HTTP requests and arbitrary calls.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, default_policy: Optional[RetryPolicy] = None):
+        self.default_policy = default_policy or RetryPolicy()
+        self._policies: List[Tuple[Any, Optional[frozenset], RetryPolicy]] = []
+        self._breakers: Dict[Tuple[str, int, float], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "ResilienceLayer":
+        """
+        Returns the process-wide layer used by APISessionPool sessions.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def add_policy(self, path_pattern: str, policy: RetryPolicy, methods: Optional[List[str]] = None) -> None:
+        """
+        Registers a policy for URL paths matching ``path_pattern``; the first registered match wins.
+        Args:
+            path_pattern (str): Regex searched against the URL path, e.g. r"^/api/cart".
+            policy (RetryPolicy): Policy to apply.
+            methods (list, optional): Restrict to these HTTP methods.
+        """
+        method_set = frozenset(m.upper() for m in methods) if methods else None
+        with self._lock:
+            self._policies.append((re.compile(path_pattern), method_set, policy))
+
+    def policy_for(self, method: str, url: str) -> RetryPolicy:
+        path = urlsplit(url).path
+        for pattern, methods, policy in self._policies:
+            if (methods is None or method.upper() in methods) and pattern.search(path):
+                return policy
+        return self.default_policy
+
+    def breaker_for(self, key: str, policy: RetryPolicy) -> CircuitBreaker:
+        """
+        Returns the breaker for backend ``key`` with ``policy``'s thresholds.
+        """
+        breaker_key = (key, policy.failure_threshold, policy.reset_timeout)
+        with self._lock:
+            breaker = self._breakers.get(breaker_key)
+            if breaker is None:
+                breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+                self._breakers[breaker_key] = breaker
+            return breaker
+
+    def reset(self) -> None:
+        """
+        Closes every circuit breaker (e.g. between test sessions).
+        """
+        with self._lock:
+            self._breakers.clear()
+
+    @staticmethod
+    def _stop_retrying(breaker: CircuitBreaker, deadline: float) -> bool:
+        # Once a failure (re-)opens the breaker, another attempt would only raise CircuitOpenError and hide it.
+        return time.monotonic() >= deadline or breaker.state == CircuitBreaker.OPEN
+
+    def _run(self, key: str, policy: RetryPolicy, attempt_call: Callable[[Optional[float]], Any],
+             is_failure: Callable[[Any], bool], retryable: bool) -> Any:
+        breaker = self.breaker_for(key, policy)
+        deadline = time.monotonic() + policy.total_budget
+        attempts = policy.max_attempts if retryable else 1
+        for attempt in range(attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for '{key}' after {breaker.failures} consecutive failures")
+            remaining = deadline - time.monotonic()
+            last_attempt = attempt == attempts - 1
+            try:
+                result = attempt_call(remaining)
+            except policy.retry_exceptions:
+                breaker.record_failure()
+                if last_attempt or self._stop_retrying(breaker, deadline):
+                    raise
+            except BaseException:
+                breaker.release_trial()
+                raise
+            else:
+                if not is_failure(result):
+                    breaker.record_success()
+                    return result
+                breaker.record_failure()
+                if last_attempt or self._stop_retrying(breaker, deadline):
+                    return result
+                close = getattr(result, "close", None)
+                if close is not None:
+                    close()
+            delay = min(policy.backoff(attempt), max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def execute(self, method: str, url: str, send: Callable[[Optional[float]], Any],
+                headers: Optional[Dict[str, str]] = None) -> Any:
+        """
+        Sends an HTTP request through the policy for (method, url) and the breaker of its host.
+        Args:
+            method (str): HTTP method.
+            url (str): Full request URL.
+            send (callable): send(remaining_budget_seconds) -> response with ``status_code``.
+            headers (dict, optional): Request headers (used for Idempotency-Key detection).
+        Returns:
+            Response of the last attempt.
+        """
+        policy = self.policy_for(method, url)
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}".lower()
+        return self._run(key, policy, send,
+                         is_failure=lambda resp: resp.status_code in policy.retry_statuses,
+                         retryable=policy.is_retryable_method(method, headers))
+
+    def call(self, key: str, func: Callable[..., Any], *args, idempotent: bool = True,
+             policy: Optional[RetryPolicy] = None, retry_exceptions: Optional[Tuple[type, ...]] = None,
+             **kwargs) -> Any:
+        """
+        Runs ``func(*args, **kwargs)`` with retries and the breaker for ``key`` (e.g. a DB host).
+        Args:
+            key (str): Breaker key, e.g. "mysql://db-host".
+            func (callable): Call to protect.
+            idempotent (bool): If False, the call is attempted once (the breaker still applies).
+            policy (RetryPolicy, optional): Overrides the default policy.
+            retry_exceptions (tuple, optional): Overrides the policy's transient exception types.
+        Returns:
+            Result of ``func``.
+        """
+        policy = policy or self.default_policy
+        if retry_exceptions is not None:
+            policy = RetryPolicy(**{**vars(policy), "retry_exceptions": retry_exceptions})
+        return self._run(key, policy, lambda remaining: func(*args, **kwargs),
+                         is_failure=lambda result: False, retryable=idempotent)
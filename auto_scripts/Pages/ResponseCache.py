@@ -0,0 +1,191 @@
+"""
+ResponseCache.py
+
+Executive Summary:
+------------------
+Opt-in, run-scoped cache for idempotent API reads. Pooled sessions from APISessionPool answer repeated identical GETs
+(same URL, query parameters and auth principal) from memory, so verification-heavy flows such as repeated product
+searches or profile fetches stop paying a backend round trip for data that cannot have changed.
+
+Detailed Analysis:
+------------------
+- Key: method-less URL path, normalized (sorted) query from URL and ``params``, and a digest of the Authorization header.
+- Bounds: entries expire after ``ttl`` seconds; the least recently used entry is evicted beyond ``max_entries``.
+- Invalidation: a POST/PUT/PATCH/DELETE drops every cached entry on the same host whose path is the mutated path,
+  below it, or above it (POST /api/products invalidates /api/products/search; POST /api/cart/items invalidates /api/cart).
+- Only HTTP 200 responses are cached; each hit returns a copy of the stored response.
+- Counters (hits, misses, stores, evictions, invalidations) are exposed via ``stats()`` for run reports.
+
+Implementation Guide:
+---------------------
+1. Disabled by default. Enable for a run: ``with ResponseCache.shared().scope(ttl=60): ...``
+   or ``ResponseCache.shared().enable()`` in a session fixture.
+2. Orchestrators add ``ResponseCache.shared().stats()`` to their results when the cache is enabled.
+
+Quality Assurance Report:
+-------------------------
+- Different principals never share entries; the raw token is not stored, only its digest.
+- Thread-safe; all operations run under one lock.
+
+Troubleshooting Guide:
+----------------------
+- Stale read in a test: the backend changed data out of band; shorten ``ttl`` or call ``clear()``.
+
+Future Considerations:
+----------------------
+- Honour Cache-Control / ETag revalidation.
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of GET responses keyed by URL, params and auth principal.
+    """
+    MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 256):
+        """
+        Args:
+            ttl (float): Seconds a cached response stays valid.
+            max_entries (int): Maximum number of cached responses (LRU eviction).
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = False
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = self._empty_counters()
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    @classmethod
+    def shared(cls) -> "ResponseCache":
+        """
+        Returns the process-wide cache consulted by APISessionPool sessions.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def enable(self, ttl: Optional[float] = None, max_entries: Optional[int] = None) -> None:
+        with self._lock:
+            if ttl is not None:
+                self.ttl = ttl
+            if max_entries is not None:
+                self.max_entries = max_entries
+            self.enabled = True
+
+    def disable(self) -> None:
+        with self._lock:
+            self.enabled = False
+            self._entries.clear()
+
+    def clear(self) -> None:
+        """
+        Drops all entries and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._counters = self._empty_counters()
+
+    @contextmanager
+    def scope(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Enables a fresh cache for the duration of a ``with`` block and disables it afterwards.
+        """
+        self.clear()
+        self.enable(ttl, max_entries)
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    @staticmethod
+    def key_for(url: str, params: Any = None, headers: Optional[Dict[str, str]] = None) -> Tuple:
+        """
+        Builds the cache key for a GET.
+        Args:
+            url (str): Request URL (may carry a query string).
+            params: ``params`` as passed to requests (dict, list of pairs or None).
+            headers (dict, optional): Request headers; the Authorization value identifies the principal.
+        """
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if isinstance(params, dict):
+            params = params.items()
+        for name, value in params or ():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            query.extend((str(name), "" if v is None else str(v)) for v in values)
+        authorization = next((v for k, v in (headers or {}).items() if k.lower() == "authorization"), "")
+        principal = hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:16] if authorization else ""
+        return (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", tuple(sorted(query)), principal)
+
+    def get(self, key: Tuple) -> Any:
+        """
+        Returns a copy of the cached response for ``key`` or None (counted as hit/miss).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return copy.copy(entry[1])
+
+    def put(self, key: Tuple, response: Any) -> None:
+        if getattr(response, "status_code", None) != 200:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            self._counters["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, url: str) -> int:
+        """
+        Drops entries on the same host whose path is the mutated path, below it or above it.
+        Returns:
+            int: Number of entries removed.
+        """
+        parts = urlsplit(url)
+        netloc = parts.netloc.lower()
+        path = parts.path.rstrip("/") or "/"
+
+        def related(cached_path: str) -> bool:
+            shorter, longer = sorted((cached_path, path), key=len)
+            return longer == shorter or longer.startswith(shorter.rstrip("/") + "/")
+
+        with self._lock:
+            stale = [key for key in self._entries if key[1] == netloc and related(key[2])]
+            for key in stale:
+                del self._entries[key]
+            self._counters["invalidations"] += len(stale)
+        return len(stale)
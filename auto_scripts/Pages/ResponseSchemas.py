@@ -0,0 +1,232 @@
+"""
+ResponseSchemas.py
+
+Executive Summary:
+------------------
+Declarative response schemas for the shop API endpoints, compiled once into validator functions. A validator checks a
+response body in one pass and returns every violation (missing field, wrong type, forbidden field, unexpected value)
+instead of stopping at the first assert, and a batch mode validates large list responses such as product search
+results with the per-item checks hoisted out of the loop.
+
+Detailed Analysis:
+------------------
+- Schema keywords: ``type`` (str or list), ``required``, ``properties``, ``forbidden``, ``const``, ``enum``, ``items``.
+- ``expected`` values passed at call time are compared for equality (e.g. echoed registration fields).
+- Compilation turns a schema into nested closures with precomputed field tables; compiled validators are cached per
+  endpoint, so validation cost stays flat across thousands of calls.
+- Violations are ``"<path>: <message>"`` strings, e.g. ``"$.products[3].price: missing required field"``.
+
+Implementation Guide:
+---------------------
+1. ``ResponseSchemas.assert_valid("POST /api/users/register", body, expected={...})`` raises one AssertionError
+   listing every violation.
+2. ``ResponseSchemas.validate(...)`` returns the violation list without raising.
+3. ``ResponseSchemas.validate_many("product", products)`` batch-validates list items -> {index: [violations]}.
+4. Register new endpoints in ``ResponseSchemas.SCHEMAS`` or via ``ResponseSchemas.register(name, schema)``.
+
+Quality Assurance Report:
+-------------------------
+- bool is never accepted as integer/number; int is accepted as number.
+- Unknown schema keywords raise ValueError at compile time, not at validation time.
+
+Troubleshooting Guide:
+----------------------
+- "no schema registered": check the endpoint key format "<METHOD> <path>".
+
+Future Considerations:
+----------------------
+- Load schemas from the backend's OpenAPI document.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+Validator = Callable[[Any, str, Optional[Dict[str, Any]], List[str]], None]
+
+# Presence checks only, as the search pages always asserted: values are not type-checked, so a null description or
+# a price serialized as a decimal string still passes.
+PRODUCT_SCHEMA = {
+    "type": "object",
+    "required": ["id", "name", "price", "description", "category", "imageUrl"],
+}
+
+USER_PROFILE_SCHEMA = {
+    "type": "object",
+    "required": ["userId", "username", "email", "firstName", "lastName", "registrationDate", "accountStatus"],
+    "properties": {
+        "username": {"type": "string"},
+        "email": {"type": "string"},
+    },
+    "forbidden": ["password"],
+}
+
+
+class ResponseSchemas:
+    """
+    Registry of endpoint response schemas and their compiled validators.
+    """
+    TYPES = {
+        "string": (str,),
+        "integer": (int,),
+        "number": (int, float),
+        "boolean": (bool,),
+        "object": (dict,),
+        "array": (list,),
+        "null": (type(None),),
+    }
+    KEYWORDS = {"type", "required", "properties", "forbidden", "const", "enum", "items"}
+
+    SCHEMAS: Dict[str, Dict[str, Any]] = {
+        "POST /api/users/register": {
+            "type": "object",
+            "required": ["userId", "username", "email", "firstName", "lastName", "registrationTimestamp", "accountStatus"],
+            "properties": {"accountStatus": {"const": "ACTIVE"}},
+            "forbidden": ["password"],
+        },
+        "GET /api/users/profile": USER_PROFILE_SCHEMA,
+        "POST /api/products": {
+            "type": "object",
+            "required": ["name", "description", "price"],
+        },
+        "GET /api/products/search": {
+            "type": ["object", "array"],
+            "properties": {"products": {"type": "array", "items": {"type": "object"}}},
+            "items": {"type": "object"},
+        },
+        "product": PRODUCT_SCHEMA,
+    }
+
+    _compiled: Dict[str, Validator] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, name: str, schema: Dict[str, Any]) -> None:
+        with cls._lock:
+            cls.SCHEMAS[name] = schema
+            cls._compiled.pop(name, None)
+
+    @classmethod
+    def compile(cls, schema: Dict[str, Any]) -> Validator:
+        """
+        Compiles a schema into validator(value, path, expected, violations) that appends violations in place.
+        """
+        unknown = set(schema) - cls.KEYWORDS
+        if unknown:
+            raise ValueError(f"Unknown schema keywords: {sorted(unknown)}")
+        checks: List[Validator] = []
+
+        if "type" in schema:
+            names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            allowed = tuple(t for name in names for t in cls.TYPES[name])
+            allows_bool = "boolean" in names
+            label = " or ".join(names)
+
+            def check_type(value, path, expected, violations):
+                if not isinstance(value, allowed) or (isinstance(value, bool) and not allows_bool):
+                    violations.append(f"{path}: expected {label}, got {type(value).__name__}")
+                    return False
+                return True
+        else:
+            check_type = None
+
+        if "const" in schema:
+            const = schema["const"]
+
+            def check_const(value, path, expected, violations):
+                if value != const:
+                    violations.append(f"{path}: expected {const!r}, got {value!r}")
+            checks.append(check_const)
+
+        if "enum" in schema:
+            enum = list(schema["enum"])
+
+            def check_enum(value, path, expected, violations):
+                if value not in enum:
+                    violations.append(f"{path}: {value!r} not one of {enum!r}")
+            checks.append(check_enum)
+
+        required = tuple(schema.get("required", ()))
+        forbidden = tuple(schema.get("forbidden", ()))
+        properties = tuple((name, cls.compile(sub)) for name, sub in schema.get("properties", {}).items())
+        if required or forbidden or properties:
+            def check_object(value, path, expected, violations):
+                if not isinstance(value, dict):
+                    return
+                for name in required:
+                    if name not in value:
+                        violations.append(f"{path}.{name}: missing required field")
+                for name in forbidden:
+                    if name in value:
+                        violations.append(f"{path}.{name}: field must not be present")
+                for name, validator in properties:
+                    if name in value:
+                        validator(value[name], f"{path}.{name}", None, violations)
+                if expected:
+                    for name, want in expected.items():
+                        if name in value and value[name] != want:
+                            violations.append(f"{path}.{name}: expected {want!r}, got {value[name]!r}")
+            checks.append(check_object)
+
+        if "items" in schema:
+            item_validator = cls.compile(schema["items"])
+
+            def check_items(value, path, expected, violations):
+                if isinstance(value, list):
+                    for index, item in enumerate(value):
+                        item_validator(item, f"{path}[{index}]", None, violations)
+            checks.append(check_items)
+
+        checks = tuple(checks)
+
+        def validator(value, path, expected, violations):
+            if check_type is not None and not check_type(value, path, expected, violations):
+                return
+            for check in checks:
+                check(value, path, expected, violations)
+        return validator
+
+    @classmethod
+    def validator(cls, name: str) -> Validator:
+        with cls._lock:
+            compiled = cls._compiled.get(name)
+            if compiled is None:
+                if name not in cls.SCHEMAS:
+                    raise KeyError(f"No response schema registered for '{name}'")
+                compiled = cls.compile(cls.SCHEMAS[name])
+                cls._compiled[name] = compiled
+            return compiled
+
+    @classmethod
+    def validate(cls, name: str, body: Any, expected: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Validates a response body against the schema ``name``.
+        Returns:
+            list: Every violation found (empty if valid).
+        """
+        violations: List[str] = []
+        cls.validator(name)(body, "$", expected, violations)
+        return violations
+
+    @classmethod
+    def validate_many(cls, name: str, items: List[Any]) -> Dict[int, List[str]]:
+        """
+        Batch-validates list items (e.g. search results) against the schema ``name``.
+        Returns:
+            dict: {index: [violations]} for invalid items only.
+        """
+        validator = cls.validator(name)
+        failures: Dict[int, List[str]] = {}
+        for index, item in enumerate(items):
+            violations: List[str] = []
+            validator(item, f"$[{index}]", None, violations)
+            if violations:
+                failures[index] = violations
+        return failures
+
+    @classmethod
+    def assert_valid(cls, name: str, body: Any, expected: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Raises AssertionError listing every violation of ``body`` against the schema ``name``.
+        """
+        violations = cls.validate(name, body, expected)
+        assert not violations, f"Response schema violations for {name}: " + "; ".join(violations)
@@ -0,0 +1,344 @@
+"""
+SMTPCaptureSink.py
+
+Executive Summary:
+------------------
+Local SMTP capture stand-in for email assertions. The application under test is pointed at this sink
+(host/port) instead of a real mail relay; every message it sends is parsed and stored in an in-memory Mailbox
+indexed by recipient and subject. Tests wait for a message and parse it (e.g. extract the password reset link), so
+email checks take milliseconds and recovery / reset-link-expiry flows run end to end without a real inbox.
+
+Detailed Analysis:
+------------------
+- ``SMTPCaptureSink``: threaded TCP server speaking the SMTP subset mail clients use (EHLO/HELO, MAIL, RCPT, DATA,
+  RSET, NOOP, QUIT; AUTH is accepted without checking). Messages are parsed with ``email`` (default policy) into
+  CapturedMessage (sender, recipients, subject, text, html, headers). STARTTLS is not offered.
+- ``Mailbox``: messages in arrival order with indexes {recipient (lower-case): ids} and {subject: ids}; queries
+  by recipient, exact subject, subject substring and ``after_id``. ``wait_for(...)`` blocks on a Condition until a
+  matching message arrives or raises ConsistencyTimeout; waits are recorded in AwaitCondition.metrics().
+- Links: ``CapturedMessage.links(pattern)`` lists URLs in the text and HTML bodies; ``parse_reset_link(url)``
+  returns its token and expiry (``expires=`` as YYYYmmddHHMM, ISO or epoch seconds).
+
+Implementation Guide:
+---------------------
+1. ``sink = SMTPCaptureSink(port=2525).start()``; configure the application's SMTP host/port to the sink.
+2. ``mark = sink.mailbox.mark()`` before the action.
+3. ``message = sink.mailbox.wait_for(recipient=email, subject_contains="reset", after_id=mark, timeout=30)``
+4. ``link = message.links(r"reset")[0]; details = parse_reset_link(link)``
+5. ``sink.stop()`` at session teardown (or ``with SMTPCaptureSink() as sink:``).
+
+Quality Assurance Report:
+-------------------------
+- Dot-stuffed lines are unstuffed; messages above ``max_message_size`` are rejected with 552.
+- Recipient lookups are case-insensitive; the envelope recipients and To/Cc headers are both indexed.
+
+Troubleshooting Guide:
+----------------------
+- Nothing arrives: check the application's SMTP host/port (``sink.address``) and that it does not require TLS.
+
+Future Considerations:
+----------------------
+- Optional STARTTLS with a self-signed certificate for clients that insist on TLS.
+"""
+
+import email
+import email.policy
+import re
+import socketserver
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import getaddresses, parseaddr
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from auto_scripts.Pages.EventualConsistency import AwaitCondition, ConsistencyTimeout
+
+URL_PATTERN = re.compile(r"https?://[^\s\"'<>]+")
+
+
+class CapturedMessage:
+    """
+    One message received by the sink.
+    """
+
+    def __init__(self, message_id: int, mail_from: str, recipients: List[str], raw: bytes):
+        self.id = message_id
+        self.received_at = datetime.now()
+        self.mail_from = mail_from
+        self.raw = raw
+        parsed = email.message_from_bytes(raw, policy=email.policy.default)
+        self.headers: Dict[str, str] = {key: str(value) for key, value in parsed.items()}
+        self.subject = str(parsed.get("Subject", ""))
+        header_recipients = [addr for _, addr in getaddresses(
+            [str(v) for v in parsed.get_all("To", []) + parsed.get_all("Cc", [])])]
+        self.recipients = list(dict.fromkeys(addr.lower() for addr in recipients + header_recipients if addr))
+        text_part = parsed.get_body(preferencelist=("plain",))
+        html_part = parsed.get_body(preferencelist=("html",))
+        self.text = text_part.get_content().replace("\r\n", "\n") if text_part is not None else ""
+        self.html = html_part.get_content().replace("\r\n", "\n") if html_part is not None else ""
+
+    def links(self, pattern: Optional[str] = None) -> List[str]:
+        """
+        Returns the distinct URLs in the text and HTML bodies, optionally filtered by the regex ``pattern``.
+        """
+        urls = dict.fromkeys(url.rstrip(".,;)").replace("&amp;", "&")
+                             for url in URL_PATTERN.findall(self.text + "\n" + self.html))
+        regex = re.compile(pattern) if pattern else None
+        return [url for url in urls if regex is None or regex.search(url)]
+
+    def __repr__(self) -> str:
+        return f"CapturedMessage(id={self.id}, to={self.recipients}, subject={self.subject!r})"
+
+
+def parse_expiry(value: str) -> Optional[datetime]:
+    """
+    Parses an ``expires`` value (``YYYYMMDDHHMM``, ISO 8601 with optional ``Z``/offset, or epoch seconds) into an
+    aware UTC datetime; values without a zone are taken as UTC. Returns None if unparseable.
+    """
+    value = value.strip().replace(" ", "+")  # an unencoded "+hh:mm" offset arrives from the query string as a space
+    try:
+        if value.isdigit() and len(value) == 12:
+            parsed = datetime.strptime(value, "%Y%m%d%H%M")
+        elif value.isdigit():
+            return datetime.fromtimestamp(int(value), timezone.utc)
+        else:
+            parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value)
+    except (ValueError, OverflowError, OSError):
+        return None
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+
+
+def parse_reset_link(url: str) -> Dict[str, Any]:
+    """
+    Parses a reset link into {"url", "token", "expires"} (``expires`` an aware UTC datetime or None).
+    """
+    query = {key: values[0] for key, values in parse_qs(urlparse(url).query).items()}
+    expires = query.get("expires") or query.get("exp")
+    return {"url": url, "token": query.get("token"), "expires": parse_expiry(expires) if expires else None}
+
+
+class Mailbox:
+    """
+    Captured messages indexed by recipient and subject.
+    """
+
+    def __init__(self):
+        self._messages: List[CapturedMessage] = []
+        self._by_recipient: Dict[str, List[int]] = {}
+        self._by_subject: Dict[str, List[int]] = {}
+        self._condition = threading.Condition()
+
+    def add(self, mail_from: str, recipients: List[str], raw: bytes) -> CapturedMessage:
+        with self._condition:
+            message = CapturedMessage(len(self._messages) + 1, mail_from, recipients, raw)
+            self._messages.append(message)
+            for recipient in message.recipients:
+                self._by_recipient.setdefault(recipient, []).append(message.id)
+            self._by_subject.setdefault(message.subject, []).append(message.id)
+            self._condition.notify_all()
+            return message
+
+    def mark(self) -> int:
+        """
+        Returns the id of the latest message; pass it as ``after_id`` to see only later messages.
+        """
+        with self._condition:
+            return len(self._messages)
+
+    def __len__(self) -> int:
+        return self.mark()
+
+    def _candidates(self, recipient: Optional[str], subject: Optional[str], after_id: int) -> List[CapturedMessage]:
+        if recipient is not None:
+            ids = self._by_recipient.get(recipient.lower(), [])
+            if subject is not None:
+                ids = sorted(set(ids) & set(self._by_subject.get(subject, [])))
+        elif subject is not None:
+            ids = self._by_subject.get(subject, [])
+        else:
+            return self._messages[after_id:]
+        return [self._messages[i - 1] for i in ids if i > after_id]
+
+    def messages(self, recipient: Optional[str] = None, subject: Optional[str] = None,
+                 subject_contains: Optional[str] = None, after_id: int = 0,
+                 predicate: Optional[Callable[[CapturedMessage], bool]] = None) -> List[CapturedMessage]:
+        """
+        Returns messages matching every given filter, oldest first.
+        Args:
+            recipient (str, optional): Envelope or To/Cc recipient (case-insensitive).
+            subject (str, optional): Exact subject.
+            subject_contains (str, optional): Case-insensitive subject substring.
+            after_id (int): Only messages received after this mark.
+            predicate (callable, optional): Extra message filter.
+        """
+        with self._condition:
+            candidates = self._candidates(recipient, subject, after_id)
+        needle = subject_contains.lower() if subject_contains else None
+        return [m for m in candidates
+                if (needle is None or needle in m.subject.lower()) and (predicate is None or predicate(m))]
+
+    def wait_for(self, recipient: Optional[str] = None, subject: Optional[str] = None,
+                 subject_contains: Optional[str] = None, after_id: int = 0,
+                 predicate: Optional[Callable[[CapturedMessage], bool]] = None,
+                 timeout: float = 30.0, name: Optional[str] = None) -> CapturedMessage:
+        """
+        Blocks until a matching message has arrived and returns the first one.
+        Raises:
+            ConsistencyTimeout: If none arrives before the deadline.
+        """
+        name = name or f"email to {recipient or 'any recipient'}"
+        started = time.monotonic()
+        deadline = started + timeout
+        checks = 0
+        with self._condition:
+            while True:
+                checks += 1
+                found = self.messages(recipient, subject, subject_contains, after_id, predicate)
+                if found:
+                    AwaitCondition.record(name, time.monotonic() - started)
+                    return found[0]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    AwaitCondition.record(name, None)
+                    raise ConsistencyTimeout(name, timeout, checks)
+                self._condition.wait(remaining)
+
+    def clear(self) -> None:
+        with self._condition:
+            self._messages.clear()
+            self._by_recipient.clear()
+            self._by_subject.clear()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    One SMTP session.
+    """
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def _read_data(self) -> Optional[bytes]:
+        limit = self.server.sink.max_message_size
+        chunks, size, too_big = [], 0, False
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                return None if too_big else b"".join(chunks)
+            if line.startswith(b".."):
+                line = line[1:]
+            size += len(line)
+            if size > limit:
+                too_big = True
+                chunks = []
+            elif not too_big:
+                chunks.append(line)
+
+    def handle(self) -> None:
+        sink = self.server.sink
+        mail_from, recipients = None, []
+        self._reply(f"220 {sink.hostname} ESMTP capture sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command, _, argument = line.decode("utf-8", errors="replace").strip().partition(" ")
+            command = command.upper()
+            if command == "EHLO":
+                self._reply(f"250-{sink.hostname}")
+                self._reply(f"250-SIZE {sink.max_message_size}")
+                self._reply("250-8BITMIME")
+                self._reply("250-AUTH PLAIN LOGIN")
+                self._reply("250 SMTPUTF8")
+            elif command == "HELO":
+                self._reply(f"250 {sink.hostname}")
+            elif command == "AUTH":
+                self._reply("235 2.7.0 Authentication accepted")
+            elif command == "MAIL":
+                mail_from, recipients = parseaddr(argument.partition(":")[2].split(" SIZE=")[0])[1], []
+                self._reply("250 OK")
+            elif command == "RCPT":
+                if mail_from is None:
+                    self._reply("503 Need MAIL before RCPT")
+                    continue
+                recipients.append(parseaddr(argument.partition(":")[2])[1])
+                self._reply("250 OK")
+            elif command == "DATA":
+                if not recipients:
+                    self._reply("503 Need RCPT before DATA")
+                    continue
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                raw = self._read_data()
+                if raw is None:
+                    self._reply("552 Message size exceeds limit")
+                else:
+                    sink.mailbox.add(mail_from, recipients, raw)
+                    self._reply("250 OK: queued")
+                mail_from, recipients = None, []
+            elif command == "RSET":
+                mail_from, recipients = None, []
+                self._reply("250 OK")
+            elif command == "NOOP":
+                self._reply("250 OK")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply(f"502 Command not implemented: {command}")
+
+
+class _ThreadingSMTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPCaptureSink:
+    """
+    Local SMTP server that captures every message into a Mailbox.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, mailbox: Optional[Mailbox] = None,
+                 max_message_size: int = 10 * 1024 * 1024, hostname: str = "capture.local"):
+        """
+        Args:
+            host (str): Bind address.
+            port (int): Bind port (0 = any free port; see ``address``).
+            mailbox (Mailbox, optional): Store for captured messages (default: a new Mailbox).
+            max_message_size (int): Largest accepted message in bytes.
+            hostname (str): Name announced in the greeting.
+        """
+        self.host = host
+        self.port = port
+        self.mailbox = mailbox or Mailbox()
+        self.max_message_size = max_message_size
+        self.hostname = hostname
+        self._server: Optional[_ThreadingSMTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.host, self.port
+
+    def start(self) -> "SMTPCaptureSink":
+        if self._server is None:
+            self._server = _ThreadingSMTPServer((self.host, self.port), _SMTPHandler)
+            self._server.sink = self
+            self.port = self._server.server_address[1]
+            self._thread = threading.Thread(target=self._server.serve_forever, name=f"SMTPCaptureSink:{self.port}",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> "SMTPCaptureSink":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
@@ -0,0 +1,338 @@
+"""
+SQLiteStandIn.py
+
+Executive Summary:
+------------------
+Embedded SQLite stand-in for the shop database (users, products, carts, cart_items). It behaves like a pymysql
+driver module, so DBConnectionPool can serve it in place of MySQL or PostgreSQL, and every DB PageClass runs its
+verification logic offline, unchanged. Seeded from fixtures, it makes DB checks testable without a database
+server and makes the overhead of our own query layer benchmarkable in isolation.
+
+Detailed Analysis:
+------------------
+- Driver surface: ``connect()``, ``Error``/``err.OperationalError``, ``cursors.DictCursor``/``SSCursor``/
+  ``SSDictCursor``; connections offer ``cursor()`` (context manager), ``commit``, ``rollback``, ``ping``, ``close``.
+- Query translation: ``%s`` placeholders -> ``?`` (and ``%%`` -> ``%``) when parameters are passed, and
+  ``SHOW TABLES [LIKE '<pattern>']`` -> a sqlite_master lookup. Everything else the PageClasses issue is valid SQLite.
+- MySQL functions used by TableIntegrityChecker/DBSnapshot are registered: MD5, CONCAT_WS, CONV, FLOOR, BIT_XOR.
+  CONV to base 10 returns a signed 64-bit integer so checksums survive SQLite's integer range.
+- Schema: camelCase columns as used by the API PageClasses, plus ``users.account_status`` as a generated alias of
+  ``accountStatus``; PostgreSQL-style lower-case identifiers (``cartid``) match because SQLite is case-insensitive.
+- ``":memory:"`` databases use a shared-cache URI kept alive by the StandInDatabase, so all pooled connections and
+  threads see the same data.
+
+Implementation Guide:
+---------------------
+1. db = StandInDatabase(); db.seed({"products": [...], "users": [...]})   (or db.seed_from_json("fixtures.json"))
+2. db.install()    # DBConnectionPool now routes every driver/db_config to the stand-in
+3. Run page DB checks as usual; db.uninstall() restores real drivers.
+
+Quality Assurance Report:
+-------------------------
+- Foreign keys are enforced (PRAGMA foreign_keys=ON), as on the real backends.
+- Transactions follow sqlite3 defaults: writes open a transaction that ``commit``/``rollback`` end.
+
+Troubleshooting Guide:
+----------------------
+- "no such function": a query uses a MySQL function not registered in ``_register_functions``; add it there.
+
+Future Considerations:
+----------------------
+- Orders and audit tables once PageClasses query them.
+"""
+
+import hashlib
+import itertools
+import json
+import re
+import sqlite3
+import threading
+import types
+from typing import Any, Dict, List, Optional, Sequence
+
+Error = sqlite3.Error
+OperationalError = sqlite3.OperationalError
+IntegrityError = sqlite3.IntegrityError
+err = types.SimpleNamespace(OperationalError=OperationalError, IntegrityError=IntegrityError, Error=Error)
+
+
+class Cursor:
+    """Tuple rows (default cursor class)."""
+
+
+class DictCursor(Cursor):
+    """Dict rows."""
+
+
+class SSCursor(Cursor):
+    """Streaming tuple rows (same as Cursor for SQLite)."""
+
+
+class SSDictCursor(DictCursor):
+    """Streaming dict rows (same as DictCursor for SQLite)."""
+
+
+cursors = types.SimpleNamespace(Cursor=Cursor, DictCursor=DictCursor, SSCursor=SSCursor, SSDictCursor=SSDictCursor)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    userId INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password TEXT,
+    firstName TEXT,
+    lastName TEXT,
+    registrationDate TEXT DEFAULT CURRENT_TIMESTAMP,
+    accountStatus TEXT NOT NULL DEFAULT 'ACTIVE',
+    account_status TEXT GENERATED ALWAYS AS (accountStatus) VIRTUAL
+);
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    description TEXT,
+    price NUMERIC NOT NULL DEFAULT 0,
+    category TEXT,
+    imageUrl TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_products_name ON products (name);
+CREATE TABLE IF NOT EXISTS carts (
+    cartId INTEGER PRIMARY KEY AUTOINCREMENT,
+    userId INTEGER NOT NULL REFERENCES users (userId),
+    createdAt TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_carts_user ON carts (userId);
+CREATE TABLE IF NOT EXISTS cart_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cartId INTEGER NOT NULL REFERENCES carts (cartId),
+    productId INTEGER NOT NULL REFERENCES products (id),
+    quantity INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_cart_items_cart ON cart_items (cartId);
+"""
+
+SHOW_TABLES = re.compile(r"^\s*SHOW\s+TABLES(?:\s+LIKE\s+'([^']*)')?\s*;?\s*$", re.IGNORECASE)
+TABLE_ORDER = ["users", "products", "carts", "cart_items"]
+_memory_ids = itertools.count(1)
+
+
+class _BitXor:
+    def __init__(self):
+        self.value = 0
+
+    def step(self, value):
+        if value is not None:
+            self.value ^= int(value)
+
+    def finalize(self):
+        return self.value
+
+
+def _conv(value, from_base, to_base):
+    if value is None:
+        return None
+    number = int(str(value), int(from_base))
+    if int(to_base) != 10:
+        raise ValueError("CONV stand-in only converts to base 10")
+    number &= (1 << 64) - 1
+    return number - (1 << 64) if number >= 1 << 63 else number
+
+
+def _concat_ws(separator, *values):
+    return str(separator).join(str(v) for v in values if v is not None)
+
+
+def _floor(value):
+    if value is None:
+        return None
+    return int(value // 1)
+
+
+def _md5(value):
+    return None if value is None else hashlib.md5(str(value).encode("utf-8")).hexdigest()
+
+
+def _register_functions(conn: sqlite3.Connection) -> None:
+    conn.create_function("MD5", 1, _md5, deterministic=True)
+    conn.create_function("CONCAT_WS", -1, _concat_ws, deterministic=True)
+    conn.create_function("CONV", 3, _conv, deterministic=True)
+    conn.create_function("FLOOR", 1, _floor, deterministic=True)
+    conn.create_aggregate("BIT_XOR", 1, _BitXor)
+
+
+def translate(sql: str, params: Optional[Sequence[Any]]) -> str:
+    """
+    Translates a pymysql/psycopg2-style statement to SQLite.
+    """
+    match = SHOW_TABLES.match(sql)
+    if match:
+        pattern = f" AND name LIKE '{match.group(1)}'" if match.group(1) is not None else ""
+        return f"SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'{pattern}"
+    if params is None:
+        return sql
+    return sql.replace("%s", "?").replace("%%", "%")
+
+
+class StandInCursor:
+    """
+    DB-API cursor wrapper returning tuples or dicts and usable as a context manager.
+    """
+
+    def __init__(self, cursor: sqlite3.Cursor, as_dict: bool):
+        self._cursor = cursor
+        self.as_dict = as_dict
+        self.itersize = 1000
+
+    def __enter__(self) -> "StandInCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    def _row(self, row):
+        if row is None or not self.as_dict:
+            return row
+        return {d[0]: value for d, value in zip(self._cursor.description, row)}
+
+    def execute(self, sql: str, params: Optional[Sequence[Any]] = None) -> int:
+        self._cursor.execute(translate(sql, params), tuple(params) if params is not None else ())
+        return self._cursor.rowcount
+
+    def executemany(self, sql: str, seq_of_params: Sequence[Sequence[Any]]) -> int:
+        self._cursor.executemany(translate(sql, ()), [tuple(p) for p in seq_of_params])
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Any]:
+        return [self._row(r) for r in self._cursor.fetchmany(size or self.itersize)]
+
+    def fetchall(self) -> List[Any]:
+        return [self._row(r) for r in self._cursor.fetchall()]
+
+    def __iter__(self):
+        for row in self._cursor:
+            yield self._row(row)
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class StandInConnection:
+    """
+    pymysql-like connection over sqlite3.
+    """
+
+    def __init__(self, database: str, cursorclass: Optional[type] = None, uri: bool = False):
+        self._conn = sqlite3.connect(database, uri=uri, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        _register_functions(self._conn)
+        self.cursorclass = cursorclass or Cursor
+        self.closed = False
+
+    def cursor(self, cursorclass: Optional[type] = None, name: Optional[str] = None) -> StandInCursor:
+        cursorclass = cursorclass or self.cursorclass
+        as_dict = isinstance(cursorclass, type) and "Dict" in cursorclass.__name__
+        return StandInCursor(self._conn.cursor(), as_dict)
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def rollback(self) -> None:
+        self._conn.rollback()
+
+    def ping(self, reconnect: bool = False) -> None:
+        if self.closed:
+            raise OperationalError("Connection is closed")
+        self._conn.execute("SELECT 1")
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._conn.close()
+
+
+def connect(database: str = ":memory:", cursorclass: Optional[type] = None, **ignored) -> StandInConnection:
+    """
+    pymysql-compatible connect(); host/user/password and other server options are ignored.
+    """
+    return StandInConnection(database, cursorclass=cursorclass, uri=database.startswith("file:"))
+
+
+class StandInDatabase:
+    """
+    An embedded shop database: creates the schema, seeds fixtures and routes DBConnectionPool to itself.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Args:
+            path (str): SQLite file, or ":memory:" for a shared in-memory database.
+        """
+        self.database = f"file:shop_stand_in_{next(_memory_ids)}?mode=memory&cache=shared" if path == ":memory:" \
+            else path
+        self._keeper = connect(self.database)
+        self._keeper._conn.executescript(SCHEMA)
+        self._keeper.commit()
+        self._lock = threading.Lock()
+
+    def seed(self, fixtures: Dict[str, List[Dict[str, Any]]]) -> Dict[str, int]:
+        """
+        Inserts fixture rows ({table: [row dict, ...]}), parents before children.
+        Returns:
+            dict: {table: rows inserted}
+        """
+        counts: Dict[str, int] = {}
+        with self._lock:
+            cursor = self._keeper.cursor()
+            for table in sorted(fixtures, key=lambda t: TABLE_ORDER.index(t) if t in TABLE_ORDER else len(TABLE_ORDER)):
+                rows = fixtures[table]
+                if not rows:
+                    continue
+                assert table in TABLE_ORDER, f"Unknown stand-in table: {table}"
+                columns = list(rows[0])
+                cursor.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                    [[row.get(c) for c in columns] for row in rows]
+                )
+                counts[table] = len(rows)
+            self._keeper.commit()
+        return counts
+
+    def seed_from_json(self, path: str) -> Dict[str, int]:
+        with open(path, "r", encoding="utf-8") as f:
+            return self.seed(json.load(f))
+
+    def install(self) -> "StandInDatabase":
+        """
+        Routes every DBConnectionPool connection (any driver, any db_config) to this database.
+        """
+        from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+        DBConnectionPool.use_stand_in(self.database)
+        return self
+
+    def uninstall(self) -> None:
+        from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+        DBConnectionPool.use_stand_in(None)
+
+    def __enter__(self) -> "StandInDatabase":
+        return self.install()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.uninstall()
+
+    def close(self) -> None:
+        self.uninstall()
+        self._keeper.close()
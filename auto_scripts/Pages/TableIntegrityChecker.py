@@ -0,0 +1,311 @@
+"""
+TableIntegrityChecker.py
+
+Executive Summary:
+------------------
+Checksum-based integrity verification for large tables. Rows are hashed inside the database and aggregated per
+primary-key range, so a comparison transfers one small row per chunk instead of the whole table. Only mismatching
+chunks are drilled into, by re-hashing narrower sub-ranges, and only the final small ranges are streamed row by row
+through a server-side cursor. Memory stays constant and runtime follows the amount of actual difference.
+
+Detailed Analysis:
+------------------
+- Row hash: first 64 bits of MD5 over ``key|col1|col2|...`` (NULL-safe), XOR-aggregated with COUNT(*) per chunk.
+- Chunks are integer key ranges ``[n * chunk_size, (n + 1) * chunk_size)``, stable across inserts and deletes.
+- Expected state is either a baseline (chunk checksums captured earlier, saved as JSON) or a reference table
+  (another TableIntegrityChecker, e.g. a golden database). Baseline mismatches are reported per chunk; a reference
+  allows drill-down to individual missing, unexpected and changed rows.
+- Drill-down splits a mismatching range into ``fanout`` sub-ranges per step until ``leaf_size`` is reached.
+- Dialects: MySQL (pymysql), PostgreSQL 14+ (psycopg2, needs the BIT_XOR aggregate) and the SQLiteStandIn, which
+  registers the MySQL functions. Connections come from DBConnectionPool.
+- ``consistent_read()`` yields a connection inside one REPEATABLE READ transaction (MySQL: consistent snapshot);
+  ``key_stats``, ``_range_checksums`` and ``stream_row_hashes`` accept it as ``conn`` so several reads see one state.
+
+Implementation Guide:
+---------------------
+1. checker = TableIntegrityChecker(db_config, "products", columns=["name", "description", "price"])
+2. baseline = checker.capture(); TableIntegrityChecker.save_baseline(baseline, "products.baseline.json")
+3. After the operation under test: report = checker.verify(baseline)  (or checker.verify(reference=golden_checker))
+4. ``report["pass"]``, ``report["mismatched_chunks"]`` and ``report["rows"]`` describe every difference found.
+
+Quality Assurance Report:
+-------------------------
+- Table and column names are validated as plain identifiers before being placed into SQL.
+- Row lists in reports are capped at ``max_row_diffs`` entries; counts are always exact.
+
+Troubleshooting Guide:
+----------------------
+- Baseline rejected: table, key, columns and chunk_size must match the checker that captured it.
+- Non-integer primary keys are not supported; use a surrogate integer key column.
+
+Future Considerations:
+----------------------
+- Composite keys and string keys via ordered keyset pagination.
+"""
+
+import contextlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class TableIntegrityChecker:
+    """
+    Compares a table against a checksum baseline or a reference table, chunk by chunk, inside the database.
+    """
+    DIALECTS = {
+        "pymysql": {
+            "quote": "`{}`",
+            "text": "CAST({} AS CHAR)",
+            "row_hash": "CAST(CONV(SUBSTRING(MD5(CONCAT_WS('|', {})), 1, 16), 16, 10) AS UNSIGNED)",
+            "snapshot": ("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ",
+                         "START TRANSACTION WITH CONSISTENT SNAPSHOT"),
+        },
+        "psycopg2": {
+            "quote": '"{}"',
+            "text": "CAST({} AS TEXT)",
+            "row_hash": "('x' || SUBSTR(MD5(CONCAT_WS('|', {})), 1, 16))::bit(64)::bigint",
+            "snapshot": ("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ",),
+        },
+    }
+    DIALECTS["sqlite"] = {**DIALECTS["pymysql"], "snapshot": ("BEGIN",)}
+    STREAM_BATCH = 1000
+
+    def __init__(self, db_config: Dict[str, Any], table: str, columns: Sequence[str], key: str = "id",
+                 chunk_size: int = 10000, leaf_size: int = 100, fanout: int = 16, driver: str = "pymysql",
+                 max_row_diffs: int = 1000):
+        """
+        Args:
+            db_config (dict): Connection parameters for DBConnectionPool.
+            table (str): Table to verify.
+            columns (list): Columns covered by the checksum (besides the key).
+            key (str): Integer primary key column.
+            chunk_size (int): Key range per top-level chunk.
+            leaf_size (int): Key range below which rows are streamed and compared individually.
+            fanout (int): Sub-ranges per drill-down step.
+            driver (str): "pymysql" or "psycopg2".
+            max_row_diffs (int): Cap on rows listed per difference kind in reports.
+        """
+        for name in [table, key, *columns]:
+            assert IDENTIFIER.match(name), f"Invalid SQL identifier: {name!r}"
+        self.dialect_driver = DBConnectionPool.effective_driver(driver)
+        assert self.dialect_driver in self.DIALECTS, f"Unsupported driver '{driver}'"
+        self.db_config = db_config
+        self.table = table
+        self.columns = list(columns)
+        self.key = key
+        self.chunk_size = chunk_size
+        self.leaf_size = leaf_size
+        self.fanout = fanout
+        self.driver = driver
+        self.max_row_diffs = max_row_diffs
+        dialect = self.DIALECTS[self.dialect_driver]
+        quote = dialect["quote"].format
+        self._table_sql = quote(table)
+        self._key_sql = quote(key)
+        self._select_sql = ", ".join(quote(c) for c in [key, *self.columns])
+        fields = ", ".join(f"COALESCE({dialect['text'].format(quote(c))}, '\\\\N')" for c in [key, *self.columns])
+        self._row_hash_sql = dialect["row_hash"].format(fields)
+        self._snapshot_sql = dialect["snapshot"]
+
+    # --- connections ---
+    def _connection(self, conn: Any = None):
+        if conn is not None:
+            return contextlib.nullcontext(conn)
+        return DBConnectionPool.connection(self.db_config, driver=self.driver)
+
+    @contextlib.contextmanager
+    def consistent_read(self) -> Iterator[Any]:
+        """
+        Yields a pooled connection inside one REPEATABLE READ transaction, rolled back afterwards.
+        """
+        with DBConnectionPool.connection(self.db_config, driver=self.driver) as conn:
+            with conn.cursor() as cursor:
+                for statement in self._snapshot_sql:
+                    cursor.execute(statement)
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+
+    # --- checksums ---
+    def _range_checksums(self, lo: Optional[int], hi: Optional[int], step: int,
+                         conn: Any = None) -> Dict[int, Tuple[int, int]]:
+        """
+        Returns {range_start: (row_count, xor_hash)} for ``step``-wide ranges in [lo, hi), aligned to ``lo``
+        (or to multiples of ``step`` when lo is None).
+        """
+        origin = lo or 0
+        sql = (f"SELECT FLOOR(({self._key_sql} - %s) / %s) AS bucket, COUNT(*) AS row_count, "
+               f"BIT_XOR({self._row_hash_sql}) AS row_hash FROM {self._table_sql}")
+        params: List[Any] = [origin, step]
+        if lo is not None:
+            sql += f" WHERE {self._key_sql} >= %s AND {self._key_sql} < %s"
+            params += [lo, hi]
+        sql += " GROUP BY bucket"
+        with self._connection(conn) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return {origin + int(bucket) * step: (int(count), int(row_hash))
+                        for bucket, count, row_hash in cursor.fetchall()}
+
+    def capture(self) -> Dict[str, Any]:
+        """
+        Computes the top-level chunk checksums of the table.
+        Returns:
+            dict: JSON-serializable baseline.
+        """
+        chunks = self._range_checksums(None, None, self.chunk_size)
+        return {
+            "table": self.table,
+            "key": self.key,
+            "columns": self.columns,
+            "chunk_size": self.chunk_size,
+            "chunks": {str(start): list(value) for start, value in sorted(chunks.items())},
+        }
+
+    @staticmethod
+    def save_baseline(baseline: Dict[str, Any], path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(baseline, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load_baseline(path: str) -> Dict[str, Any]:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def key_stats(self, conn: Any = None) -> Tuple[int, Optional[int], Optional[int]]:
+        """
+        Returns (row_count, min_key, max_key) of the table.
+        """
+        sql = f"SELECT COUNT(*), MIN({self._key_sql}), MAX({self._key_sql}) FROM {self._table_sql}"
+        with self._connection(conn) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql)
+                count, min_key, max_key = cursor.fetchone()
+        return int(count), min_key, max_key
+
+    # --- rows ---
+    def stream_rows(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple]:
+        """
+        Streams (key, col1, ...) tuples of [lo, hi) in key order through a server-side cursor.
+        """
+        return self._stream(self._select_sql, lo, hi)
+
+    def stream_row_hashes(self, lo: Optional[int] = None, hi: Optional[int] = None,
+                          conn: Any = None) -> Iterator[Tuple[int, int]]:
+        """
+        Streams (key, row_hash) pairs of [lo, hi) (whole table when lo is None) in key order.
+        """
+        return ((key, int(row_hash)) for key, row_hash in
+                self._stream(f"{self._key_sql}, {self._row_hash_sql}", lo, hi, conn))
+
+    def _stream(self, select_sql: str, lo: Optional[int], hi: Optional[int], conn: Any = None) -> Iterator[Tuple]:
+        sql = f"SELECT {select_sql} FROM {self._table_sql}"
+        params: Tuple = ()
+        if lo is not None:
+            sql += f" WHERE {self._key_sql} >= %s AND {self._key_sql} < %s"
+            params = (lo, hi)
+        sql += f" ORDER BY {self._key_sql}"
+        pool = DBConnectionPool.for_config(self.db_config, driver=self.driver)
+        with (contextlib.nullcontext(conn) if conn is not None else pool.borrow()) as conn:
+            if self.dialect_driver != "psycopg2":
+                cursor = conn.cursor(pool.module.cursors.SSCursor)
+            else:
+                cursor = conn.cursor(name=f"integrity_{self.table}_{lo if lo is not None else 'all'}")
+                cursor.itersize = self.STREAM_BATCH
+            try:
+                cursor.execute(sql, params)
+                while True:
+                    batch = cursor.fetchmany(self.STREAM_BATCH)
+                    if not batch:
+                        break
+                    for row in batch:
+                        yield tuple(row)
+            finally:
+                cursor.close()
+
+    def _merge_rows(self, reference: "TableIntegrityChecker", lo: int, hi: int, report: Dict[str, Any]) -> None:
+        mine, theirs = self.stream_rows(lo, hi), reference.stream_rows(lo, hi)
+        a, b = next(mine, None), next(theirs, None)
+        while a is not None or b is not None:
+            if b is None or (a is not None and a[0] < b[0]):
+                self._record(report, "unexpected", a[0])
+                a = next(mine, None)
+            elif a is None or b[0] < a[0]:
+                self._record(report, "missing", b[0])
+                b = next(theirs, None)
+            else:
+                if a != b:
+                    self._record(report, "changed", a[0])
+                a, b = next(mine, None), next(theirs, None)
+
+    def _record(self, report: Dict[str, Any], kind: str, key: Any) -> None:
+        report["row_counts"][kind] += 1
+        if len(report["rows"][kind]) < self.max_row_diffs:
+            report["rows"][kind].append(key)
+
+    def _drill(self, reference: "TableIntegrityChecker", lo: int, hi: int, report: Dict[str, Any]) -> None:
+        if hi - lo <= self.leaf_size:
+            self._merge_rows(reference, lo, hi, report)
+            return
+        step = max(self.leaf_size, -(-(hi - lo) // self.fanout))
+        mine = self._range_checksums(lo, hi, step)
+        theirs = reference._range_checksums(lo, hi, step)
+        report["ranges_rehashed"] += 1
+        for start in sorted(set(mine) | set(theirs)):
+            if mine.get(start) != theirs.get(start):
+                self._drill(reference, start, min(start + step, hi), report)
+
+    # --- verification ---
+    def verify(self, baseline: Optional[Dict[str, Any]] = None,
+               reference: Optional["TableIntegrityChecker"] = None) -> Dict[str, Any]:
+        """
+        Compares the table against a baseline or a reference table.
+        Args:
+            baseline (dict, optional): Result of capture() (or load_baseline()).
+            reference (TableIntegrityChecker, optional): Expected table; enables row-level drill-down.
+        Returns:
+            dict: Report with mismatched chunks, row differences and ``pass``.
+        """
+        assert baseline is not None or reference is not None, "verify() needs a baseline or a reference table"
+        if reference is not None:
+            assert (reference.key, reference.columns) == (self.key, self.columns), \
+                "Reference table must be checked on the same key and columns"
+            expected = {start: tuple(v) for start, v in
+                        reference._range_checksums(None, None, self.chunk_size).items()}
+        else:
+            signature = (baseline["table"], baseline["key"], baseline["columns"], baseline["chunk_size"])
+            assert signature == (self.table, self.key, self.columns, self.chunk_size), \
+                f"Baseline {signature} does not match checker configuration"
+            expected = {int(start): tuple(v) for start, v in baseline["chunks"].items()}
+        actual = self._range_checksums(None, None, self.chunk_size)
+        report = {
+            "table": self.table,
+            "chunks_compared": len(set(expected) | set(actual)),
+            "mismatched_chunks": [],
+            "ranges_rehashed": 0,
+            "row_counts": {"missing": 0, "unexpected": 0, "changed": 0},
+            "rows": {"missing": [], "unexpected": [], "changed": []},
+            "pass": False,
+        }
+        for start in sorted(set(expected) | set(actual)):
+            want, got = expected.get(start, (0, 0)), actual.get(start, (0, 0))
+            if want == got:
+                continue
+            report["mismatched_chunks"].append({
+                "key_range": [start, start + self.chunk_size],
+                "expected_rows": want[0],
+                "actual_rows": got[0],
+            })
+            if reference is not None:
+                self._drill(reference, start, start + self.chunk_size, report)
+        report["pass"] = not report["mismatched_chunks"]
+        return report
@@ -0,0 +1,249 @@
+"""
+TestDataIsolation.py
+
+Executive Summary:
+------------------
+Keeps test data from accumulating in the shop database. Direct-DB fixtures run inside a savepoint that is rolled
+back when the test ends; data created through the API is recorded in a created-ids ledger and deleted in bulk at
+teardown. Tables stay small, integrity checks no longer have to tolerate leftovers, and queries stay fast run after run.
+
+Detailed Analysis:
+------------------
+- ``savepoint(db_config)``: borrows a pooled connection, opens ``SAVEPOINT``, yields the connection and rolls back to
+  the savepoint (and the transaction) on exit, even on failure. Rows written there are only visible on that
+  connection, so use it for DB-level fixtures and checks, not for data the API must see.
+- ``CreatedDataLedger``: ``track(table, key_column, key)`` records API-created rows by primary key; ``cleanup()``
+  issues chunked ``DELETE ... WHERE key IN (...)`` statements per table, children first (``TABLE_ORDER``), in one
+  transaction. Known tables only accept their primary key column (``PRIMARY_KEYS``), so cleanup can never delete a
+  pre-existing row that merely shares a name with a created one.
+- When the API response carries no id, ``keys_where`` (before the call) and ``track_created`` (after it) record the
+  ids of rows matching a column value that were not there before the call.
+- While a ledger is active (``with CreatedDataLedger(...)``), API PageClasses register what they create
+  (ProductInsertAPIPage, ProductSpecialCharAndInjectionTestPage, UserRegistrationAPIPage) via ``track_active``.
+  The active ledger is the innermost one entered in the current context (a ContextVar, so concurrent threads each
+  see their own and nested ledgers restore the outer one on exit); threads that entered none (e.g. LoadTestRunner
+  workers) fall back to the most recently entered ledger that is still open.
+- With ``path`` set the ledger is persisted after every change, so a crashed run's rows are removed by the next run
+  (``CreatedDataLedger(db_config, path).cleanup()`` before the suite starts).
+
+Implementation Guide:
+---------------------
+1. ``with CreatedDataLedger(db_config, path=".created_ids.json"): page.run_insert_and_verify(product)``
+2. ``with savepoint(db_config) as conn: insert fixture rows with conn; run DB assertions on conn``
+3. Manual tracking for other flows: ``CreatedDataLedger.track_active("carts", "cartId", cart_id)``.
+4. No id in the response: ``before = CreatedDataLedger.active_keys_where("products", "name", name)``, call the API,
+   then ``CreatedDataLedger.track_active_created("products", "name", name, before)``.
+
+Quality Assurance Report:
+-------------------------
+- Cleanup failures are re-raised after the ledger file is kept, so nothing is forgotten.
+- Table and key column names are validated as plain identifiers; non-primary-key entries in an old ledger file are
+  dropped on load instead of being deleted by value.
+
+Troubleshooting Guide:
+----------------------
+- Foreign key errors during cleanup: add the child table ahead of its parent in ``TABLE_ORDER``.
+
+Future Considerations:
+----------------------
+- Cleanup through API DELETE endpoints where direct DB access is not allowed.
+"""
+
+import contextlib
+import contextvars
+import itertools
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_savepoint_ids = itertools.count(1)
+
+
+@contextlib.contextmanager
+def savepoint(db_config: Dict[str, Any], driver: str = "pymysql", **connect_overrides) -> Iterator[Any]:
+    """
+    Yields a pooled connection inside a savepoint that is always rolled back.
+    """
+    name = f"test_fixture_{next(_savepoint_ids)}"
+    with DBConnectionPool.connection(db_config, driver=driver, **connect_overrides) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield conn
+        finally:
+            with conn.cursor() as cursor:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            conn.rollback()
+
+
+class CreatedDataLedger:
+    """
+    Records rows created through the API during a test and deletes them in bulk afterwards.
+    """
+    TABLE_ORDER = ["cart_items", "carts", "products", "users"]
+    PRIMARY_KEYS = {"cart_items": "id", "carts": "cartId", "products": "id", "users": "userId"}
+    CHUNK_SIZE = 500
+
+    _context: contextvars.ContextVar = contextvars.ContextVar("created_data_ledger", default=None)
+    _open: List["CreatedDataLedger"] = []
+    _active_lock = threading.Lock()
+
+    def __init__(self, db_config: Dict[str, Any], path: Optional[str] = None, driver: str = "pymysql"):
+        """
+        Args:
+            db_config (dict): Connection parameters for DBConnectionPool.
+            path (str, optional): JSON file persisting the ledger across runs.
+            driver (str): "pymysql" or "psycopg2".
+        """
+        self.db_config = db_config
+        self.path = path
+        self.driver = driver
+        self.entries: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for item in json.load(f):
+                    if self.is_primary_key(item["table"], item["key_column"]):
+                        self.entries[(item["table"], item["key_column"])] = item["keys"]
+
+    # --- activation ---
+    def __enter__(self) -> "CreatedDataLedger":
+        self._context_token = CreatedDataLedger._context.set(self)
+        with CreatedDataLedger._active_lock:
+            CreatedDataLedger._open.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        CreatedDataLedger._context.reset(self._context_token)
+        with CreatedDataLedger._active_lock:
+            CreatedDataLedger._open.remove(self)
+        self.cleanup()
+
+    @classmethod
+    def active(cls) -> Optional["CreatedDataLedger"]:
+        """
+        The ledger entered in the current context, else the most recently entered open ledger, else None.
+        """
+        ledger = cls._context.get()
+        if ledger is not None:
+            return ledger
+        with cls._active_lock:
+            return cls._open[-1] if cls._open else None
+
+    @classmethod
+    def track_active(cls, table: str, key_column: str, key: Any) -> None:
+        """
+        Records a created row in the active ledger, if any (no-op otherwise).
+        """
+        ledger = cls.active()
+        if ledger is not None and key is not None:
+            ledger.track(table, key_column, key)
+
+    @classmethod
+    def active_keys_where(cls, table: str, column: str, value: Any) -> Optional[set]:
+        """
+        Primary keys of rows where ``column = value`` in the active ledger's database (None without a ledger).
+        """
+        ledger = cls.active()
+        return ledger.keys_where(table, column, value) if ledger is not None else None
+
+    @classmethod
+    def track_active_created(cls, table: str, column: str, value: Any, before: Optional[set]) -> List[Any]:
+        """
+        Records, in the active ledger, rows where ``column = value`` whose primary key is not in ``before``.
+        Returns:
+            list: The newly tracked primary keys ([] without a ledger).
+        """
+        ledger = cls.active()
+        if ledger is None or before is None:
+            return []
+        return ledger.track_created(table, column, value, before)
+
+    # --- ledger ---
+    @classmethod
+    def is_primary_key(cls, table: str, key_column: str) -> bool:
+        primary_key = cls.PRIMARY_KEYS.get(table)
+        return primary_key is None or primary_key.lower() == key_column.lower()
+
+    def keys_where(self, table: str, column: str, value: Any) -> set:
+        """
+        Returns the primary keys of the rows where ``column = value``.
+        """
+        primary_key = self.PRIMARY_KEYS.get(table)
+        assert primary_key, f"No primary key registered for table {table!r}"
+        for name in (table, column):
+            assert IDENTIFIER.match(name), f"Invalid SQL identifier: {name!r}"
+        with DBConnectionPool.connection(self.db_config, driver=self.driver) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT {primary_key} FROM {table} WHERE {column} = %s", (value,))
+                return {row[primary_key] if isinstance(row, dict) else row[0] for row in cursor.fetchall()}
+
+    def track_created(self, table: str, column: str, value: Any, before: set) -> List[Any]:
+        """
+        Tracks rows where ``column = value`` that did not exist when ``before`` was taken (see ``keys_where``).
+        """
+        created = sorted(self.keys_where(table, column, value) - before)
+        for key in created:
+            self.track(table, self.PRIMARY_KEYS[table], key)
+        return created
+
+    def track(self, table: str, key_column: str, key: Any) -> None:
+        for name in (table, key_column):
+            assert IDENTIFIER.match(name), f"Invalid SQL identifier: {name!r}"
+        assert self.is_primary_key(table, key_column), \
+            f"{table} rows must be tracked by primary key {self.PRIMARY_KEYS[table]!r}, not {key_column!r}"
+        with self._lock:
+            keys = self.entries.setdefault((table, key_column), [])
+            if key not in keys:
+                keys.append(key)
+            self._save()
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self.entries.values())
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        items = [{"table": t, "key_column": c, "keys": keys} for (t, c), keys in self.entries.items() if keys]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(items, f, default=str)
+        os.replace(tmp_path, self.path)
+
+    def _order(self, entry: Tuple[str, str]) -> Tuple[int, str]:
+        table = entry[0]
+        return (self.TABLE_ORDER.index(table) if table in self.TABLE_ORDER else -1, table)
+
+    def cleanup(self) -> Dict[str, int]:
+        """
+        Deletes every tracked row (children before parents) in one transaction and clears the ledger.
+        Returns:
+            dict: {table: rows deleted}
+        """
+        with self._lock:
+            entries = sorted(((entry, keys) for entry, keys in self.entries.items() if keys),
+                             key=lambda item: self._order(item[0]))
+            if not entries:
+                self.entries.clear()
+                if self.path and os.path.exists(self.path):
+                    os.remove(self.path)
+                return {}
+            deleted: Dict[str, int] = {}
+            with DBConnectionPool.connection(self.db_config, driver=self.driver) as conn:
+                with conn.cursor() as cursor:
+                    for (table, key_column), keys in entries:
+                        for start in range(0, len(keys), self.CHUNK_SIZE):
+                            chunk = keys[start:start + self.CHUNK_SIZE]
+                            placeholders = ", ".join(["%s"] * len(chunk))
+                            cursor.execute(f"DELETE FROM {table} WHERE {key_column} IN ({placeholders})", chunk)
+                            deleted[table] = deleted.get(table, 0) + max(cursor.rowcount, 0)
+                conn.commit()
+            self.entries.clear()
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+            return deleted
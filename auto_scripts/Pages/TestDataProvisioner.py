@@ -0,0 +1,264 @@
+"""
+TestDataProvisioner.py
+
+Executive Summary:
+------------------
+Creates test users and products in bulk for data-driven runs. Records are provisioned concurrently through the API
+PageClasses (UserRegistrationAPIPage.register_user_api, ProductInsertAPIPage.insert_product_api) or, where allowed,
+with a chunked direct-DB bulk insert, and handed out from a reusable FixturePool. The pool is persisted between runs
+so accounts are recycled after a reset instead of being registered again.
+
+Detailed Analysis:
+------------------
+- API mode: one page instance wrapped in AsyncAPIPage; all creates are awaited concurrently on the shared worker
+  pool and pooled keep-alive sessions (concurrency is bounded by APISessionPool ``pool_maxsize``).
+- DB mode: ``executemany`` INSERTs in chunks of ``DB_CHUNK_SIZE`` on one pooled connection, committed once; the
+  generated keys are read back per chunk by the natural key (username / fixture product name) and set on the records.
+  Users are only inserted via DB with a ``password_hasher`` (the application's password hash function); its hash of
+  the record's password is written to the ``password`` column so the accounts can log in.
+- Recycling: ``state_path`` stores provisioned records; ``pool()`` first reuses stored records (after calling the
+  ``reset`` hook on them) and only provisions the shortfall.
+- Record indexes come from a per-kind counter in the state (``_next_index``) that is reserved before the creates and
+  advances by ``count`` whether or not they succeed, so a retry after a partial failure never reuses a name.
+- Failures of individual creates are collected in ``last_errors`` and do not abort the batch.
+
+Implementation Guide:
+---------------------
+1. provisioner = TestDataProvisioner(api_base_url, db_config, state_path=".provisioned.json")
+2. users = provisioner.pool("users", 500)            # FixturePool of user dicts (username, email, password, ...)
+3. user = users.acquire(); ...; users.release(user)
+4. products = provisioner.pool("products", 200, via="db")   # only when direct DB writes are allowed
+5. TestDataProvisioner(api_base_url, db_config, password_hasher=app_hash).pool("users", 500, via="db")
+
+Quality Assurance Report:
+-------------------------
+- Generated usernames/emails embed a run token and a monotonic index, so neither concurrent runs nor retries collide.
+- ``via="db"`` for users without a ``password_hasher`` is rejected: such accounts would have no usable password.
+
+Troubleshooting Guide:
+----------------------
+- Many API errors: check ``last_errors``; a tripped circuit breaker means the backend, not the provisioner, failed.
+- Stale recycled accounts: pass a ``reset`` hook that restores account state (status, lockout counters, carts).
+
+Future Considerations:
+----------------------
+- Cart and order fixtures on top of provisioned users.
+"""
+
+import json
+import os
+import queue
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.AsyncAPIPage import AsyncAPIPage
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+
+
+class FixturePool:
+    """
+    Thread-safe pool of provisioned records handed out to tests and returned for reuse.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.records = list(records)
+        self._available: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        for record in self.records:
+            self._available.put(record)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def acquire(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Returns a free record, blocking up to ``timeout`` seconds if all are in use.
+        """
+        try:
+            return self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise AssertionError(f"No free fixture record within {timeout}s (pool size {len(self.records)})")
+
+    def release(self, record: Dict[str, Any]) -> None:
+        self._available.put(record)
+
+
+class TestDataProvisioner:
+    """
+    Concurrent bulk provisioning of users and products with a persisted, recyclable fixture pool.
+    """
+    DB_CHUNK_SIZE = 500
+    USER_DB_COLUMNS = {"username": "username", "email": "email", "passwordHash": "password", "firstName": "firstName",
+                       "lastName": "lastName", "accountStatus": "accountStatus"}
+    PRODUCT_DB_COLUMNS = {"name": "name", "description": "description", "price": "price"}
+    DB_KEYS = {"users": ("userId", "username"), "products": ("id", "name")}
+    COUNTER_KEY = "_next_index"
+
+    def __init__(self, api_base_url: str, db_config: Optional[Dict[str, Any]] = None, state_path: Optional[str] = None,
+                 reset: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+                 user_db_columns: Optional[Dict[str, str]] = None, product_db_columns: Optional[Dict[str, str]] = None,
+                 password_hasher: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            api_base_url (str): Base URL of the shop API.
+            db_config (dict, optional): pymysql connection parameters (needed for via="db").
+            state_path (str, optional): JSON file persisting provisioned records across runs.
+            reset (callable, optional): reset(kind, records) restoring recycled records before reuse.
+            user_db_columns (dict, optional): Record field -> users table column for DB bulk insert.
+            product_db_columns (dict, optional): Record field -> products table column for DB bulk insert.
+            password_hasher (callable, optional): The application's password hash function, plain -> stored value;
+                required to provision users via="db" (its result is the ``passwordHash`` field).
+        """
+        self.api_base_url = api_base_url
+        self.db_config = db_config or {}
+        self.state_path = state_path
+        self.reset = reset
+        self.user_db_columns = user_db_columns or self.USER_DB_COLUMNS
+        self.product_db_columns = product_db_columns or self.PRODUCT_DB_COLUMNS
+        self.password_hasher = password_hasher
+        self.run_token = uuid.uuid4().hex[:8]
+        self.last_errors: List[str] = []
+        self._memory_state: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    # --- record factories ---
+    def make_user(self, index: int) -> Dict[str, Any]:
+        username = f"fixture_{self.run_token}_{index}"
+        return {
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": "Fixture123!",
+            "firstName": "Fixture",
+            "lastName": f"User{index}",
+            "accountStatus": "ACTIVE",
+        }
+
+    def make_product(self, index: int) -> Dict[str, Any]:
+        return {
+            "name": f"Fixture Product {self.run_token}-{index}",
+            "description": f"Provisioned fixture product {index}",
+            "price": round(1 + index * 0.25, 2),
+        }
+
+    # --- provisioning ---
+    def _create_via_api(self, kind: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if kind == "users":
+            from PageClasses.UserRegistrationAPIPage import UserRegistrationAPIPage
+            page = AsyncAPIPage(UserRegistrationAPIPage(self.api_base_url, self.db_config, None))
+            calls = [page.register_user_api({k: v for k, v in r.items() if k != "accountStatus"}) for r in records]
+        else:
+            from PageClasses.ProductInsertAPIPage import ProductInsertAPIPage
+            product_page = ProductInsertAPIPage(self.db_config, session=APISessionPool.get_session(self.api_base_url))
+            product_page.BASE_URL = self.api_base_url
+            page = AsyncAPIPage(product_page)
+            calls = [page.insert_product_api(r) for r in records]
+        results = AsyncAPIPage.run(AsyncAPIPage.gather(*calls, return_exceptions=True))
+        id_field = "userId" if kind == "users" else "id"
+        created = []
+        for record, result in zip(records, results):
+            if isinstance(result, Exception):
+                self.last_errors.append(f"{kind} {record.get('username', record.get('name'))}: {result}")
+                continue
+            created.append({**record, id_field: result.get(id_field)})
+        return created
+
+    def _db_row(self, kind: str, record: Dict[str, Any], fields: List[str]) -> tuple:
+        if kind == "users":
+            record = {**record, "passwordHash": self.password_hasher(record["password"])}
+        return tuple(record.get(f) for f in fields)
+
+    def _create_via_db(self, kind: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        columns = self.user_db_columns if kind == "users" else self.product_db_columns
+        table = "users" if kind == "users" else "products"
+        fields = list(columns)
+        sql = (f"INSERT INTO {table} ({', '.join(columns[f] for f in fields)}) "
+               f"VALUES ({', '.join(['%s'] * len(fields))})")
+        id_field, key_field = self.DB_KEYS[kind]
+        key_column = columns.get(key_field, key_field)
+        created = [dict(r) for r in records]
+        with DBConnectionPool.connection(self.db_config) as conn:
+            with conn.cursor() as cursor:
+                for start in range(0, len(created), self.DB_CHUNK_SIZE):
+                    chunk = created[start:start + self.DB_CHUNK_SIZE]
+                    cursor.executemany(sql, [self._db_row(kind, r, fields) for r in chunk])
+                    # lastrowid after executemany is not reliable for every row, so read the keys back.
+                    cursor.execute(f"SELECT {id_field}, {key_column} FROM {table} "
+                                   f"WHERE {key_column} IN ({', '.join(['%s'] * len(chunk))})",
+                                   [r[key_field] for r in chunk])
+                    ids = {}
+                    for row in cursor.fetchall():
+                        row_id, key = (row[id_field], row[key_column]) if isinstance(row, dict) else row[:2]
+                        ids[key] = row_id
+                    for record in chunk:
+                        record[id_field] = ids.get(record[key_field])
+            conn.commit()
+        return created
+
+    def provision(self, kind: str, count: int, via: str = "api") -> List[Dict[str, Any]]:
+        """
+        Creates ``count`` new users or products concurrently.
+        Args:
+            kind (str): "users" or "products".
+            count (int): Number of records to create.
+            via (str): "api" (default) or "db" for a direct bulk insert.
+        Returns:
+            list: Successfully created records.
+        """
+        assert kind in ("users", "products"), f"Unknown fixture kind: {kind}"
+        assert via in ("api", "db"), f"Unknown provisioning mode: {via}"
+        assert not (kind == "users" and via == "db" and self.password_hasher is None), \
+            "Users inserted via DB would have no password hash: pass password_hasher or provision them via the API"
+        factory = self.make_user if kind == "users" else self.make_product
+        if count <= 0:
+            return []
+        with self._lock:
+            state = self._load_state()
+            counters = state.setdefault(self.COUNTER_KEY, {})
+            offset = max(counters.get(kind, 0), len(state.get(kind, [])))
+            counters[kind] = offset + count
+            self._save_state(state)
+        records = [factory(offset + i) for i in range(count)]
+        created = self._create_via_db(kind, records) if via == "db" else self._create_via_api(kind, records)
+        with self._lock:
+            state = self._load_state()
+            state.setdefault(kind, []).extend(created)
+            self._save_state(state)
+        return created
+
+    def pool(self, kind: str, size: int, via: str = "api") -> FixturePool:
+        """
+        Returns a FixturePool of ``size`` records, recycling persisted ones (after ``reset``) before creating new ones.
+        """
+        with self._lock:
+            recycled = self._load_state().get(kind, [])[:size]
+        if recycled and self.reset is not None:
+            self.reset(kind, recycled)
+        created = self.provision(kind, size - len(recycled), via=via) if len(recycled) < size else []
+        return FixturePool(recycled + created)
+
+    # --- persistence ---
+    def _load_state(self) -> Dict[str, Any]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return self._memory_state
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        if not self.state_path:
+            self._memory_state = state
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, default=str)
+        os.replace(tmp_path, self.state_path)
+
+    def forget(self, kind: str, records: Sequence[Dict[str, Any]]) -> None:
+        """
+        Removes records from the persisted pool (e.g. after they were deleted from the backend).
+        """
+        keys = {json.dumps(r, sort_keys=True, default=str) for r in records}
+        with self._lock:
+            state = self._load_state()
+            state[kind] = [r for r in state.get(kind, []) if json.dumps(r, sort_keys=True, default=str) not in keys]
+            self._save_state(state)
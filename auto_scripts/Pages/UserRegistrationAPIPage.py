@@ -1,5 +1,5 @@
-import requests
 import re
+from auto_scripts.Pages.APISessionPool import APISessionPool
 
 class UserRegistrationAPIPage:
     """
@@ -13,6 +13,13 @@ class UserRegistrationAPIPage:
 
     EMAIL_REGEX = r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"
 
+    def __init__(self, session=None):
+        """
+        Args:
+            session (requests.Session, optional): HTTP session; defaults to the shared APISessionPool session.
+        """
+        self.session = session or APISessionPool.get_session(self.REGISTER_API_URL)
+
     @staticmethod
     def is_valid_email(email):
         """
@@ -39,7 +46,7 @@ class UserRegistrationAPIPage:
         except AssertionError as e:
             return {"status": "invalid_email_format", "message": str(e)}
         reg_headers = {"Content-Type": "application/json"}
-        reg_resp = requests.post(self.REGISTER_API_URL, json=user_data, headers=reg_headers, timeout=10)
+        reg_resp = self.session.post(self.REGISTER_API_URL, json=user_data, headers=reg_headers, timeout=10)
         if reg_resp.status_code in [200, 201]:
             response_json = reg_resp.json() if reg_resp.content else {}
             self.DB_SIMULATION[user_data["username"]] = user_data["email"]
@@ -61,14 +68,14 @@ class UserRegistrationAPIPage:
         """
         self._validate_user_data(user_data)
         reg_headers = {"Content-Type": "application/json"}
-        reg_resp = requests.post(self.REGISTER_API_URL, json=user_data, headers=reg_headers, timeout=10)
+        reg_resp = self.session.post(self.REGISTER_API_URL, json=user_data, headers=reg_headers, timeout=10)
         assert reg_resp.status_code in [200, 201], f"User registration failed: {reg_resp.text}"
         response_json = reg_resp.json() if reg_resp.content else {}
         self.DB_SIMULATION[user_data["username"]] = user_data["email"]
         self.DB_EMAIL_SIM[user_data["email"]] = user_data["username"]
         login_payload = {"username": user_data["username"], "password": user_data["password"]}
         login_headers = {"Content-Type": "application/json"}
-        login_resp = requests.post(self.LOGIN_API_URL, json=login_payload, headers=login_headers, timeout=10)
+        login_resp = self.session.post(self.LOGIN_API_URL, json=login_payload, headers=login_headers, timeout=10)
         assert login_resp.status_code == 200, f"Login after registration failed: {login_resp.text}"
         jwt_token = login_resp.json().get("token")
         assert jwt_token, "JWT token not found in login response."
@@ -2,6 +2,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from auto_scripts.Pages.SMTPCaptureSink import Mailbox
+
 class UsernameRecoveryPage:
     """
     Page Object for the 'Forgot Username' workflow.
@@ -18,6 +20,7 @@ class UsernameRecoveryPage:
     3. Use get_confirmation_message(), get_error_message(), get_recovered_username() for validation.
     4. For TC_LOGIN_003, use recover_username(email).
     5. For TC_SCRUM74_009, use verify_recovery_page_elements() to strictly validate elements.
+    6. With a Mailbox (SMTPCaptureSink), wait_for_username_email(email) returns the recovery email sent after submit.
 
     QA Report:
     - All locators validated against locators.json.
@@ -41,9 +44,13 @@ class UsernameRecoveryPage:
     INSTRUCTIONS_TEXT = (By.CSS_SELECTOR, "div.recovery-instructions")
     USERNAME_RESULT = (By.CSS_SELECTOR, "span.recovered-username")
 
-    def __init__(self, driver, timeout=10):
+    EMAIL_TIMEOUT = 30
+
+    def __init__(self, driver, timeout=10, mailbox: Mailbox = None):
         self.driver = driver
         self.wait = WebDriverWait(driver, timeout)
+        self.mailbox = mailbox
+        self.mailbox_mark = mailbox.mark() if mailbox is not None else 0
 
     def go_to_username_recovery(self):
         self.driver.get(self.URL)
@@ -57,6 +64,8 @@ class UsernameRecoveryPage:
 
     def submit_recovery(self):
         submit_btn = self.wait.until(EC.element_to_be_clickable(self.SUBMIT_BUTTON))
+        if self.mailbox is not None:
+            self.mailbox_mark = self.mailbox.mark()
         submit_btn.click()
 
     def get_confirmation_message(self):
@@ -80,6 +89,18 @@ class UsernameRecoveryPage:
         except:
             return None
 
+    def wait_for_username_email(self, email, timeout=None):
+        """
+        Waits for the username recovery email sent to ``email`` after the last submit.
+        Returns:
+            CapturedMessage: The captured email (subject, text, html, links()).
+        Raises:
+            AssertionError: If no email arrives before the deadline or no mailbox is configured.
+        """
+        assert self.mailbox is not None, "No mailbox configured; pass an SMTPCaptureSink mailbox to the page."
+        return self.mailbox.wait_for(recipient=email, after_id=self.mailbox_mark,
+                                     timeout=timeout or self.EMAIL_TIMEOUT, name="username recovery email received")
+
     def recover_username(self, email):
         self.go_to_username_recovery()
         self.enter_email(email)
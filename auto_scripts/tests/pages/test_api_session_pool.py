@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from auto_scripts.Pages.APISessionPool import APISessionPool
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    APISessionPool.close_all()
+    yield
+    APISessionPool.close_all()
+
+
+def test_sessions_share_connections_but_not_cookies():
+    first = APISessionPool.get_session("https://shop.example.test/api/auth/login")
+    second = APISessionPool.get_session("https://SHOP.example.test/api/cart")
+    assert first is not second
+    assert first.get_adapter("https://shop.example.test/") is second.get_adapter("https://shop.example.test/")
+    first.cookies.set("sessionid", "abc", domain="shop.example.test")
+    assert "sessionid" not in second.cookies
+
+
+def test_hosts_get_separate_adapters():
+    shop = APISessionPool.get_session("https://shop.example.test")
+    auth = APISessionPool.get_session("https://auth.example.test")
+    assert shop.get_adapter("https://shop.example.test/") is not auth.get_adapter("https://auth.example.test/")
+
+
+def test_closing_a_session_keeps_the_shared_pool_open():
+    first = APISessionPool.get_session("https://shop.example.test")
+    adapter = first.get_adapter("https://shop.example.test/")
+    pool = adapter.poolmanager.connection_from_url("https://shop.example.test/")
+    first.close()
+    assert adapter.poolmanager.connection_from_url("https://shop.example.test/") is pool
+
+
+def test_default_timeout_applies_to_new_sessions():
+    APISessionPool.configure(default_timeout=3)
+    try:
+        assert APISessionPool.get_session("https://shop.example.test").default_timeout == 3
+    finally:
+        APISessionPool.configure(default_timeout=10)
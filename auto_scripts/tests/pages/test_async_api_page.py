@@ -0,0 +1,110 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("requests")
+
+from auto_scripts.Pages.AsyncAPIPage import AsyncAPIPage
+
+
+class _Page:
+    base_url = "https://shop.test"
+
+    def __init__(self, barrier=None):
+        self.barrier = barrier
+        self.threads = []
+
+    def add(self, a, b=0):
+        """Adds two numbers."""
+        self.threads.append(threading.current_thread().name)
+        if self.barrier is not None:
+            self.barrier.wait()
+        return a + b
+
+    def fail(self, message):
+        raise ValueError(message)
+
+    def _helper(self):
+        return "private"
+
+
+@pytest.fixture(autouse=True)
+def shutdown():
+    yield
+    AsyncAPIPage.shutdown()
+
+
+def test_public_methods_become_coroutines_on_the_worker_pool():
+    page = AsyncAPIPage(_Page())
+    assert asyncio.iscoroutinefunction(page.add) and page.add.__doc__ == "Adds two numbers."
+    assert page.base_url == "https://shop.test" and page._helper() == "private"
+    assert AsyncAPIPage.run(page.add(2, b=3)) == 5
+    assert page.page.threads[0].startswith("async-api-page")
+    with pytest.raises(AttributeError):
+        page.missing
+
+
+def test_gather_runs_calls_concurrently_and_keeps_order():
+    page = AsyncAPIPage(_Page(barrier=threading.Barrier(3, timeout=5)))
+    # Each call blocks until all three are running, so this only completes if they run concurrently.
+    assert AsyncAPIPage.run(AsyncAPIPage.gather(page.add(1), page.add(2), page.add(3))) == [1, 2, 3]
+    assert len(set(page.page.threads)) == 3
+
+
+def test_exceptions_propagate_or_are_returned():
+    page = AsyncAPIPage(_Page())
+    with pytest.raises(ValueError, match="boom"):
+        AsyncAPIPage.run(AsyncAPIPage.gather(page.add(1), page.fail("boom")))
+    results = AsyncAPIPage.run(AsyncAPIPage.gather(page.add(1), page.fail("boom"), return_exceptions=True))
+    assert results[0] == 1 and isinstance(results[1], ValueError)
+
+
+def test_shutdown_closes_the_loop_and_stops_the_pool():
+    page = AsyncAPIPage(_Page())
+    AsyncAPIPage.run(page.add(1))
+    loop, executor = AsyncAPIPage.event_loop(), AsyncAPIPage.executor()
+    AsyncAPIPage.shutdown()
+    assert loop.is_closed() and AsyncAPIPage._loop is None and AsyncAPIPage._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+    assert AsyncAPIPage.run(page.add(2)) == 2  # a new loop and pool are created on demand
+    assert AsyncAPIPage.event_loop() is not loop
+
+
+def test_product_search_concurrent_workflow():
+    pytest.importorskip("pymysql")
+    from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+    from auto_scripts.Pages.ProductSearchAPIPage import ProductSearchAPIPage
+    from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+
+    products = [{"id": i, "name": f"P{i}", "price": i, "description": "d", "category": "c", "imageUrl": "u"}
+                for i in range(1, 6)]
+
+    class _Response:
+        status_code = 200
+        content = json.dumps(products).encode()
+
+        def json(self):
+            return json.loads(self.content)
+
+    class _Session:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get(self, url, params=None, timeout=None):
+            self.barrier.wait()  # both searches must be in flight at once
+            return _Response()
+
+    db = StandInDatabase()
+    db.seed({"products": [{"name": p["name"], "description": "d", "price": p["price"]} for p in products]})
+    db.install()
+    try:
+        db_config = {"host": "stand-in", "user": "test", "password": "", "database": "shop"}
+        results = ProductSearchAPIPage(db_config, session=_Session()).run_tc_scrum96_009_concurrent()
+    finally:
+        DBConnectionPool.close_all()
+        db.close()
+    assert results["overall_pass"], results["exception"]
+    assert results["step_1_db_product_count"] == 5
+    assert results["step_2_api_empty_query"]["message"] == "Returned 5 products"
@@ -0,0 +1,42 @@
+import pytest
+
+from auto_scripts.Pages import SQLiteStandIn as stand_in_driver
+from auto_scripts.Pages.BatchQuery import BatchQuery
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+
+DB_CONFIG = {"host": "stand-in", "user": "test", "password": "", "database": "shop"}
+
+
+@pytest.fixture
+def stand_in():
+    db = StandInDatabase()
+    db.seed({"users": [{"username": f"user{i}", "email": f"user{i}@example.com"} for i in range(7)]})
+    db.install()
+    yield db
+    DBConnectionPool.close_all()
+    db.close()
+
+
+def test_rows_by_keys_chunks_and_skips_missing(stand_in):
+    wanted = ["user1", "user5", "user1", "ghost", "user6"]
+    rows = BatchQuery.rows_by_keys(DB_CONFIG, "users", "username", wanted, columns=["email", "username"],
+                                   chunk_size=2)
+    assert rows == {"user1": ("user1@example.com", "user1"), "user5": ("user5@example.com", "user5"),
+                    "user6": ("user6@example.com", "user6")}
+    dict_rows = BatchQuery.rows_by_keys(DB_CONFIG, "users", "username", ["user2"],
+                                        cursorclass=stand_in_driver.cursors.DictCursor)
+    assert dict_rows["user2"]["account_status"] == "ACTIVE"
+    assert BatchQuery.rows_by_keys(DB_CONFIG, "users", "username", []) == {}
+    with pytest.raises(AssertionError):
+        BatchQuery.rows_by_keys(DB_CONFIG, "users; DROP TABLE users", "username", ["x"])
+
+
+def test_compare_records():
+    expected = {1: {"email": "a@x", "price": 10}, 2: {"email": "b@x"}, 3: {"email": "c@x"}}
+    actual = {1: {"email": "a@x", "price": "10", "password": "h"}, 2: {"email": "B@x"}}
+    results = BatchQuery.compare_records(expected, actual, ["email", "price"], forbidden=["password"])
+    assert results[1]["mismatches"] == ["Field 'password' should not be present."]
+    assert results[2]["mismatches"] == ["Mismatch in field 'email': expected=b@x, actual=B@x",
+                                        "Missing field 'price' in comparison."]
+    assert results[3] == {"match": False, "missing": True, "mismatches": ["record not found"]}
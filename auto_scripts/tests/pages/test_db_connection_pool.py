@@ -0,0 +1,70 @@
+import pytest
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+
+
+@pytest.fixture
+def database():
+    db = StandInDatabase()
+    yield db.database
+    db.close()
+
+
+def _pool(database, **settings):
+    return DBConnectionPool("sqlite", {"database": database}, **settings)
+
+
+def test_connections_are_reused_and_rolled_back(database):
+    pool = _pool(database)
+    with pool.borrow() as first:
+        with first.cursor() as cursor:
+            cursor.execute("INSERT INTO products (name, price) VALUES (%s, %s)", ("uncommitted", 1))
+    with pool.borrow() as second:
+        with second.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM products")
+            assert cursor.fetchone() == (0,)
+    assert second is first
+    pool.close()
+
+
+def test_pool_is_bounded(database):
+    pool = _pool(database, max_size=1, acquire_timeout=0.05)
+    with pool.borrow():
+        with pytest.raises(TimeoutError, match="max_size=1"):
+            with pool.borrow():
+                pass
+    with pool.borrow():
+        pass
+    pool.close()
+
+
+def test_broken_stale_and_idle_connections_are_replaced(database):
+    pool = _pool(database, health_check_after=0.0)
+    with pytest.raises(pool.module.Error):
+        with pool.borrow() as broken:
+            with broken.cursor() as cursor:
+                cursor.execute("SELECT * FROM missing_table")
+    with pool.borrow() as fresh:
+        assert fresh is not broken
+    fresh.close()  # dies while idle; the health check must notice
+    with pool.borrow() as replacement:
+        assert replacement is not fresh and not replacement.closed
+    expiring = _pool(database, idle_timeout=0.0)
+    with expiring.borrow() as first:
+        pass
+    with expiring.borrow() as second:
+        assert second is not first and first.closed
+    pool.close()
+    expiring.close()
+
+
+def test_registry_shares_pools_per_config(database):
+    DBConnectionPool.use_stand_in(database)
+    try:
+        a = DBConnectionPool.for_config({"host": "a"})
+        assert DBConnectionPool.for_config({"host": "b"}) is a  # everything routes to the stand-in
+        assert DBConnectionPool.for_config({"host": "a"}, cursorclass=dict) is not a
+    finally:
+        DBConnectionPool.use_stand_in(None)
+    assert DBConnectionPool._pools == {}
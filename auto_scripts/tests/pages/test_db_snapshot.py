@@ -0,0 +1,90 @@
+from array import array
+
+import pytest
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.DBSnapshot import DBSnapshot
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+from auto_scripts.Pages.TableIntegrityChecker import TableIntegrityChecker
+
+DB_CONFIG = {"host": "stand-in", "user": "test", "password": "", "database": "shop"}
+
+
+@pytest.fixture
+def stand_in():
+    db = StandInDatabase()
+    db.seed({"products": [{"name": f"P{i}", "description": "seed", "price": i} for i in range(1, 31)]})
+    db.install()
+    yield db
+    DBConnectionPool.close_all()
+    db.close()
+
+
+def _execute(sql, params=()):
+    with DBConnectionPool.connection(DB_CONFIG) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+        conn.commit()
+
+
+def _snapshot():
+    return DBSnapshot(DB_CONFIG, {"products": ["name", "description", "price"]}, chunk_size=8)
+
+
+def test_diff_classifies_row_changes(stand_in):
+    snapshot = _snapshot()
+    before = snapshot.capture()
+    assert before["products"]["row_count"] == 30 and len(before["products"]["keys"]) == 30
+    _execute("UPDATE products SET price = %s WHERE id = %s", (99, 5))
+    _execute("DELETE FROM products WHERE id = %s", (17,))
+    _execute("INSERT INTO products (name, description, price) VALUES (%s, %s, %s)", ("New", "d", 1))
+    diff = snapshot.diff(before)["products"]
+    assert (diff["updated"], diff["deleted"], diff["inserted"]) == ([5], [17], [31])
+    assert diff["row_count_after"] == 30
+    with pytest.raises(AssertionError, match="1 rows updated"):
+        DBSnapshot.assert_unchanged({"products": diff})
+    DBSnapshot.assert_unchanged({"products": diff}, allow={"products": ["*"]})
+
+
+def test_diff_scoped_to_own_rows_ignores_parallel_writers(stand_in):
+    snapshot = _snapshot()
+    before = snapshot.capture()
+    _execute("UPDATE products SET price = %s WHERE id = %s", (99, 5))
+    _execute("INSERT INTO products (name, description, price) VALUES (%s, %s, %s)", ("Other test", "d", 1))
+    DBSnapshot.assert_unchanged(snapshot.diff(before, keys={"products": [6, 20]}))
+    _execute("UPDATE products SET name = %s WHERE id = %s", ("tampered", 20))
+    scoped = snapshot.diff(before, keys={"products": [6, 20]})["products"]
+    assert scoped["changed"] and scoped["updated"] == [20] and scoped["counts"]["updated"] == 1
+
+
+def test_allow_keys_permits_only_the_named_rows(stand_in):
+    snapshot = _snapshot()
+    before = snapshot.capture()
+    _execute("INSERT INTO products (name, description, price) VALUES (%s, %s, %s)", ("Own", "d", 1))
+    DBSnapshot.assert_unchanged(snapshot.diff(before), allow_keys={"products": {"inserted": [31]}})
+    _execute("INSERT INTO products (name, description, price) VALUES (%s, %s, %s)", ("Other", "d", 1))
+    with pytest.raises(AssertionError, match=r"1 rows inserted \[32\]"):
+        DBSnapshot.assert_unchanged(snapshot.diff(before), allow_keys={"products": {"inserted": [31]}})
+    with pytest.raises(AssertionError, match="2 rows inserted"):
+        DBSnapshot.assert_unchanged(snapshot.diff(before), allow_keys={"products": {"updated": [31, 32]}})
+
+
+def test_key_storage_fits_the_key_range(stand_in):
+    assert isinstance(DBSnapshot._key_store(0, (1 << 64) - 1), array)
+    assert DBSnapshot._key_store(0, (1 << 64) - 1).typecode == "Q"
+    assert DBSnapshot._key_store(-1, 10).typecode == "q"
+    assert DBSnapshot._key_store(-1, 1 << 63) == []
+    _execute("INSERT INTO products (id, name, description, price) VALUES (%s, %s, %s, %s)", (-3, "Neg", "d", 1))
+    before = _snapshot().capture()["products"]
+    assert before["keys"].typecode == "q" and before["keys"][0] == -3
+
+
+def test_consistent_read_shares_one_connection(stand_in):
+    checker = TableIntegrityChecker(DB_CONFIG, "products", ["name", "description", "price"], chunk_size=8)
+    with checker.consistent_read() as conn:
+        count, lo, hi = checker.key_stats(conn)
+        chunks = checker._range_checksums(None, None, checker.chunk_size, conn=conn)
+        streamed = list(checker.stream_row_hashes(conn=conn))
+    assert (count, lo, hi) == (30, 1, 30)
+    assert sum(rows for rows, _ in chunks.values()) == len(streamed) == 30
+    assert [key for key, _ in streamed] == list(range(1, 31))
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.EventualConsistency import AwaitCondition, ConsistencyTimeout
+from auto_scripts.Pages.LogReader import LogReader
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+
+DB_CONFIG = {"host": "stand-in", "user": "test", "password": "", "database": "shop"}
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    AwaitCondition.reset_metrics()
+    yield
+    AwaitCondition.reset_metrics()
+
+
+def test_until_retries_ignored_errors_and_records_metrics():
+    calls = []
+
+    def probe():
+        calls.append(1)
+        if len(calls) < 3:
+            raise AssertionError("not yet")
+        return "ready"
+
+    assert AwaitCondition.until(probe, "eventually ready", timeout=5, initial_delay=0.001) == "ready"
+    with pytest.raises(ConsistencyTimeout) as info:
+        AwaitCondition.until(lambda: None, "never ready", timeout=0.05, initial_delay=0.01)
+    assert info.value.attempts >= 2
+    with pytest.raises(ValueError):
+        AwaitCondition.until(lambda: int("x"), "broken probe", timeout=1)
+    metrics = AwaitCondition.metrics()
+    assert metrics["eventually ready"]["count"] == 1 and metrics["eventually ready"]["timeouts"] == 0
+    assert metrics["never ready"] == {"count": 0, "timeouts": 1}
+
+
+def test_db_row_probe_waits_for_a_late_write():
+    db = StandInDatabase().install()
+    try:
+        def insert():
+            with DBConnectionPool.connection(DB_CONFIG) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("INSERT INTO products (name, price) VALUES (%s, %s)", ("late", 1))
+                conn.commit()
+
+        threading.Timer(0.05, insert).start()
+        probe = AwaitCondition.db_row(DB_CONFIG, "SELECT name FROM products WHERE name = %s", ("late",))
+        assert AwaitCondition.until(probe, "late product", timeout=5, initial_delay=0.01) == ("late",)
+    finally:
+        DBConnectionPool.close_all()
+        db.close()
+
+
+def test_log_line_probe_respects_from_end(tmp_path):
+    path = tmp_path / "mail.log"
+    path.write_text("sent to old@example.com\n", encoding="utf-8")
+    try:
+        from_start = AwaitCondition.log_line(str(path), lambda line: "old@" in line)
+        from_end = AwaitCondition.log_line(str(path), lambda line: "@example.com" in line, from_end=True)
+        assert from_start() == "sent to old@example.com"
+        assert from_end() is None
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("sent to new@example.com\n")
+        assert from_end() == "sent to new@example.com"
+    finally:
+        LogReader.close_all()
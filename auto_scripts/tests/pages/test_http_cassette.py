@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+pytest.importorskip("requests")
+
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.HTTPCassette import CassetteMissError, HTTPCassette
+
+URL = "https://shop.example.test/api/products/search"
+
+
+class _Recorded:
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, body):
+        self.text = json.dumps(body)
+        self.content = self.text.encode("utf-8")
+
+
+def _cassette(tmp_path, body):
+    path = str(tmp_path / "cassette.json")
+    with HTTPCassette(path, mode="record") as recorder:
+        recorder.record("GET", URL, _Recorded(body), params={"q": "book"})
+    return path
+
+
+def test_replay_streams_the_recorded_body(tmp_path):
+    body = {"products": [{"id": i, "name": f"Book {i}"} for i in range(50)], "token": "secret"}
+    path = _cassette(tmp_path, body)
+    with HTTPCassette(path, mode="replay"):
+        response = APISessionPool.get_session(URL).get(URL, params={"q": "book"}, stream=True)
+        streamed = b"".join(response.iter_content(chunk_size=64))
+        text = "".join(response.iter_content(chunk_size=64, decode_unicode=True))
+        response.close()
+    replayed = json.loads(streamed)
+    assert replayed["products"] == body["products"]
+    assert replayed["token"] != "secret"
+    assert json.loads(text) == replayed
+    assert response.raw is not None
+
+
+def test_replay_miss_raises(tmp_path):
+    path = _cassette(tmp_path, {"products": []})
+    with HTTPCassette(path, mode="replay"):
+        with pytest.raises(CassetteMissError):
+            APISessionPool.get_session(URL).get(URL, params={"q": "other"})
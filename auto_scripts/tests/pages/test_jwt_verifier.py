@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+
+from auto_scripts.Pages.JWTVerifier import KeySetCache, TokenVerifier
+
+SECRET = "unit-test-secret-of-sufficient-length"
+
+
+def _rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def test_verified_payload_is_cached_until_exp():
+    verifier = TokenVerifier(keys=KeySetCache())
+    token = jwt.encode({"sub": "u1", "exp": int(time.time()) + 60}, SECRET, algorithm="HS256")
+    assert verifier.verify(token, secret=SECRET)["sub"] == "u1"
+    assert verifier.verify(token, secret=SECRET)["sub"] == "u1"
+    assert verifier.stats()["hits"] == 1
+
+
+def test_cached_payload_past_exp_raises():
+    verifier = TokenVerifier(keys=KeySetCache())
+    token = jwt.encode({"sub": "u1", "exp": int(time.time()) + 1}, SECRET, algorithm="HS256")
+    verifier.verify(token, secret=SECRET)
+    time.sleep(1.1)
+    with pytest.raises(AssertionError, match="expired"):
+        verifier.verify(token, secret=SECRET)
+
+
+def test_wrong_secret_is_not_served_from_cache():
+    verifier = TokenVerifier(keys=KeySetCache())
+    token = jwt.encode({"sub": "u1", "exp": int(time.time()) + 60}, SECRET, algorithm="HS256")
+    verifier.verify(token, secret=SECRET)
+    with pytest.raises(AssertionError):
+        verifier.verify(token, secret=SECRET + "-other")
+
+
+def test_key_objects_are_identified_by_public_key_not_id():
+    verifier = TokenVerifier(keys=KeySetCache())
+    signer, other = _rsa_key(), _rsa_key()
+    token = jwt.encode({"sub": "u1", "exp": int(time.time()) + 60}, signer, algorithm="RS256")
+    verifier.verify(token, public_key=signer.public_key())
+    # The temporary key object above is collected; a new one may reuse its id() and must not hit the cache.
+    with pytest.raises(AssertionError):
+        verifier.verify(token, public_key=other.public_key())
+    assert verifier.verify(token, public_key=signer.public_key())["sub"] == "u1"
+    assert verifier.stats()["hits"] == 1
+
+
+def test_verify_batch_keeps_order_and_isolates_failures():
+    verifier = TokenVerifier(keys=KeySetCache())
+    token = jwt.encode({"sub": "u1", "exp": int(time.time()) + 60}, SECRET, algorithm="HS256")
+    results = verifier.verify_batch([token, "not-a-jwt", token], secret=SECRET)
+    assert [r.payload["sub"] if r.payload else None for r in results] == ["u1", None, "u1"]
+    assert results[1].error is not None
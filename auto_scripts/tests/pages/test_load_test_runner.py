@@ -0,0 +1,119 @@
+import importlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("requests")
+
+from auto_scripts.Pages.APISessionPool import APISessionPool
+from auto_scripts.Pages.AsyncAPIPage import AsyncAPIPage
+from auto_scripts.Pages.LoadTestRunner import LoadMetrics, LoadTestRunner
+
+PRODUCTS = [{"id": i, "name": f"P{i}", "price": i, "description": "d", "category": "c", "imageUrl": "u"}
+            for i in range(1, 4)]
+
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    status = None
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        parts = urlsplit(self.path)
+        if self.status is not None:
+            status, body = self.status, {"error": "backend down"}
+        elif "query" in parse_qs(parts.query, keep_blank_values=True):
+            status, body = 200, PRODUCTS
+        else:
+            status, body = 400, {"error": "query is required"}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def shop():
+    handler = type("Handler", (_SearchHandler,), {})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield handler, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    APISessionPool.close_all()
+    AsyncAPIPage.shutdown()
+
+
+def test_cart_journey_page_imports_from_the_package():
+    module = importlib.import_module("auto_scripts.Pages.CartAPIPage")
+    assert module.JWTUtils.__module__ == "auto_scripts.Pages.JWTUtils"
+
+
+def test_load_metrics_aggregate_per_key():
+    metrics = LoadMetrics()
+    metrics.ERROR_SAMPLE_SIZE = 2
+    for elapsed, error, status in [(0.010, None, 200), (0.020, None, 200), (0.030, "HTTP 503", 503),
+                                   (0.040, "timeout", None), (0.050, "HTTP 500", 500)]:
+        metrics.record("GET /api/cart", elapsed, error, status)
+    metrics.record("POST /api/cart", 0.001, status_code=201)
+    report = metrics.report(elapsed_seconds=2.0)
+    cart = report["GET /api/cart"]
+    assert list(report) == ["GET /api/cart", "POST /api/cart"]
+    assert (cart["count"], cart["errors"], cart["error_rate"], cart["throughput_rps"]) == (5, 3, 0.6, 2.5)
+    assert cart["status_codes"] == {"200": 2, "500": 1, "503": 1}
+    assert cart["min_ms"] == pytest.approx(10, rel=0.02) and cart["max_ms"] == pytest.approx(50, rel=0.02)
+    assert metrics.error_samples == ["GET /api/cart: HTTP 503", "GET /api/cart: timeout"]
+    assert metrics.report(elapsed_seconds=0)["POST /api/cart"]["throughput_rps"] == 0.0
+
+
+def test_endpoint_key_collapses_ids_and_drops_the_query():
+    runner = LoadTestRunner("search")
+    assert runner.endpoint_key("get", "http://h/api/users/123/cart?x=1") == "GET /api/users/:id/cart"
+    assert runner.endpoint_key("DELETE", "http://h/api/cart/3f2a9c1e-7b4d") == "DELETE /api/cart/:id"
+    assert runner.endpoint_key("get", "http://h/api/v2/products") == "GET /api/v2/products"
+    assert runner.endpoint_key("get", "http://h") == "GET /"
+    with pytest.raises(ValueError, match="Unknown journey"):
+        LoadTestRunner("checkout")
+
+
+def test_closed_model_runs_each_user_for_its_iterations(shop):
+    _, base_url = shop
+    report = LoadTestRunner("search", base_url=base_url, concurrency=3, iterations=2, duration=30).run()
+    assert report["mode"] == "closed" and report["dropped_arrivals"] == 0
+    assert (report["journeys_completed"], report["journeys_failed"]) == (6, 0), report["error_samples"]
+    search = report["endpoints"]["GET /api/products/search"]
+    assert search["count"] == 12 and search["errors"] == 0  # the expected 400s are not errors
+    assert search["status_codes"] == {"200": 6, "400": 6}
+
+
+def test_open_model_counts_arrivals_without_a_free_slot(shop):
+    handler, base_url = shop
+    handler.delay = 0.1
+    report = LoadTestRunner("search", base_url=base_url, concurrency=1, arrival_rate=50, duration=0.4).run()
+    assert report["mode"] == "open" and report["arrival_rate"] == 50
+    assert report["journeys_completed"] >= 1 and report["journeys_failed"] == 0
+    assert report["dropped_arrivals"] > 0
+    assert 18 <= report["journeys_completed"] + report["dropped_arrivals"] <= 21
+
+
+def test_server_errors_are_counted_not_raised(shop):
+    handler, base_url = shop
+    handler.status = 500
+    APISessionPool.configure(resilient=False)
+    try:
+        report = LoadTestRunner("search", base_url=base_url, concurrency=2, iterations=1, duration=30).run()
+    finally:
+        APISessionPool.configure(resilient=True)
+    assert (report["journeys_completed"], report["journeys_failed"]) == (2, 2)
+    assert report["endpoints"]["GET /api/products/search"]["errors"] == 2
+    assert any("HTTP 500" in sample for sample in report["error_samples"])
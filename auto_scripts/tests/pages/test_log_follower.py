@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+
+import pytest
+
+from auto_scripts.Pages import LogFollower as follower_module
+from auto_scripts.Pages.EventualConsistency import ConsistencyTimeout
+from auto_scripts.Pages.LogFollower import LogFollower
+from auto_scripts.Pages.LogReader import LogReader
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("first\n", encoding="utf-8")
+    yield path
+    LogReader.close_all()
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _later(delay, func, *args):
+    timer = threading.Timer(delay, func, args)
+    timer.start()
+    return timer
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def _inotify_available(directory):
+    try:
+        follower_module._Inotify(str(directory)).close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+def test_follower_wakes_waiters_on_append(log_path):
+    follower = LogFollower(str(log_path), fallback_interval=0.02, poll_interval=0.05)
+    _later(0.1, _append, log_path, "noise\nregistration success for a@b.test\n")
+    line = follower.wait_for(lambda l: "registration success" in l, timeout=5)
+    assert line == "registration success for a@b.test"
+    with pytest.raises(ConsistencyTimeout):
+        follower.wait_for(lambda l: "never" in l, timeout=0.2)
+    since = LogReader.for_path(str(log_path)).mark(at_start=True)
+    assert follower.wait_for(lambda l: l == "first", timeout=1, since=since) == "first"
+
+
+def test_inotify_wakes_the_follower_before_the_safety_net_poll(log_path):
+    if not _inotify_available(log_path.parent):
+        pytest.skip("inotify is not available on this platform")
+    follower = LogFollower(str(log_path), poll_interval=30)
+    _later(0.1, _append, log_path, "ready\n")
+    started = time.monotonic()
+    assert follower.wait_for(lambda l: l == "ready", timeout=10) == "ready"
+    assert follower.notifications == "inotify" and time.monotonic() - started < 5
+
+
+def test_polling_fallback_without_inotify(log_path, monkeypatch):
+    def unavailable(directory):
+        raise OSError("inotify_init1 failed")
+
+    monkeypatch.setattr(follower_module, "_Inotify", unavailable)
+    follower = LogFollower(str(log_path), fallback_interval=0.02)
+    _later(0.1, _append, log_path, "ready\n")
+    assert follower.wait_for(lambda l: l == "ready", timeout=5) == "ready"
+    assert follower.notifications == "polling"
+
+
+def test_waiters_share_one_follower_thread(log_path):
+    follower = LogFollower(str(log_path), fallback_interval=0.02, poll_interval=0.05)
+    results = {}
+
+    def wait(word):
+        results[word] = follower.wait_for(lambda l: word in l, timeout=5)
+
+    waiters = [threading.Thread(target=wait, args=(word,)) for word in ("alpha", "beta", "gamma")]
+    for waiter in waiters:
+        waiter.start()
+    _wait_until(lambda: len(follower._waiters) == 3)
+    following = [t for t in threading.enumerate() if t.name == f"LogFollower:{log_path}"]
+    assert len(following) == 1 and following[0] is follower._thread
+    _append(log_path, "gamma 1\nalpha 2\nbeta 3\n")
+    for waiter in waiters:
+        waiter.join(5)
+    assert results == {"alpha": "alpha 2", "beta": "beta 3", "gamma": "gamma 1"}
+    following[0].join(5)
+    assert not following[0].is_alive() and follower._thread is None and not follower._waiters
+
+
+def test_waiters_follow_rotation_and_truncation(log_path):
+    follower = LogFollower(str(log_path), fallback_interval=0.02, poll_interval=0.05)
+
+    def rotate():
+        os.rename(log_path, f"{log_path}.1")
+        log_path.write_text("rotated ready\n", encoding="utf-8")
+
+    _later(0.1, rotate)
+    assert follower.wait_for(lambda l: "ready" in l, timeout=5) == "rotated ready"
+    _later(0.1, log_path.write_text, "ok\n", "utf-8")  # truncated below the previous offset
+    assert follower.wait_for(lambda l: l == "ok", timeout=5) == "ok"
+
+
+def test_follower_thread_restarts_after_it_stops(log_path):
+    follower = LogFollower(str(log_path), fallback_interval=0.02, poll_interval=0.05)
+    with pytest.raises(ConsistencyTimeout):
+        follower.wait_for(lambda l: False, timeout=0.1)
+    _wait_until(lambda: follower._thread is None)
+    _later(0.1, _append, log_path, "again\n")
+    assert follower.wait_for(lambda l: l == "again", timeout=5) == "again"
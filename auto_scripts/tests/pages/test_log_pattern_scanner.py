@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from auto_scripts.Pages.LogPatternScanner import AhoCorasick, LogPatternScanner
+from auto_scripts.Pages.LogReader import LogReader
+
+
+def _brute_force(patterns, data):
+    return sorted((i, index) for index, pattern in enumerate(patterns)
+                  for i in range(len(data) - len(pattern) + 1) if data[i:i + len(pattern)] == pattern)
+
+
+def test_automaton_finds_every_overlapping_occurrence():
+    rng = random.Random(7)
+    patterns = [b"ab", b"abab", b"bab", b"b", b"aab"]
+    data = bytes(rng.choice(b"ab") for _ in range(5000))
+    automaton = AhoCorasick(patterns)
+    assert sorted(automaton.iter_matches(data)) == _brute_force(patterns, data)
+    assert sorted(automaton.iter_matches(data, 100, 900)) == [
+        (i + 100, index) for i, index in _brute_force(patterns, data[100:900])]
+
+
+def test_automaton_case_insensitive():
+    automaton = AhoCorasick([b"Union Select", b"<SCRIPT>"], case_insensitive=True)
+    assert list(automaton.iter_matches(b"x' UNION SELECT 1 -- <script>")) == [(3, 0), (21, 1)]
+    with pytest.raises(AssertionError):
+        AhoCorasick([b""])
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    yield tmp_path / "security.log"
+    LogReader.close_all()
+
+
+def test_scan_after_mark_and_after_truncation(log_path):
+    log_path.write_text("[2026-10-19 10:00:00] old payload=admin'--\n" * 50, encoding="utf-8")
+    scanner = LogPatternScanner(str(log_path))
+    mark = LogReader.for_path(str(log_path)).mark()
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write("[2026-10-19 10:05:00] SQL injection detected: ' OR 1=1\n")
+    hits = scanner.scan(["admin'--", "' OR 1=1"], since=mark)
+    assert scanner.missing(hits) == ["admin'--"]
+    assert hits["' OR 1=1"][0].timestamp.minute == 5
+
+    # Truncated and rewritten shorter than the mark's offset; nothing polled the reader in between.
+    log_path.write_text("[2026-10-19 11:00:00] SQL injection detected: admin'--\n", encoding="utf-8")
+    hits = scanner.scan(["admin'--"], since=mark)
+    assert hits["admin'--"][0].line_offset == 0
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from auto_scripts.Pages.LogReader import LogReader
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("first\n", encoding="utf-8")
+    yield path
+    LogReader.close_all()
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_read_since_returns_complete_lines_only(log_path):
+    reader = LogReader(str(log_path))
+    mark = reader.mark()
+    _append(log_path, "second\r\nthird\npart")
+    lines, mark = reader.read_since(mark)
+    assert lines == ["second", "third"]
+    _append(log_path, "ial\n")
+    assert reader.read_since(mark)[0] == ["partial"]
+    assert reader.find(lambda line: line.startswith("th")) == "third"
+    assert reader.search(r"^p\w+l$") == "partial"
+
+
+def test_marks_survive_rotation_and_truncation(log_path):
+    reader = LogReader(str(log_path))
+    mark = reader.mark()
+    _append(log_path, "before rotation\n")
+    os.rename(log_path, f"{log_path}.1")
+    log_path.write_text("after rotation\n", encoding="utf-8")
+    lines, mark = reader.read_since(mark)
+    assert lines == ["before rotation", "after rotation"]
+    log_path.write_text("x\n", encoding="utf-8")  # truncated below the previous offset
+    lines, _ = reader.read_since(mark)
+    assert lines == ["x"] and reader.generation == 3
+
+
+def test_read_since_falls_back_to_the_file_beyond_the_recent_index(log_path):
+    reader = LogReader(str(log_path), recent_lines=2)
+    mark = reader.mark()
+    _append(log_path, "a\nb\nc\nd\n")
+    assert reader.read_since(mark)[0] == ["a", "b", "c", "d"]
+
+
+def test_first_mark_starts_at_the_end_of_the_existing_log(log_path):
+    _append(log_path, "second\npart")
+    reader = LogReader(str(log_path))
+    mark = reader.mark()
+    assert not reader.recent and reader.next_seq == 0
+    assert mark.offset == len("first\nsecond\n")
+    _append(log_path, "ial\nthird\n")
+    assert reader.read_since(mark)[0] == ["partial", "third"]
+    assert reader.read_since(reader.mark(at_start=True))[0] == ["first", "second", "partial", "third"]
+    assert reader.find(lambda line: line.startswith("s")) == "second"
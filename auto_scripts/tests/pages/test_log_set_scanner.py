@@ -0,0 +1,57 @@
+import gzip
+import os
+from datetime import datetime
+
+import pytest
+
+from auto_scripts.Pages import LogSetScanner as log_set
+from auto_scripts.Pages.LogSetScanner import LogSetScanner
+
+
+@pytest.fixture
+def log_set_dir(tmp_path):
+    segments = [
+        ("security.log.2.gz", 10, ["[2026-10-17 10:00:00] INFO SQL injection detected: admin'--",
+                                   "[2026-10-17 11:00:00] INFO noise"]),
+        ("security.log.1", 20, ["[2026-10-18 10:00:00] INFO noise admin'-- without marker",
+                                "[2026-10-18 11:00:00] WARN sql INJECTION DETECTED: ' OR 1=1"]),
+        ("security.log", 30, ["[2026-10-19 10:00:00] WARN SQL injection detected: admin'--"]),
+    ]
+    for name, age, lines in segments:
+        data = "".join(f"{line}\n" for line in lines).encode("utf-8")
+        path = tmp_path / name
+        if name.endswith(".gz"):
+            with gzip.open(path, "wb") as f:
+                f.write(data)
+        else:
+            path.write_bytes(data)
+        os.utime(path, (1_700_000_000 + age, 1_700_000_000 + age))
+    return tmp_path
+
+
+def test_scan_finds_earliest_hit_across_plain_and_gzip_segments(log_set_dir):
+    scanner = LogSetScanner(str(log_set_dir / "security.log*"), max_workers=1)
+    assert [os.path.basename(s.path) for s in scanner.segments()] == ["security.log.2.gz", "security.log.1",
+                                                                      "security.log"]
+    hits = scanner.scan(["admin'--", "' OR 1=1", "DROP"], case_insensitive=True, required=["SQL injection detected"])
+    assert LogSetScanner.missing(hits) == ["DROP"]
+    assert os.path.basename(hits["admin'--"][0].segment) == "security.log.2.gz"
+    assert hits["' OR 1=1"][0].timestamp == datetime(2026, 10, 18, 11)
+
+
+def test_time_window_prunes_segments_and_hits(log_set_dir):
+    scanner = LogSetScanner(str(log_set_dir / "security.log*"), max_workers=1)
+    start = datetime(2026, 10, 18, 12)
+    assert [os.path.basename(s.path) for s in scanner.segments(start=start)] == ["security.log"]
+    hits = scanner.scan(["admin'--"], start=start, required=["SQL injection detected"])
+    assert hits["admin'--"][0].timestamp == datetime(2026, 10, 19, 10)
+    all_hits = scanner.scan(["admin'--"], first_only=False, end=datetime(2026, 10, 18, 23))
+    assert [hit.timestamp.day for hit in all_hits["admin'--"]] == [17, 18]
+
+
+def test_lines_split_across_read_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_set, "BLOCK_SIZE", 7)
+    path = tmp_path / "app.log"
+    path.write_text("x" * 20 + "\n" + "abc needle def\n" + "needle tail", encoding="utf-8")
+    hits = log_set.scan_segment(str(path), ["needle"], first_only=False)
+    assert [(hit.offset, hit.line) for hit in hits] == [(25, "abc needle def"), (36, "needle tail")]
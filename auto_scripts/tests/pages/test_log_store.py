@@ -0,0 +1,77 @@
+import pytest
+
+from auto_scripts.Pages.LogReader import LogReader
+from auto_scripts.Pages.LogStore import LogLineParser, LogStore
+
+
+class _CountingParser(LogLineParser):
+    def __init__(self):
+        self.calls = 0
+
+    def parse(self, line):
+        self.calls += 1
+        return super().parse(line)
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("", encoding="utf-8")
+    yield path
+    LogReader.close_all()
+
+
+def _append(path, *lines):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(f"{line}\n" for line in lines))
+
+
+def test_register_is_lazy_and_queries_ingest(log_path):
+    parser = _CountingParser()
+    store = LogStore(parser=parser)
+    store.register(str(log_path))
+    _append(log_path, "[2026-10-19 10:00:00] WARN SQL injection attempt: admin'-- user=eve")
+    assert parser.calls == 0
+    events = store.security_events("admin'--", source=str(log_path))
+    assert [(e.category, e.user, e.payload, e.ts) for e in events] == [
+        ("sql_injection", "eve", "admin'--", "2026-10-19 10:00:00")]
+    assert parser.calls == 1
+    store.close()
+
+
+def test_since_scopes_to_lines_after_a_reader_mark(log_path):
+    store = LogStore()
+    store.register(str(log_path))
+    _append(log_path, "INFO before one", "INFO before two")
+    mark = LogReader.for_path(str(log_path)).mark()
+    _append(log_path, "INFO after")
+    assert [e.message for e in store.events(source=str(log_path), since=mark)] == ["INFO after"]
+    assert store.count(source=str(log_path)) == 3
+    store.close()
+
+
+def test_store_keeps_only_the_newest_events(log_path):
+    store = LogStore(max_events=3)
+    store.register(str(log_path))
+    _append(log_path, *(f"INFO line {i}" for i in range(5)))
+    assert [e.message for e in store.events(source=str(log_path))] == ["INFO line 2", "INFO line 3", "INFO line 4"]
+    _append(log_path, "INFO line 5")
+    assert [e.seq for e in store.events(source=str(log_path))] == [3, 4, 5]
+    store.close()
+
+
+def test_confirmation_checks_share_one_matcher(log_path, monkeypatch):
+    pytest.importorskip("requests")
+    pytest.importorskip("pymysql")
+    from PageClasses.UserRegistrationAPIPage import UserRegistrationAPIPage
+
+    monkeypatch.setattr(LogStore, "_shared", LogStore())
+    _append(log_path, "INFO registration success for old@example.com")
+    page = UserRegistrationAPIPage("http://api.test", {}, str(log_path))
+    # Categorized as sql_injection by the first matching rule, but it is still the confirmation line.
+    line = "INFO registration success for new@example.com (SQL injection filter passed)"
+    _append(log_path, line)
+    assert page.verify_confirmation_email("new@example.com")
+    assert page.wait_for_confirmation_email("new@example.com", timeout=1) == line
+    with pytest.raises(AssertionError):
+        page.verify_confirmation_email("old@example.com")
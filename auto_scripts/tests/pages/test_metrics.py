@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+import pytest
+
+from auto_scripts.Pages.Metrics import LatencyHistogram
+
+
+def test_percentiles_within_relative_error():
+    histogram = LatencyHistogram()
+    for micros in range(1, 100_001):
+        histogram.record(micros)
+    assert histogram.total == 100_000
+    for pct in (50, 95, 99):
+        assert histogram.percentile(pct) == pytest.approx(pct * 1000, rel=0.01)
+    assert histogram.percentile(100) == histogram.max == 100_000
+
+
+def test_summary_of_empty_and_clamped_samples():
+    histogram = LatencyHistogram()
+    assert histogram.summary()["p99_ms"] == 0
+    histogram.record(-5)
+    histogram.record(2500)
+    summary = histogram.summary()
+    assert summary["count"] == 2 and summary["min_ms"] == 0 and summary["max_ms"] == 2.5
+
+
+def test_eventual_consistency_does_not_load_the_load_runner():
+    code = ("import sys, auto_scripts.Pages.EventualConsistency as ec; "
+            "assert 'auto_scripts.Pages.LoadTestRunner' not in sys.modules; print(ec.LatencyHistogram.__module__)")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "auto_scripts.Pages.Metrics"
@@ -0,0 +1,98 @@
+import io
+import json
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from auto_scripts.Pages.ProductSearchPaginator import ProductSearchPaginator, iter_json_array_items
+
+URL = "https://shop.example.test/api/products/search"
+
+
+def _response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"  # no charset: iter_content yields bytes
+    response.raw = io.BytesIO(json.dumps(body).encode("utf-8"))
+    return response
+
+
+class _Backend:
+    def __init__(self, products, paginates=True, wrap=True):
+        self.products = products
+        self.paginates = paginates
+        self.wrap = wrap
+        self.calls = 0
+
+    def get(self, url, params=None, stream=False, timeout=None):
+        self.calls += 1
+        items = self.products
+        if self.paginates:
+            start = (params["page"] - 1) * params["pageSize"]
+            items = items[start:start + params["pageSize"]]
+        return _response({"products": items} if self.wrap else items)
+
+
+def _products(count):
+    return [{"id": i, "name": f"Prodüct {i}"} for i in range(1, count + 1)]
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_walks_all_pages(prefetch):
+    backend = _Backend(_products(25))
+    paginator = ProductSearchPaginator(backend, URL, page_size=10, prefetch=prefetch)
+    assert [p["id"] for p in paginator] == list(range(1, 26))
+    assert paginator.pages_fetched == 3
+
+
+def test_backend_ignoring_pagination_with_larger_list_stops_after_one_page():
+    backend = _Backend(_products(25), paginates=False)
+    paginator = ProductSearchPaginator(backend, URL, page_size=10, prefetch=False)
+    assert len(list(paginator)) == 25
+    assert backend.calls == 1
+
+
+def test_backend_repeating_the_same_full_page_terminates():
+    backend = _Backend(_products(10), paginates=False, wrap=False)
+    paginator = ProductSearchPaginator(backend, URL, page_size=10)
+    assert [p["id"] for p in paginator] == list(range(1, 11))
+    assert paginator.pages_fetched == 2
+
+
+def test_default_max_pages_bounds_iteration():
+    class Endless:
+        def get(self, url, params=None, stream=False, timeout=None):
+            return _response([{"id": params["page"]}])
+
+    paginator = ProductSearchPaginator(Endless(), URL, page_size=1, max_pages=5, prefetch=False)
+    assert len(list(paginator)) == 5
+    assert ProductSearchPaginator(Endless(), URL).max_pages == ProductSearchPaginator.DEFAULT_MAX_PAGES
+
+
+def test_items_split_across_chunks():
+    body = json.dumps({"products": _products(3)})
+    chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+    assert [p["id"] for p in iter_json_array_items(chunks)] == [1, 2, 3]
+
+
+def test_iterates_under_cassette_replay(tmp_path):
+    from auto_scripts.Pages.APISessionPool import APISessionPool
+    from auto_scripts.Pages.HTTPCassette import HTTPCassette
+
+    class Recorded:
+        status_code = 200
+        headers = {"Content-Type": "application/json"}
+
+        def __init__(self, body):
+            self.text = json.dumps(body)
+            self.content = self.text.encode("utf-8")
+
+    path = str(tmp_path / "search.json")
+    products = _products(3)
+    with HTTPCassette(path, mode="record") as recorder:
+        recorder.record("GET", URL, Recorded({"products": products}),
+                        params={"page": 1, "pageSize": 10, "query": ""})
+    with HTTPCassette(path, mode="replay"):
+        paginator = ProductSearchPaginator(APISessionPool.get_session(URL), URL, page_size=10)
+        assert list(paginator) == products
@@ -0,0 +1,128 @@
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("pymysql")
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.DBSnapshot import DBSnapshot
+from auto_scripts.Pages.ProductSpecialCharAndInjectionTestPage import ProductSpecialCharAndInjectionTestPage
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+from auto_scripts.Pages.TestDataIsolation import CreatedDataLedger
+
+DB_CONFIG = {"host": "stand-in", "user": "test", "password": "", "database": "shop"}
+
+
+class _Response:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    def json(self):
+        import json
+        return json.loads(self.content)
+
+
+def _execute(sql, params):
+    with DBConnectionPool.connection(DB_CONFIG) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+        conn.commit()
+
+
+class _Session:
+    def __init__(self, content, insert=True, on_get=None):
+        self.content = content
+        self.insert = insert
+        self.on_get = on_get
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        if self.insert:
+            _execute("INSERT INTO products (name, description, price) VALUES (%s, %s, %s)",
+                     (json["name"], json["description"], json["price"]))
+        return _Response(201, self.content)
+
+    def get(self, url, params=None, timeout=None):
+        if self.on_get:
+            self.on_get()
+        return _Response(200, b'[{"name": "C++ <Book>"}]')
+
+
+@pytest.fixture
+def stand_in(tmp_path):
+    db = StandInDatabase()
+    db.seed({"products": [{"name": "C++ <Book>", "description": "pre-existing", "price": 1}]})
+    db.install()
+    yield db
+    db.close()
+    DBConnectionPool.close_all()
+    ProductSpecialCharAndInjectionTestPage._catalog_cache.clear()
+
+
+def _page(tmp_path, content, **session_options):
+    log = tmp_path / "app.log"
+    log.write_text("", encoding="utf-8")
+    page = ProductSpecialCharAndInjectionTestPage(DB_CONFIG, {"log_file_path": str(log)},
+                                                  session=_Session(content, **session_options))
+    page.LOG_WAIT_TIMEOUT = 0.05
+    return page
+
+
+def test_non_json_success_body_returns_response(stand_in, tmp_path):
+    page = _page(tmp_path, b"Created")
+    response = page.insert_product_with_special_chars({"name": "X", "description": "d", "price": 1})
+    assert response.status_code == 201
+    assert page.created_product["id"] is None
+
+
+def test_ledger_tracks_only_the_new_row_and_page_learns_its_id(stand_in, tmp_path):
+    page = _page(tmp_path, b"")
+    product = {"name": "C++ <Book>", "description": "created", "price": 2}
+    with CreatedDataLedger(DB_CONFIG) as ledger:
+        page.insert_product_with_special_chars(product)
+        assert ledger.entries == {("products", "id"): [2]}
+        assert page.created_product["id"] == 2
+        assert page.verify_db_integrity_for_products()
+    with DBConnectionPool.connection(DB_CONFIG) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT description FROM products")
+            assert cursor.fetchall() == [("pre-existing",)]
+
+
+def test_stale_table_catalog_is_refreshed_before_failing(stand_in, tmp_path):
+    page = _page(tmp_path, b'{"id": 2}')
+    page.insert_product_with_special_chars({"name": "N", "description": "d", "price": 1})
+    ProductSpecialCharAndInjectionTestPage._catalog_cache[("stand-in", "shop")] = frozenset()
+    assert page.verify_db_integrity_for_products()
+
+
+PRODUCT = {"name": "C++ <Book>", "description": "created", "price": 2}
+
+
+def test_step_4_allows_only_the_tests_own_insert(stand_in, tmp_path):
+    results = _page(tmp_path, b'{"id": 2}').run_tc_scrum96_010(dict(PRODUCT), "' OR 1=1 --")
+    assert results["step_4_db_integrity_pass"], results.get("step_4_db_integrity_error")
+    assert results["step_4_db_snapshot_diff"]["products"]["inserted"] == 1
+
+
+def test_step_4_fails_on_any_other_change_to_the_table(stand_in, tmp_path):
+    tamper = lambda: _execute("UPDATE products SET price = %s WHERE id = %s", (99, 1))  # noqa: E731
+    results = _page(tmp_path, b'{"id": 2}', on_get=tamper).run_tc_scrum96_010(dict(PRODUCT), "' OR 1=1 --")
+    assert results["step_4_db_integrity_pass"] is False
+    assert "1 rows updated [1]" in results["step_4_db_integrity_error"]
+
+
+def test_step_4_fails_without_a_product_id_or_snapshot(stand_in, tmp_path, monkeypatch):
+    page = _page(tmp_path, b"", insert=False)
+    page.verify_db_integrity_for_products = lambda: True
+    results = page.run_tc_scrum96_010(dict(PRODUCT), "' OR 1=1 --")
+    assert results["step_4_db_integrity_pass"] is False
+    assert "id unknown" in results["step_4_db_integrity_error"]
+    page = _page(tmp_path, b'{"id": 2}')
+
+    def unavailable(self):
+        raise RuntimeError("snapshot unavailable")
+
+    monkeypatch.setattr(DBSnapshot, "capture", unavailable)
+    results = page.run_tc_scrum96_010(dict(PRODUCT), "' OR 1=1 --")
+    assert results["step_4_db_integrity_pass"] is False
+    assert "snapshot unavailable" in results["step_4_db_integrity_error"]
@@ -0,0 +1,108 @@
+import pytest
+
+from auto_scripts.Pages.ResilienceLayer import CircuitBreaker, CircuitOpenError, ResilienceLayer, RetryPolicy
+
+URL = "https://shop.example.test/api/products"
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _layer(**policy):
+    return ResilienceLayer(RetryPolicy(base_delay=0, max_delay=0, **policy))
+
+
+def test_transient_status_is_retried_and_discarded_response_closed():
+    responses = [_Response(503), _Response(200)]
+    sent = []
+
+    def send(remaining):
+        sent.append(responses[len(sent)])
+        return sent[-1]
+
+    result = _layer().execute("GET", URL, send)
+    assert result.status_code == 200
+    assert sent[0].closed and not result.closed
+
+
+def test_post_is_not_retried():
+    calls = []
+    result = _layer().execute("POST", URL, lambda remaining: calls.append(1) or _Response(503))
+    assert result.status_code == 503 and len(calls) == 1
+
+
+def test_breaker_opens_after_threshold():
+    layer = _layer(max_attempts=1, failure_threshold=2)
+    for _ in range(2):
+        layer.execute("GET", URL, lambda remaining: _Response(503))
+    with pytest.raises(CircuitOpenError):
+        layer.execute("GET", URL, lambda remaining: _Response(200))
+
+
+def test_unexpected_exception_in_half_open_trial_releases_the_trial():
+    layer = _layer(max_attempts=1, failure_threshold=1, reset_timeout=0)
+    layer.execute("GET", URL, lambda remaining: _Response(503))
+
+    def broken(remaining):
+        raise ValueError("bug in the caller, not a backend failure")
+
+    with pytest.raises(ValueError):
+        layer.execute("GET", URL, broken)
+    assert layer.execute("GET", URL, lambda remaining: _Response(200)).status_code == 200
+
+
+def test_failure_that_opens_the_breaker_ends_the_retries():
+    layer = _layer(max_attempts=3, failure_threshold=1, reset_timeout=60)
+    sent = []
+    result = layer.execute("GET", URL, lambda remaining: sent.append(1) or _Response(503))
+    assert result.status_code == 503 and len(sent) == 1
+
+    layer.breaker_for("https://shop.example.test", layer.default_policy).opened_at -= 60  # half-open
+
+    def refused(remaining):
+        sent.append(1)
+        raise ConnectionRefusedError("still down")
+
+    with pytest.raises(ConnectionRefusedError):
+        layer.execute("GET", URL, refused)
+    assert len(sent) == 2
+    with pytest.raises(CircuitOpenError):
+        layer.execute("GET", URL, refused)
+
+
+def test_breakers_are_separate_per_policy_thresholds():
+    layer = _layer(max_attempts=1, failure_threshold=1)
+    layer.add_policy(r"^/api/search", RetryPolicy(max_attempts=1, failure_threshold=100))
+    layer.execute("GET", URL, lambda remaining: _Response(503))
+    search = "https://shop.example.test/api/search"
+    assert layer.execute("GET", search, lambda remaining: _Response(200)).status_code == 200
+    with pytest.raises(CircuitOpenError):
+        layer.execute("GET", URL, lambda remaining: _Response(200))
+
+
+def test_call_retries_listed_exceptions():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionResetError("reset")
+        return "ok"
+
+    assert _layer().call("mysql://db", flaky) == "ok"
+    assert len(attempts) == 3
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
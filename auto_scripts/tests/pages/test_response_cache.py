@@ -0,0 +1,60 @@
+from auto_scripts.Pages import ResponseCache as response_cache
+from auto_scripts.Pages.ResponseCache import ResponseCache
+
+
+class _Response:
+    def __init__(self, status_code=200, body="ok"):
+        self.status_code = status_code
+        self.body = body
+
+
+def test_key_normalizes_query_and_separates_principals():
+    key = ResponseCache.key_for
+    assert key("https://Shop.test/api/products/?b=2&a=1") == key("https://shop.test/api/products", {"a": 1, "b": "2"})
+    assert key("https://shop.test/p", [("q", ["x", "y"])]) == key("https://shop.test/p?q=y&q=x")
+    assert key("https://shop.test/p", headers={"Authorization": "Bearer a"}) != \
+        key("https://shop.test/p", headers={"authorization": "Bearer b"})
+
+
+def test_ttl_lru_and_counters(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=10, max_entries=2)
+    keys = [ResponseCache.key_for(f"https://shop.test/p/{i}") for i in range(3)]
+    cache.put(keys[0], _Response())
+    cache.put(keys[1], _Response(body="one"))
+    cache.put(keys[2], _Response(status_code=500))
+    assert cache.get(keys[0]).body == "ok"  # keys[0] becomes most recent
+    cache.put(keys[2], _Response())
+    assert cache.get(keys[1]) is None  # evicted as least recently used
+    now[0] += 11
+    assert cache.get(keys[0]) is None  # expired
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["evictions"]) == (1, 2, 3, 1)
+    assert stats["entries"] == 1 and stats["hit_ratio"] == round(1 / 3, 4)
+
+
+def test_get_returns_a_copy():
+    cache = ResponseCache()
+    key = ResponseCache.key_for("https://shop.test/p")
+    cache.put(key, _Response())
+    cache.get(key).body = "mutated"
+    assert cache.get(key).body == "ok"
+
+
+def test_invalidate_related_paths_on_the_same_host():
+    cache = ResponseCache()
+    urls = ["https://shop.test/api/cart", "https://shop.test/api/cart/items", "https://shop.test/api/carts",
+            "https://shop.test/api", "https://other.test/api/cart"]
+    for url in urls:
+        cache.put(ResponseCache.key_for(url), _Response())
+    assert cache.invalidate("https://shop.test/api/cart/") == 3
+    assert [cache.get(ResponseCache.key_for(url)) is not None for url in urls] == [False, False, True, False, True]
+
+
+def test_scope_enables_a_fresh_cache():
+    cache = ResponseCache()
+    cache.put(ResponseCache.key_for("https://shop.test/p"), _Response())
+    with cache.scope(ttl=5) as scoped:
+        assert scoped.enabled and scoped.ttl == 5 and scoped.stats()["entries"] == 0
+    assert not cache.enabled
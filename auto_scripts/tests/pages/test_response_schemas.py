@@ -0,0 +1,19 @@
+from auto_scripts.Pages.ResponseSchemas import ResponseSchemas
+
+PRODUCT = {"id": 1, "name": "Lamp", "price": 9.5, "description": "Desk lamp", "category": "home", "imageUrl": None}
+
+
+def test_product_schema_checks_presence_only():
+    loose = dict(PRODUCT, price="9.50", description=None)
+    assert ResponseSchemas.validate_many("product", [PRODUCT, loose]) == {}
+
+
+def test_product_schema_reports_missing_fields_per_item():
+    incomplete = {k: v for k, v in PRODUCT.items() if k != "price"}
+    failures = ResponseSchemas.validate_many("product", [PRODUCT, incomplete])
+    assert list(failures) == [1]
+    assert any("price" in violation for violation in failures[1])
+
+
+def test_validator_is_compiled_once():
+    assert ResponseSchemas.validator("product") is ResponseSchemas.validator("product")
@@ -0,0 +1,42 @@
+import smtplib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from auto_scripts.Pages.SMTPCaptureSink import Mailbox, SMTPCaptureSink, parse_reset_link
+
+
+@pytest.mark.parametrize("expires", ["2026-10-19T10:00:00Z", "2026-10-19T12:00:00+02:00", "2026-10-19T10:00:00",
+                                     "202610191000", "1792404000"])
+def test_reset_link_expiry_is_aware_utc(expires):
+    details = parse_reset_link(f"https://app.example.com/reset-password?token=t1&expires={expires}")
+    assert details["token"] == "t1"
+    assert details["expires"].tzinfo is not None
+    assert details["expires"].utcoffset() == timedelta(0)
+    if expires != "1792404000":
+        assert details["expires"] == datetime(2026, 10, 19, 10, 0, tzinfo=timezone.utc)
+
+
+def test_is_reset_link_expired_accepts_aware_and_naive_now():
+    pytest.importorskip("selenium")
+    from auto_scripts.Pages.PasswordRecoveryPage import PasswordRecoveryPage
+
+    link = "https://app.example.com/reset-password?token=t1&expires=2026-10-19T10:00:00Z"
+    assert PasswordRecoveryPage.is_reset_link_expired(link, now=datetime(2026, 10, 19, 11, tzinfo=timezone.utc))
+    assert not PasswordRecoveryPage.is_reset_link_expired(link, now=datetime(2026, 10, 19, 9))
+    assert not PasswordRecoveryPage.is_reset_link_expired("https://app.example.com/reset-password?token=t1")
+
+
+def test_sink_captures_and_indexes_messages():
+    with SMTPCaptureSink(mailbox=Mailbox()) as sink:
+        mark = sink.mailbox.mark()
+        host, port = sink.address
+        with smtplib.SMTP(host, port, timeout=5) as client:
+            client.sendmail("noreply@shop.test", ["user@example.com"],
+                            "Subject: Reset your password\r\n\r\n"
+                            "Open https://app.example.com/reset-password?token=abc&expires=202610191000\r\n")
+        message = sink.mailbox.wait_for(recipient="user@example.com", after_id=mark, timeout=5)
+    assert message.subject == "Reset your password"
+    assert "\r" not in message.text
+    assert parse_reset_link(message.links(r"/reset-password")[0])["token"] == "abc"
+    assert sink.mailbox.messages(recipient="other@example.com") == []
@@ -0,0 +1,62 @@
+import hashlib
+
+import pytest
+
+from auto_scripts.Pages import SQLiteStandIn as stand_in_driver
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase, translate
+
+DB_CONFIG = {"host": "db.internal", "user": "qa", "password": "secret", "database": "shop"}
+
+
+@pytest.fixture
+def stand_in():
+    db = StandInDatabase()
+    yield db
+    DBConnectionPool.close_all()
+    db.close()
+
+
+def test_translate_placeholders_and_show_tables():
+    assert translate("SELECT * FROM t WHERE a = %s AND b LIKE '%%x'", (1,)) == \
+        "SELECT * FROM t WHERE a = ? AND b LIKE '%x'"
+    assert translate("SELECT '%s'", None) == "SELECT '%s'"
+    assert "name LIKE 'prod%'" in translate("SHOW TABLES LIKE 'prod%'", None)
+
+
+def test_seed_orders_parents_first_and_install_routes_any_config(stand_in):
+    counts = stand_in.seed({
+        "cart_items": [{"cartId": 1, "productId": 1, "quantity": 2}],
+        "carts": [{"userId": 1}],
+        "products": [{"name": "Lamp", "price": 10}],
+        "users": [{"username": "ann", "email": "ann@example.com"}],
+    })
+    assert counts == {"users": 1, "products": 1, "carts": 1, "cart_items": 1}
+    stand_in.install()
+    assert DBConnectionPool.effective_driver("psycopg2") == "sqlite"
+    with DBConnectionPool.connection(DB_CONFIG, driver="psycopg2",
+                                     cursorclass=stand_in_driver.cursors.DictCursor) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT username, account_status FROM users WHERE email = %s", ("ann@example.com",))
+            assert cursor.fetchone() == {"username": "ann", "account_status": "ACTIVE"}
+            cursor.execute("SHOW TABLES")
+            assert {row["name"] for row in cursor.fetchall()} >= {"users", "products", "carts", "cart_items"}
+    with pytest.raises(stand_in_driver.IntegrityError):
+        stand_in.seed({"cart_items": [{"cartId": 99, "productId": 1, "quantity": 1}]})
+    stand_in.uninstall()
+    assert DBConnectionPool.effective_driver("psycopg2") == "psycopg2"
+
+
+def test_mysql_functions_match_python(stand_in):
+    conn = stand_in_driver.connect(stand_in.database)
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT CONV(SUBSTRING(MD5(CONCAT_WS('|', 'a', NULL, 2)), 1, 16), 16, 10), FLOOR(-1.5)")
+        value, floor = cursor.fetchone()
+        cursor.execute("SELECT BIT_XOR(x) FROM (SELECT 6 AS x UNION ALL SELECT 3 UNION ALL SELECT NULL)")
+        assert cursor.fetchone() == (5,)
+    expected = int(hashlib.md5(b"a|2").hexdigest()[:16], 16)
+    assert value == (expected - (1 << 64) if expected >= 1 << 63 else expected)
+    assert floor == -2
+    conn.close()
+    with pytest.raises(stand_in_driver.OperationalError):
+        conn.ping()
@@ -0,0 +1,55 @@
+import pytest
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+from auto_scripts.Pages.TableIntegrityChecker import TableIntegrityChecker
+
+DB_CONFIG = {"host": "stand-in", "user": "test", "password": "", "database": "shop"}
+COLUMNS = ["name", "description", "price"]
+
+
+@pytest.fixture
+def stand_in():
+    db = StandInDatabase()
+    db.seed({"products": [{"name": f"P{i}", "description": "seed", "price": i} for i in range(1, 201)]})
+    db.install()
+    yield db
+    DBConnectionPool.close_all()
+    db.close()
+
+
+def _execute(sql, params=()):
+    with DBConnectionPool.connection(DB_CONFIG) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+        conn.commit()
+
+
+def test_baseline_round_trip_and_mismatched_chunks(stand_in, tmp_path):
+    checker = TableIntegrityChecker(DB_CONFIG, "products", COLUMNS, chunk_size=50)
+    path = str(tmp_path / "products.baseline.json")
+    TableIntegrityChecker.save_baseline(checker.capture(), path)
+    baseline = TableIntegrityChecker.load_baseline(path)
+    assert checker.verify(baseline)["pass"]
+
+    _execute("UPDATE products SET description = %s WHERE id = %s", ("changed", 120))
+    report = checker.verify(baseline)
+    assert not report["pass"]
+    assert [chunk["key_range"] for chunk in report["mismatched_chunks"]] == [[100, 150]]
+
+    with pytest.raises(AssertionError):
+        TableIntegrityChecker(DB_CONFIG, "products", COLUMNS, chunk_size=25).verify(baseline)
+
+
+def test_reference_drill_down_finds_rows(stand_in):
+    _execute("CREATE TABLE products_golden AS SELECT * FROM products")
+    checker = TableIntegrityChecker(DB_CONFIG, "products", COLUMNS, chunk_size=100, leaf_size=10, fanout=4)
+    reference = TableIntegrityChecker(DB_CONFIG, "products_golden", COLUMNS, chunk_size=100, leaf_size=10, fanout=4)
+    assert checker.verify(reference=reference)["pass"]
+
+    _execute("UPDATE products SET price = %s WHERE id = %s", (0, 7))
+    _execute("DELETE FROM products WHERE id = %s", (150,))
+    _execute("INSERT INTO products (id, name, description, price) VALUES (%s, %s, %s, %s)", (250, "X", "d", 1))
+    report = checker.verify(reference=reference)
+    assert report["rows"] == {"missing": [150], "unexpected": [250], "changed": [7]}
+    assert report["ranges_rehashed"] >= 1
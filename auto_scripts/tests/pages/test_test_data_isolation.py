@@ -0,0 +1,113 @@
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("pymysql")
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+from auto_scripts.Pages.TestDataIsolation import CreatedDataLedger
+from PageClasses.ProductInsertAPIPage import ProductInsertAPIPage
+
+DB_CONFIG = {"host": "stand-in", "user": "test", "password": "", "database": "shop"}
+
+
+class _Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+        self.text = str(body)
+
+    def json(self):
+        return self._body
+
+
+class _InsertingSession:
+    """Creates the product row like the backend would, but answers without an id."""
+
+    def post(self, url, json=None, headers=None):
+        with DBConnectionPool.connection(DB_CONFIG) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("INSERT INTO products (name, description, price) VALUES (%s, %s, %s)",
+                               (json["name"], json["description"], json["price"]))
+            conn.commit()
+        return _Response(201, dict(json))
+
+
+@pytest.fixture
+def stand_in():
+    db = StandInDatabase()
+    db.seed({"products": [{"name": "Test", "description": "pre-existing", "price": 1}]})
+    db.install()
+    yield db
+    db.close()
+    DBConnectionPool.close_all()
+
+
+def _product_names():
+    with DBConnectionPool.connection(DB_CONFIG) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT name, description FROM products ORDER BY id")
+            return cursor.fetchall()
+
+
+def test_cleanup_without_response_id_keeps_pre_existing_rows(stand_in):
+    page = ProductInsertAPIPage(DB_CONFIG, session=_InsertingSession())
+    with CreatedDataLedger(DB_CONFIG) as ledger:
+        page.insert_product_api({"name": "Test", "description": "created", "price": 2})
+        assert ledger.entries == {("products", "id"): [2]}
+    assert _product_names() == [("Test", "pre-existing")]
+
+
+def test_tracking_by_non_primary_key_is_rejected(stand_in):
+    ledger = CreatedDataLedger(DB_CONFIG)
+    with pytest.raises(AssertionError, match="primary key"):
+        ledger.track("products", "name", "Test")
+
+
+def test_ledger_file_drops_non_primary_key_entries(stand_in, tmp_path):
+    path = tmp_path / "ledger.json"
+    path.write_text('[{"table": "products", "key_column": "name", "keys": ["Test"]}]', encoding="utf-8")
+    assert CreatedDataLedger(DB_CONFIG, path=str(path)).cleanup() == {}
+    assert _product_names() == [("Test", "pre-existing")]
+
+
+def test_nested_ledger_restores_outer_ledger(stand_in):
+    with CreatedDataLedger(DB_CONFIG) as outer:
+        with CreatedDataLedger(DB_CONFIG) as inner:
+            CreatedDataLedger.track_active("products", "id", 101)
+        CreatedDataLedger.track_active("products", "id", 102)
+        assert CreatedDataLedger.active() is outer
+        assert outer.entries == {("products", "id"): [102]}
+        assert len(inner) == 0  # cleaned up on exit
+    assert CreatedDataLedger.active() is None
+
+
+def test_concurrent_ledgers_track_into_their_own_thread(stand_in):
+    import threading
+
+    barrier = threading.Barrier(2)
+    ledgers = {}
+
+    def worker(key):
+        with CreatedDataLedger(DB_CONFIG) as ledger:
+            barrier.wait()
+            CreatedDataLedger.track_active("products", "id", key)
+            ledgers[key] = dict(ledger.entries)
+            barrier.wait()
+
+    threads = [threading.Thread(target=worker, args=(key,)) for key in (201, 202)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert ledgers == {201: {("products", "id"): [201]}, 202: {("products", "id"): [202]}}
+
+
+def test_worker_thread_without_ledger_uses_open_ledger(stand_in):
+    import threading
+
+    with CreatedDataLedger(DB_CONFIG) as ledger:
+        thread = threading.Thread(target=CreatedDataLedger.track_active, args=("products", "id", 301))
+        thread.start()
+        thread.join()
+        assert ledger.entries == {("products", "id"): [301]}
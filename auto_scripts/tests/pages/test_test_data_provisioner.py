@@ -0,0 +1,69 @@
+import hashlib
+
+import pytest
+
+pytest.importorskip("requests")
+
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+from auto_scripts.Pages.SQLiteStandIn import StandInDatabase
+from auto_scripts.Pages import TestDataProvisioner as provisioning
+
+DB_CONFIG = {"host": "stand-in", "user": "test", "password": "", "database": "shop"}
+
+
+@pytest.fixture
+def stand_in():
+    db = StandInDatabase()
+    db.install()
+    yield db
+    DBConnectionPool.close_all()
+    db.close()
+
+
+def _hash(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def test_db_mode_returns_generated_ids(stand_in):
+    provisioner = provisioning.TestDataProvisioner("http://api.test", DB_CONFIG, password_hasher=_hash)
+    provisioner.DB_CHUNK_SIZE = 2
+    users = provisioner.provision("users", 3, via="db")
+    products = provisioner.provision("products", 3, via="db")
+    with DBConnectionPool.connection(DB_CONFIG) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT userId, username, password FROM users")
+            rows = cursor.fetchall()
+            user_ids = {username: user_id for user_id, username, _ in rows}
+            assert {password for _, _, password in rows} == {_hash("Fixture123!")}
+            cursor.execute("SELECT id, name FROM products")
+            product_ids = {name: product_id for product_id, name in cursor.fetchall()}
+    assert {u["username"]: u["userId"] for u in users} == user_ids
+    assert {p["name"]: p["id"] for p in products} == product_ids
+
+
+def test_db_mode_rejects_users_without_a_password_hasher(stand_in):
+    provisioner = provisioning.TestDataProvisioner("http://api.test", DB_CONFIG)
+    with pytest.raises(AssertionError, match="no password hash"):
+        provisioner.provision("users", 1, via="db")
+    assert provisioner.provision("products", 1, via="db")[0]["id"] == 1
+
+
+def test_index_advances_past_failed_creates(tmp_path, monkeypatch):
+    provisioner = provisioning.TestDataProvisioner("http://api.test", state_path=str(tmp_path / "state.json"))
+    attempted = []
+
+    def create(kind, records):
+        attempted.extend(r["username"] for r in records)
+        return records[:1]  # only the first create succeeds
+
+    monkeypatch.setattr(provisioner, "_create_via_api", create)
+    provisioner.provision("users", 3)
+    provisioner.provision("users", 3)
+    assert len(attempted) == len(set(attempted)) == 6
+
+    reopened = provisioning.TestDataProvisioner("http://api.test", state_path=str(tmp_path / "state.json"))
+    reopened.run_token = provisioner.run_token
+    monkeypatch.setattr(reopened, "_create_via_api", create)
+    reopened.provision("users", 2)
+    assert len(attempted) == len(set(attempted)) == 8
+    assert [u["username"] for u in reopened.pool("users", 2).records] == [attempted[0], attempted[3]]
@@ -1,11 +1,17 @@
 import pymysql
 
+from auto_scripts.Pages.BatchQuery import BatchQuery
+from auto_scripts.Pages.DBConnectionPool import DBConnectionPool
+
 class DatabaseValidationHelper:
     """
     Helper class for database validation of user profile data for TC_SCRUM96_007.
-    Implements get_user_from_db(username) and compare_db_and_api_profile(db_record, api_profile).
+    Implements get_user_from_db(username) and compare_db_and_api_profile(db_record, api_profile),
+    plus batch variants get_users_from_db(usernames) and compare_db_and_api_profiles(db_records, api_profiles).
     Strictly follows Python best practices for maintainability and downstream automation.
     """
+    PROFILE_FIELDS = ["userId", "username", "email", "firstName", "lastName", "registrationDate", "accountStatus"]
+
     def __init__(self, db_config):
         """
         db_config: dict with keys host, user, password, database
@@ -22,23 +28,42 @@ class DatabaseValidationHelper:
         Raises:
             RuntimeError: If DB query fails
         """
-        connection = pymysql.connect(
-            host=self.db_config["host"],
-            user=self.db_config["user"],
-            password=self.db_config["password"],
-            database=self.db_config["database"],
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        try:
+        connect_config = {key: self.db_config[key] for key in ("host", "user", "password", "database")}
+        with DBConnectionPool.connection(connect_config, cursorclass=pymysql.cursors.DictCursor) as connection:
             with connection.cursor() as cursor:
                 cursor.execute("SELECT userId, username, email, firstName, lastName, registrationDate, accountStatus FROM users WHERE username=%s", (username,))
                 record = cursor.fetchone()
                 if not record:
                     raise RuntimeError(f"User '{username}' not found in database.")
-        finally:
-            connection.close()
         return record
 
+    def get_users_from_db(self, usernames, chunk_size=None):
+        """
+        Fetches many user records in chunked IN queries on one pooled connection.
+        Args:
+            usernames (list): Usernames to fetch
+            chunk_size (int, optional): Usernames per query (default BatchQuery.CHUNK_SIZE)
+        Returns:
+            dict: {username: record} for users found (missing usernames are absent)
+        """
+        connect_config = {key: self.db_config[key] for key in ("host", "user", "password", "database")}
+        return BatchQuery.rows_by_keys(connect_config, "users", "username", usernames, columns=self.PROFILE_FIELDS,
+                                       chunk_size=chunk_size, cursorclass=pymysql.cursors.DictCursor)
+
+    def compare_db_and_api_profiles(self, db_records, api_profiles):
+        """
+        Compares many DB records and API profiles in one pass.
+        Args:
+            db_records (dict): {username: database record}
+            api_profiles (dict): {username: API profile data}
+        Returns:
+            dict: {username: {"match": bool, "missing": bool, "mismatches": [...]}} for every username in either input
+        """
+        results = BatchQuery.compare_records(db_records, api_profiles, self.PROFILE_FIELDS, forbidden=["password"])
+        for username in api_profiles.keys() - db_records.keys():
+            results[username] = {"match": False, "missing": True, "mismatches": ["record not found in database"]}
+        return results
+
     def compare_db_and_api_profile(self, db_record, api_profile):
         """
         Compares DB record and API profile for all relevant fields.
@@ -50,8 +75,7 @@ class DatabaseValidationHelper:
         Raises:
             AssertionError: If any field does not match
         """
-        fields = ["userId", "username", "email", "firstName", "lastName", "registrationDate", "accountStatus"]
-        for field in fields:
+        for field in self.PROFILE_FIELDS:
             if field not in db_record or field not in api_profile:
                 raise AssertionError(f"Missing field '{field}' in comparison.")
             if str(db_record[field]) != str(api_profile[field]):
@@ -73,6 +97,7 @@ Implementation Guide:
 1. Instantiate DatabaseValidationHelper with db_config.
 2. Call get_user_from_db(username) to fetch DB record.
 3. Call compare_db_and_api_profile(db_record, api_profile) to validate.
+4. For data-driven runs use get_users_from_db(usernames) and compare_db_and_api_profiles(db_records, api_profiles).
 
 QA Report:
 - Imports validated; robust error and exception handling.
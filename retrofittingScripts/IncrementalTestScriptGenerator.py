@@ -0,0 +1,284 @@
+"""
+IncrementalTestScriptGenerator.py
+
+Executive Summary:
+------------------
+Splits a monolithic generated suite (retrofittingScripts/TestScripts.py, auto_scripts/Scripts/TestScripts.py) into one
+module per test class or top-level test function, content-hashes each unit together with its integration metadata, and
+rewrites only the modules whose hash changed. Untouched modules keep their mtime, so their cached bytecode and pytest's
+collection cache stay valid and regeneration cost scales with the size of the change instead of the size of the suite.
+
+Detailed Analysis:
+------------------
+- Units: every top-level ``class`` and every top-level ``def test_*`` of the source file.
+- Imports: module-level imports are pruned per unit to the names the unit actually references.
+- Dependencies: other module-level statements the unit references (constants, helper functions, base classes),
+  followed transitively, are copied into the unit's module in source order ahead of the unit itself.
+- Metadata: entries of the integration metadata files (e.g. TestScripts_Integration_Metadata.json) whose
+  ``class_name``/``className`` matches the unit are folded into the unit hash.
+- Manifest: ``manifest.json`` in the output directory records the file and sha256 of every unit.
+- ``suite()`` and ``if __name__ == '__main__'`` blocks are not copied; run the split suite via unittest discovery or pytest.
+
+Implementation Guide:
+---------------------
+1. python retrofittingScripts/IncrementalTestScriptGenerator.py retrofittingScripts/TestScripts.py \
+       --out retrofittingScripts/generated --metadata TestScripts_Integration_Metadata.json
+2. Run ``python -m pytest retrofittingScripts/generated`` (or ``python -m unittest discover -s retrofittingScripts/generated``).
+3. Re-run step 1 after every integration; only changed units are rewritten and recompiled.
+
+Quality Assurance Report:
+-------------------------
+- Writes are atomic (temp file + os.replace), so an interrupted run never leaves a half-written module.
+- Modules of units removed from the source are deleted; a summary of written/unchanged/removed units is returned.
+
+Troubleshooting Guide:
+----------------------
+- SyntaxError: the source file itself does not parse; fix the integration output first.
+- ValueError "both map to module": two unit names normalize to the same file name (e.g. ``TestCart`` and
+  ``Testcart``); rename one in the source.
+- Unit always rewritten: check that its metadata entries are stable (no per-run timestamps).
+
+Future Considerations:
+----------------------
+- Emit per-unit conftest fragments for shared fixtures.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import py_compile
+import re
+from typing import Any, Dict, List, Optional
+
+
+class IncrementalTestScriptGenerator:
+    """
+    Generator that splits a monolithic test script into per-unit modules and rewrites only changed units.
+    """
+    MANIFEST_NAME = "manifest.json"
+    CLASS_NAME_KEYS = ("class_name", "className")
+
+    def __init__(self, source_path: str, output_dir: str, metadata_paths: Optional[List[str]] = None):
+        """
+        Args:
+            source_path (str): Monolithic generated script to split.
+            output_dir (str): Directory receiving one module per unit plus manifest.json.
+            metadata_paths (list, optional): Integration metadata JSON files folded into the unit hashes.
+        """
+        self.source_path = source_path
+        self.output_dir = output_dir
+        self.metadata_paths = metadata_paths or []
+        self.manifest_path = os.path.join(output_dir, self.MANIFEST_NAME)
+
+    @staticmethod
+    def module_name_for(unit_name: str) -> str:
+        """
+        Returns the module file name for a unit, e.g. TestCase_TC101_TestPage -> test_testcase_tc101_testpage.py.
+        """
+        name = re.sub(r"\W+", "_", unit_name).strip("_").lower()
+        if not name.startswith("test_"):
+            name = f"test_{name}"
+        return f"{name}.py"
+
+    def _load_metadata(self) -> List[Any]:
+        documents = []
+        for path in self.metadata_paths:
+            with open(path, "r", encoding="utf-8") as f:
+                documents.append(json.load(f))
+        return documents
+
+    def _metadata_for(self, unit_name: str, documents: List[Any]) -> List[Any]:
+        """
+        Collects every metadata entry (at any depth) whose class-name key matches the unit.
+        """
+        matches = []
+        stack = list(documents)
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                if any(node.get(key) == unit_name for key in self.CLASS_NAME_KEYS):
+                    matches.append(node)
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+        return sorted(matches, key=lambda entry: json.dumps(entry, sort_keys=True))
+
+    @staticmethod
+    def _referenced_names(node: ast.AST) -> set:
+        names = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name):
+                names.add(child.id)
+        return names
+
+    @staticmethod
+    def _bound_names(node: ast.AST) -> set:
+        """
+        Names a top-level statement binds (assignment targets, def/class names, imports nested in try/if blocks).
+        """
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return {node.name}
+        names = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                names.add(child.id)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.add(child.name)
+            elif isinstance(child, (ast.Import, ast.ImportFrom)):
+                names.update((alias.asname or alias.name).split(".")[0] for alias in child.names)
+        return names
+
+    @staticmethod
+    def _is_main_guard(node: ast.AST) -> bool:
+        return isinstance(node, ast.If) and "__main__" in ast.dump(node.test)
+
+    @staticmethod
+    def _segment(lines: List[str], node: ast.AST) -> str:
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        return "\n".join(lines[start - 1:node.end_lineno]).rstrip()
+
+    def parse_units(self, source: str) -> Dict[str, Dict[str, str]]:
+        """
+        Parses the source into units. Each unit carries the module-level statements it references, directly or
+        through other copied statements (constants, helpers, base classes), so its module runs standalone.
+        Returns:
+            dict: {unit_name: {"imports": str, "definitions": str, "body": str}} in source order.
+        """
+        tree = ast.parse(source, filename=self.source_path)
+        lines = source.splitlines()
+        imports = []
+        definitions = []
+        for index, node in enumerate(tree.body):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                bound = {(alias.asname or alias.name).split(".")[0] for alias in node.names}
+                imports.append((bound, ast.get_source_segment(source, node)))
+            elif not (isinstance(node, ast.Expr) or self._is_main_guard(node)):
+                definitions.append((index, node, self._bound_names(node)))
+        units = {}
+        for index, node in enumerate(tree.body):
+            is_test_function = isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test_")
+            if not (isinstance(node, ast.ClassDef) or is_test_function):
+                continue
+            used = self._referenced_names(node)
+            needed = set()
+            pending = set(used)
+            while pending:
+                name = pending.pop()
+                for position, definition, bound in definitions:
+                    if position != index and position not in needed and name in bound:
+                        needed.add(position)
+                        new_names = self._referenced_names(definition) - used
+                        used |= new_names
+                        pending |= new_names
+            unit_imports = [segment for bound, segment in imports if bound & used or "*" in bound]
+            unit_definitions = [self._segment(lines, definition) for position, definition, _ in definitions
+                                if position in needed]
+            units[node.name] = {"imports": "\n".join(unit_imports), "definitions": "\n\n\n".join(unit_definitions),
+                                "body": self._segment(lines, node)}
+        return units
+
+    def render_unit(self, unit_name: str, unit: Dict[str, str], digest: str) -> str:
+        header = (
+            f"# Generated from {self.source_path} by IncrementalTestScriptGenerator - do not edit.\n"
+            f"# unit: {unit_name}\n"
+            f"# sha256: {digest}\n"
+        )
+        imports = f"{unit['imports']}\n\n\n" if unit["imports"] else "\n"
+        definitions = f"{unit['definitions']}\n\n\n" if unit.get("definitions") else ""
+        return f"{header}{imports}{definitions}{unit['body']}\n"
+
+    def _read_manifest(self) -> Dict[str, Dict[str, str]]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("units", {})
+
+    @staticmethod
+    def _write_atomic(path: str, content: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def generate(self, compile_changed: bool = True) -> Dict[str, List[str]]:
+        """
+        Splits the source and rewrites only the units whose hash changed.
+        Args:
+            compile_changed (bool): Byte-compile rewritten modules so the next import/collection is warm.
+        Returns:
+            dict: {"written": [...], "unchanged": [...], "removed": [...]} unit names.
+        """
+        with open(self.source_path, "r", encoding="utf-8") as f:
+            units = self.parse_units(f.read())
+        owners: Dict[str, str] = {}
+        for unit_name in units:
+            file_name = self.module_name_for(unit_name)
+            if file_name in owners:
+                raise ValueError(f"Units {owners[file_name]!r} and {unit_name!r} both map to module {file_name}; "
+                                 f"rename one of them")
+            owners[file_name] = unit_name
+        documents = self._load_metadata()
+        previous = self._read_manifest()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        summary = {"written": [], "unchanged": [], "removed": []}
+        manifest = {}
+        for unit_name, unit in units.items():
+            hasher = hashlib.sha256()
+            hasher.update(unit["imports"].encode("utf-8"))
+            hasher.update(b"\0")
+            hasher.update(unit["definitions"].encode("utf-8"))
+            hasher.update(b"\0")
+            hasher.update(unit["body"].encode("utf-8"))
+            hasher.update(b"\0")
+            hasher.update(json.dumps(self._metadata_for(unit_name, documents), sort_keys=True).encode("utf-8"))
+            digest = hasher.hexdigest()
+            file_name = self.module_name_for(unit_name)
+            file_path = os.path.join(self.output_dir, file_name)
+            manifest[unit_name] = {"file": file_name, "sha256": digest}
+
+            old = previous.get(unit_name)
+            if old and old["sha256"] == digest and old["file"] == file_name and os.path.exists(file_path):
+                summary["unchanged"].append(unit_name)
+                continue
+            self._write_atomic(file_path, self.render_unit(unit_name, unit, digest))
+            if compile_changed:
+                py_compile.compile(file_path, doraise=True)
+            summary["written"].append(unit_name)
+
+        for unit_name, old in previous.items():
+            if unit_name in manifest:
+                continue
+            stale_path = os.path.join(self.output_dir, old["file"])
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+            summary["removed"].append(unit_name)
+
+        if summary["written"] or summary["removed"] or not os.path.exists(self.manifest_path):
+            content = json.dumps({"source": self.source_path, "units": manifest}, indent=2, sort_keys=True)
+            self._write_atomic(self.manifest_path, content + "\n")
+        return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Incrementally split a generated test script into per-unit modules.")
+    parser.add_argument("source", help="Monolithic test script, e.g. retrofittingScripts/TestScripts.py")
+    parser.add_argument("--out", required=True, help="Output directory for the per-unit modules")
+    parser.add_argument("--metadata", action="append", default=[], help="Integration metadata JSON (repeatable)")
+    parser.add_argument("--no-compile", action="store_true", help="Skip byte-compiling rewritten modules")
+    args = parser.parse_args(argv)
+
+    generator = IncrementalTestScriptGenerator(args.source, args.out, args.metadata)
+    summary = generator.generate(compile_changed=not args.no_compile)
+    print(f"written={len(summary['written'])} unchanged={len(summary['unchanged'])} removed={len(summary['removed'])}")
+    for unit_name in summary["written"]:
+        print(f"  written: {unit_name}")
+    for unit_name in summary["removed"]:
+        print(f"  removed: {unit_name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
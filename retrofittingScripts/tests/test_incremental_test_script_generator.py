@@ -0,0 +1,76 @@
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from retrofittingScripts.IncrementalTestScriptGenerator import IncrementalTestScriptGenerator
+
+SOURCE = textwrap.dedent('''
+    """Generated suite."""
+    import os
+    import unittest
+
+    BASE_URL = os.environ.get("BASE_URL", "http://shop.test")
+    TIMEOUT = 5
+
+
+    def build_url(path):
+        return f"{BASE_URL}{path}"
+
+
+    class BaseAPITest(unittest.TestCase):
+        timeout = TIMEOUT
+
+
+    class TestCart(BaseAPITest):
+        def test_url(self):
+            self.assertEqual(build_url("/cart"), "http://shop.test/cart")
+            self.assertEqual(self.timeout, 5)
+
+
+    def test_plain():
+        assert TIMEOUT == 5
+
+
+    if __name__ == "__main__":
+        unittest.main()
+''')
+
+
+def _generate(tmp_path, source):
+    source_path = tmp_path / "TestScripts.py"
+    source_path.write_text(source, encoding="utf-8")
+    generator = IncrementalTestScriptGenerator(str(source_path), str(tmp_path / "generated"))
+    return generator, generator.generate()
+
+
+def test_units_carry_referenced_module_level_definitions(tmp_path):
+    generator, summary = _generate(tmp_path, SOURCE)
+    assert summary["written"] == ["BaseAPITest", "TestCart", "test_plain"]
+    cart = (tmp_path / "generated" / "test_testcart.py").read_text(encoding="utf-8")
+    for needed in ("import os", "BASE_URL =", "TIMEOUT =", "def build_url", "class BaseAPITest"):
+        assert needed in cart
+    assert "__main__" not in cart
+    plain = (tmp_path / "generated" / "test_plain.py").read_text(encoding="utf-8")
+    assert "TIMEOUT = 5" in plain and "import os" not in plain and "build_url" not in plain
+
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                             str(tmp_path / "generated")], capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_dependency_change_rewrites_dependent_units_only(tmp_path):
+    generator, _ = _generate(tmp_path, SOURCE)
+    (tmp_path / "TestScripts.py").write_text(SOURCE.replace('"http://shop.test"', '"http://shop.local"'),
+                                             encoding="utf-8")
+    summary = generator.generate()
+    assert summary["written"] == ["TestCart"]
+    assert summary["unchanged"] == ["BaseAPITest", "test_plain"]
+
+
+def test_module_name_collision_fails(tmp_path):
+    source = "class TestCart:\n    pass\n\n\nclass Testcart:\n    pass\n"
+    with pytest.raises(ValueError, match="test_testcart.py"):
+        _generate(tmp_path, source)
+    assert not (tmp_path / "generated").exists()